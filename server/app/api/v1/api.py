@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import upload, health, recordings, search, labeling
+from app.api.v1.endpoints import upload, health, recordings, search, labeling, meeting_items
 
 api_router = APIRouter()
 
@@ -16,5 +16,8 @@ api_router.include_router(recordings.router, tags=["recordings"])
 # Include search endpoints
 api_router.include_router(search.router, tags=["search"])
 
+# Include action item and decision endpoints
+api_router.include_router(meeting_items.router, tags=["action items & decisions"])
+
 # Include labeling endpoints
 api_router.include_router(labeling.router, prefix="/labeling", tags=["labeling"]) 
\ No newline at end of file
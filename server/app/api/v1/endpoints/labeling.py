@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.database import get_db
 from app.models.schemas import (
@@ -8,9 +9,11 @@ from app.models.schemas import (
     LabelingRuleUpdate, 
     LabelingRuleResponse,
     BasicResponse,
-    AppliedLabel
+    AppliedLabel,
+    LabelClassifierStatsResponse
 )
 from app.services.labeling_service import labeling_service
+from app.services.label_classifier_service import label_classifier_service
 from app.services.recording_service import recording_service
 
 router = APIRouter()
@@ -18,26 +21,29 @@ router = APIRouter()
 @router.post("/", response_model=LabelingRuleResponse)
 async def create_labeling_rule(
     rule_data: LabelingRuleCreate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new labeling rule"""
-    return labeling_service.create_rule(db, rule_data)
+    return await labeling_service.create_rule(db, rule_data)
 
 @router.get("/", response_model=List[LabelingRuleResponse])
 async def get_labeling_rules(
-    active_only: bool = False,
-    db: Session = Depends(get_db)
+    active_only: bool = False
 ):
     """Get all labeling rules"""
-    return labeling_service.get_rules(db, active_only=active_only)
+    return await run_in_threadpool(labeling_service.get_rules, active_only)
+
+@router.get("/classifier/stats", response_model=LabelClassifierStatsResponse)
+async def get_label_classifier_stats():
+    """Get the share of labeling decisions settled by the local pre-classifier"""
+    return await run_in_threadpool(label_classifier_service.get_stats)
 
 @router.get("/{rule_id}", response_model=LabelingRuleResponse)
 async def get_labeling_rule(
-    rule_id: int,
-    db: Session = Depends(get_db)
+    rule_id: int
 ):
     """Get a specific labeling rule"""
-    rule = labeling_service.get_rule(db, rule_id)
+    rule = await run_in_threadpool(labeling_service.get_rule, rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Labeling rule not found")
     return rule
@@ -46,10 +52,10 @@ async def get_labeling_rule(
 async def update_labeling_rule(
     rule_id: int, 
     rule_data: LabelingRuleUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a labeling rule"""
-    rule = labeling_service.update_rule(db, rule_id, rule_data)
+    rule = await labeling_service.update_rule(db, rule_id, rule_data)
     if not rule:
         raise HTTPException(status_code=404, detail="Labeling rule not found")
     return rule
@@ -57,21 +63,22 @@ async def update_labeling_rule(
 @router.delete("/{rule_id}", response_model=BasicResponse)
 async def delete_labeling_rule(
     rule_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a labeling rule"""
-    success = labeling_service.delete_rule(db, rule_id)
+    success = await labeling_service.delete_rule(db, rule_id)
     if not success:
         raise HTTPException(status_code=404, detail="Labeling rule not found")
     return BasicResponse(message="Labeling rule deleted successfully", status="success")
 
 @router.post("/apply/{recording_id}", response_model=List[AppliedLabel])
 async def apply_labels_to_recording(
-    recording_id: int
+    recording_id: int,
+    db: AsyncSession = Depends(get_db)
 ):
     """Apply labeling rules to a specific recording on-demand"""
     # Get the recording
-    recording = recording_service.get_recording(recording_id)
+    recording = await recording_service.fetch_recording(db, recording_id)
     if not recording:
         raise HTTPException(status_code=404, detail="Recording not found")
     
@@ -87,13 +94,11 @@ async def apply_labels_to_recording(
         summary=recording.summary,
         action_items=recording.action_items or [],
         decisions=recording.decisions or [],
-        transcript=recording.transcript or ""
+        transcript=recording.transcript or "",
+        recording_id=recording_id
     )
     
     # Update the recording with the labels
-    recording_service.update_recording(
-        recording_id=recording_id,
-        labels=applied_labels
-    )
+    await recording_service.set_labels(db, recording_id, applied_labels)
     
     return applied_labels 
\ No newline at end of file
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date
+import logging
+
+from app.models.database import get_db
+from app.models.schemas import (
+    ActionItemListResponse,
+    ActionItemRecord,
+    ActionItemStatusUpdate,
+    DecisionListResponse
+)
+from app.services.meeting_item_service import meeting_item_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/action-items", response_model=ActionItemListResponse)
+async def get_action_items(
+    assignee: Optional[str] = Query(None, description="Assignee name (case-insensitive)"),
+    status: Optional[str] = Query(None, pattern="^(open|done)$", description="open or done"),
+    priority: Optional[str] = Query(None, pattern="^(high|medium|low)$", description="high, medium or low"),
+    due_from: Optional[date] = Query(None, description="Earliest due date (YYYY-MM-DD)"),
+    due_to: Optional[date] = Query(None, description="Latest due date (YYYY-MM-DD)"),
+    recording_id: Optional[int] = Query(None, description="Only items of this recording"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Query action items across recordings, ordered by due date, with keyset pagination"""
+    logger.info(f"📌 Fetching action items - Assignee: {assignee}, Status: {status}, Priority: {priority}")
+    try:
+        items, next_cursor = await db.run_sync(
+            meeting_item_service.get_action_items, assignee, status, priority, due_from, due_to, recording_id, cursor, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ActionItemListResponse(items=items, next_cursor=next_cursor)
+
+
+@router.patch("/action-items/{item_id}", response_model=ActionItemRecord)
+async def update_action_item_status(
+    item_id: int,
+    update: ActionItemStatusUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark an action item open or done"""
+    item = await db.run_sync(meeting_item_service.update_action_item_status, item_id, update.status)
+    if not item:
+        raise HTTPException(status_code=404, detail="Action item not found")
+    return item
+
+
+@router.get("/decisions", response_model=DecisionListResponse)
+async def get_decisions(
+    owner: Optional[str] = Query(None, description="Owner name (case-insensitive)"),
+    recording_id: Optional[int] = Query(None, description="Only decisions of this recording"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Query decisions across recordings, newest first, with keyset pagination"""
+    logger.info(f"📌 Fetching decisions - Owner: {owner}, Recording: {recording_id}")
+    try:
+        items, next_cursor = await db.run_sync(meeting_item_service.get_decisions, owner, recording_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DecisionListResponse(items=items, next_cursor=next_cursor)
@@ -1,69 +1,293 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, List, Optional
 import logging
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import orjson
 
-from app.models.schemas import RecordingResponse, RecordingListResponse
-from app.services.recording_service import recording_service
+from app.core.config import settings
+from app.core.conditional import (
+    has_validators, is_not_modified, list_etag, not_modified_response, recording_etag, validator_headers
+)
+from app.models.database import get_db, AsyncSessionLocal
+from app.models.schemas import (
+    RecordingResponse, RecordingListItem, RecordingListResponse, LabelFacetsResponse, RECORDING_LIST_FIELDS
+)
+from app.services.recording_service import recording_service, RecordingFilters
 from app.services.storage_service import storage_service
+from app.services.task_service import task_service
+from app.services.visual_summary_service import visual_summary_service
+from app.services.flowchart_service import flowchart_service
+from app.services.vector_index_service import vector_index_service
+from app.services.bm25_index_service import bm25_index_service
+from app.services.search_cache_service import search_cache_service
+from app.services.status_stream_service import status_stream_service, TERMINAL_STATUSES
+from app.tasks.processing_tasks import process_visual_summary_task
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
-@router.get("/recordings", response_model=RecordingListResponse)
+def _list_filters(
+    label: Optional[str] = Query(None, description="Only return recordings carrying this label"),
+    processing_status: Optional[str] = Query(None, description="Only return recordings in this processing status"),
+    content_type: Optional[str] = Query(None, description="Only return recordings of this media type, e.g. audio/mpeg"),
+    date_from: Optional[date] = Query(None, description="Only recordings created on or after this day"),
+    date_to: Optional[date] = Query(None, description="Only recordings created on or before this day"),
+    min_duration: Optional[float] = Query(None, ge=0, description="Minimum duration in seconds"),
+    max_duration: Optional[float] = Query(None, ge=0, description="Maximum duration in seconds")
+) -> RecordingFilters:
+    """Filter query parameters shared by the listing and the export"""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if min_duration is not None and max_duration is not None and min_duration > max_duration:
+        raise HTTPException(status_code=400, detail="min_duration must not be above max_duration")
+    return RecordingFilters(
+        label=label,
+        processing_status=processing_status,
+        content_type=content_type,
+        created_from=datetime.combine(date_from, time.min) if date_from else None,
+        created_to=datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None,
+        min_duration=min_duration,
+        max_duration=max_duration
+    )
+
+
+@router.get("/recordings", response_model=RecordingListResponse, response_model_exclude_unset=True)
 async def get_recordings(
-    skip: int = Query(0, ge=0, description="Number of recordings to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Number of recordings to return")
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of recordings to return"),
+    filters: RecordingFilters = Depends(_list_filters),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,original_filename,summary"
+    ),
+    exact_total: bool = Query(False, description="Count the matching recordings instead of reading the kept total"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all recordings with pagination"""
-    logger.info(f"📋 Fetching recordings list - Skip: {skip}, Limit: {limit}")
+    """
+    Get recordings newest first, one page at a time
+    
+    Filters combine; pass the returned `next_cursor` with the same filters to
+    get the following page, it is null on the last page. `total` comes from a
+    counter kept up to date with every change when at most `label` is given;
+    with other filters it is null unless `exact_total` asks for a count.
+    
+    Items are compact by default: a transcript preview instead of the
+    transcripts, and no analysis JSON. `fields` picks exactly the fields
+    returned, heavy ones included; only those columns are read.
     
+    Pages carry an ETag over their recordings' versions and total; a request
+    with a matching If-None-Match gets a 304 after reading only those keys.
+    """
+    logger.info(f"📋 Fetching recordings list - Cursor: {cursor}, Limit: {limit}, Filters: {filters}, Fields: {fields}")
+    
+    selected = _list_fields(fields)
     try:
-        # Run database operations in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            recordings_task = loop.run_in_executor(
-                executor, recording_service.get_recordings, skip, limit
-            )
-            count_task = loop.run_in_executor(
-                executor, recording_service.get_recordings_count
+        total = await recording_service.get_recordings_count(db, filters, exact=exact_total)
+        try:
+            if has_validators(request):
+                # Page keys and versions only; the selected columns are read if they changed
+                keys, _ = await recording_service.get_recordings(db, cursor, limit, filters, ("updated_at",))
+                etag = list_etag(request.url.query, [(row.id, row.updated_at) for row in keys], total)
+                if is_not_modified(request, etag):
+                    logger.info("✅ Recordings page not modified")
+                    return not_modified_response(etag)
+            recordings, next_cursor = await recording_service.get_recordings(
+                db, cursor, limit, filters, [*selected, "updated_at"]
             )
-            
-            recordings, total = await asyncio.gather(recordings_task, count_task)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         logger.info(f"✅ Retrieved {len(recordings)} recordings out of {total} total")
         
-        return RecordingListResponse(
-            recordings=[RecordingResponse.from_orm(r) for r in recordings],
-            total=total
+        body = RecordingListResponse(
+            recordings=[
+                RecordingListItem(**{field: getattr(recording, field) for field in selected})
+                for recording in recordings
+            ],
+            total=total,
+            total_exact=exact_total,
+            next_cursor=next_cursor
         )
+        # Dumped once and encoded by orjson, instead of revalidated and encoded by FastAPI
+        return ORJSONResponse(
+            body.model_dump(exclude_unset=True),
+            headers=validator_headers(
+                list_etag(request.url.query, [(row.id, row.updated_at) for row in recordings], total)
+            )
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Failed to fetch recordings: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch recordings")
 
 
+def _list_fields(fields: Optional[str]) -> List[str]:
+    """Validate a `fields` parameter; the ID is always included"""
+    if not fields:
+        return list(RECORDING_LIST_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in RecordingListItem.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(RecordingListItem.model_fields)}"
+        )
+    return list(dict.fromkeys(["id"] + requested))
+
+
+@router.get("/recordings/labels/facets", response_model=LabelFacetsResponse)
+async def get_label_facets(db: AsyncSession = Depends(get_db)):
+    """Get the number of recordings carrying each label"""
+    try:
+        facets = await recording_service.get_label_facets(db)
+        return LabelFacetsResponse(facets=facets)
+    except Exception as e:
+        logger.error(f"❌ Failed to fetch label facets: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch label facets")
+
+
+@router.get("/recordings/export")
+async def export_recordings(
+    filters: RecordingFilters = Depends(_list_filters),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to export, e.g. id,original_filename,transcript"
+    )
+):
+    """
+    Export recordings as newline-delimited JSON, oldest first
+    
+    One JSON object per line with the requested fields, or the compact list
+    fields by default. Rows are read through a database cursor in batches
+    and written as they arrive, so an export of any size streams in constant
+    memory. Takes the same filters as the listing.
+    """
+    selected = _list_fields(fields)
+    logger.info(f"📤 Exporting recordings - Filters: {filters}, Fields: {selected}")
+    
+    async def stream() -> AsyncIterator[bytes]:
+        exported = 0
+        async for rows in recording_service.stream_recordings(filters, selected, settings.export_batch_size):
+            exported += len(rows)
+            yield b"".join(orjson.dumps(dict(zip(selected, row))) + b"\n" for row in rows)
+        logger.info(f"✅ Exported {exported} recordings")
+    
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="recordings.ndjson"'}
+    )
+
+
+@router.get("/recordings/status/stream")
+async def stream_recording_status(
+    ids: Optional[str] = Query(
+        None, description="Comma-separated recording IDs to follow; every recording when omitted"
+    )
+):
+    """
+    Server-sent events with recording processing status changes
+    
+    Opens with a `status` event per followed recording (every recording still
+    in flight when no IDs are given), then sends one whenever a status
+    changes, including `deleted`. A stream following IDs sends `end` once
+    all of them are completed, failed or deleted; an unfiltered stream stays
+    open. Replaces polling the recordings for progress.
+    """
+    recording_ids = None
+    if ids:
+        try:
+            recording_ids = {int(value) for value in ids.split(",") if value.strip()}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be comma-separated recording IDs")
+        if len(recording_ids) > 500:
+            raise HTTPException(status_code=400, detail="Follow at most 500 recordings per stream")
+    
+    # Subscribed before reading the current statuses, so no change falls in between
+    subscriber = status_stream_service.subscribe(recording_ids)
+    try:
+        # A session of its own, released before the stream starts
+        async with AsyncSessionLocal() as db:
+            snapshot = await recording_service.get_statuses(db, sorted(recording_ids) if recording_ids else None)
+    except Exception as e:
+        status_stream_service.unsubscribe(subscriber)
+        logger.error(f"❌ Failed to read recording statuses: {e}")
+        raise HTTPException(status_code=500, detail="Failed to read recording statuses")
+    logger.info(f"📡 Status stream opened for {len(recording_ids) if recording_ids else 'all'} recordings")
+    
+    async def stream() -> AsyncIterator[str]:
+        pending = set(recording_ids) if recording_ids else None
+        try:
+            yield "retry: 3000\n\n"
+            if pending is not None:
+                # Followed recordings that do not exist are as done as deleted ones
+                pending &= {event["recording_id"] for event in snapshot}
+            for event in snapshot:
+                yield _status_event(event)
+                if pending is not None and event["processing_status"] in TERMINAL_STATUSES:
+                    pending.discard(event["recording_id"])
+            
+            if pending is None or pending:
+                async for event in status_stream_service.events(subscriber, settings.status_stream_heartbeat):
+                    if event is None:
+                        yield ": keep-alive\n\n"
+                        continue
+                    yield _status_event(event)
+                    if pending is not None and event["processing_status"] in TERMINAL_STATUSES:
+                        pending.discard(event["recording_id"])
+                        if not pending:
+                            break
+            if pending is not None:
+                yield "event: end\ndata: {}\n\n"
+        finally:
+            status_stream_service.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they are written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _status_event(event: dict) -> str:
+    return f"event: status\ndata: {orjson.dumps(event).decode()}\n\n"
+
+
 @router.get("/recordings/{recording_id}", response_model=RecordingResponse)
-async def get_recording(recording_id: int):
-    """Get a specific recording by ID"""
+async def get_recording(recording_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Get a specific recording by ID
+    
+    Sends an ETag and Last-Modified from the recording's updated_at; a
+    conditional request that still matches gets a 304 without the row being
+    loaded.
+    """
     logger.info(f"🔍 Fetching recording with ID: {recording_id}")
     
     try:
-        # Run database operation in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            recording = await loop.run_in_executor(
-                executor, recording_service.get_recording, recording_id
-            )
+        if has_validators(request):
+            updated_at = await recording_service.get_recording_version(db, recording_id)
+            if updated_at is not None and is_not_modified(request, recording_etag(recording_id, updated_at), updated_at):
+                logger.info(f"✅ Recording {recording_id} not modified")
+                return not_modified_response(recording_etag(recording_id, updated_at), updated_at)
+        
+        recording = await recording_service.fetch_recording(db, recording_id)
         
         if not recording:
             logger.warning(f"⚠️  Recording not found: {recording_id}")
             raise HTTPException(status_code=404, detail="Recording not found")
         
         logger.info(f"✅ Retrieved recording: {recording.original_filename} (Status: {recording.processing_status})")
-        return RecordingResponse.from_orm(recording)
+        return ORJSONResponse(
+            RecordingResponse.model_validate(recording).model_dump(),
+            headers=validator_headers(recording_etag(recording.id, recording.updated_at), recording.updated_at)
+        )
         
     except HTTPException:
         raise
@@ -72,47 +296,92 @@ async def get_recording(recording_id: int):
         raise HTTPException(status_code=500, detail="Failed to fetch recording")
 
 
+@router.get("/recordings/{recording_id}/visual-summary")
+async def get_visual_summary(recording_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Serve a recording's visual summary, generating it on first request
+    
+    Redirects to the stored image once it exists. Until then the first request
+    queues a single generation job and every request gets a 202 placeholder.
+    """
+    recording = await recording_service.fetch_recording(db, recording_id)
+    
+    if not recording:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    
+    if recording.visual_summary_url:
+        return RedirectResponse(
+            recording.visual_summary_url,
+            status_code=307,
+            headers={"Cache-Control": "private, max-age=300"}
+        )
+    
+    if recording.processing_status != "completed" or not (recording.decisions or recording.action_items or recording.summary):
+        raise HTTPException(status_code=404, detail="Recording has not been analyzed yet")
+    
+    # The claim is a Redis SET NX, so it runs off the event loop
+    if await run_in_threadpool(visual_summary_service.claim_generation, recording_id):
+        logger.info(f"🎨 Queuing on-demand visual summary for recording {recording_id}")
+        # Off the event loop: without a queue the task runs synchronously
+        job_id = await run_in_threadpool(task_service.enqueue_task, process_visual_summary_task, recording_id)
+        if job_id == "sync-fallback":
+            # The task committed through its own session
+            await db.refresh(recording)
+            if recording and recording.visual_summary_url:
+                return RedirectResponse(recording.visual_summary_url, status_code=307)
+    
+    return Response(
+        content=flowchart_service.render_placeholder(),
+        status_code=202,
+        media_type="image/svg+xml",
+        headers={"Retry-After": "2", "Cache-Control": "no-store"}
+    )
+
+
 @router.delete("/recordings/{recording_id}")
-async def delete_recording(recording_id: int):
+async def delete_recording(recording_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a recording"""
     logger.info(f"🗑️  Attempting to delete recording with ID: {recording_id}")
     
     try:
         # First get the recording to access its storage path
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            recording = await loop.run_in_executor(
-                executor, recording_service.get_recording, recording_id
-            )
+        recording = await recording_service.fetch_recording(db, recording_id)
         
         if not recording:
             logger.warning(f"⚠️  Recording not found for deletion: {recording_id}")
             raise HTTPException(status_code=404, detail="Recording not found")
+        created_at = recording.created_at
         
         # Delete files from storage
         if recording.storage_path:
             logger.info(f"🗑️  Deleting recording file: {recording.storage_path}")
-            storage_deleted = storage_service.delete_file(recording.storage_path)
+            storage_deleted = await run_in_threadpool(storage_service.delete_file, recording.storage_path)
             if not storage_deleted:
                 logger.warning(f"⚠️  Failed to delete recording file: {recording.storage_path}")
         
         # Delete AI-generated visual summary if it exists
         if recording.visual_summary_url:
             logger.info(f"🎨 Deleting visual summary for recording {recording_id}")
-            visual_deleted = storage_service.delete_visual_summary(recording_id, recording.visual_summary_url)
+            visual_deleted = await run_in_threadpool(
+                storage_service.delete_visual_summary, recording_id, recording.visual_summary_url
+            )
             if not visual_deleted:
                 logger.warning(f"⚠️  Failed to delete visual summary for recording {recording_id}")
+            for variant_url in (recording.visual_summary_variants or {}).values():
+                await run_in_threadpool(storage_service.delete_visual_summary, recording_id, variant_url)
         
-        # Run database operation in thread pool to avoid blocking
-        with ThreadPoolExecutor() as executor:
-            success = await loop.run_in_executor(
-                executor, recording_service.delete_recording, recording_id
-            )
+        success = await recording_service.delete_recording(db, recording_id)
         
         if not success:
             logger.warning(f"⚠️  Failed to delete recording from database: {recording_id}")
             raise HTTPException(status_code=500, detail="Failed to delete recording from database")
         
+        # Retire the recording's rows from the file-based search indexes, off the event loop
+        await run_in_threadpool(vector_index_service.remove_recording, recording_id)
+        if settings.full_text_backend == "bm25":
+            await run_in_threadpool(bm25_index_service.remove_recording, recording_id, created_at)
+        await run_in_threadpool(search_cache_service.invalidate)
+        
         logger.info(f"✅ Successfully deleted recording: {recording_id}")
         return {"message": "Recording deleted successfully"}
         
@@ -1,121 +1,356 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+from datetime import date, datetime, time, timedelta
 import logging
+import asyncio
 
-from app.models.database import get_db
+from app.core.config import settings
+from app.models.database import get_db, AsyncSessionLocal
 from app.models.recording import Recording
+from app.services.search_service import search_service
+from app.services.chunk_service import chunk_service
+from app.services.embedding_service import embedding_service
+from app.services.vector_index_service import vector_index_service
+from app.services.bm25_index_service import bm25_index_service
+from app.services.title_search_service import title_search_service
+from app.services.autocomplete_service import autocomplete_service
+from app.services.search_cache_service import search_cache_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# (recording_id, relevance, best chunk or speaker turn)
+SearchHit = Tuple[int, float, Optional[Dict[str, Any]]]
+# Recording creation time bounds (inclusive start, exclusive end, UTC)
+CreatedRange = Tuple[Optional[datetime], Optional[datetime]]
+
 
 @router.get("/search/semantic")
 async def search_recordings(
     query: str = Query(..., description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
+    mode: str = Query(settings.search_mode, pattern="^(semantic|full_text|hybrid)$", description="Retrieval mode"),
+    speaker: Optional[str] = Query(None, description="Only search what this speaker said, e.g. B"),
+    date_from: Optional[date] = Query(None, description="Only recordings created on or after this day"),
+    date_to: Optional[date] = Query(None, description="Only recordings created on or before this day"),
     response: Response = Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
-    Search through recording transcripts using simple text matching
+    Search recordings by meaning, by keywords, or both
+    
+    Semantic mode embeds the query with the local embedding model and finds the
+    nearest transcript chunks in the vector index; it falls back to full-text
+    search when the embedding model is unavailable. Full-text mode ranks
+    filename matches above summary matches above transcript matches. Hybrid
+    mode runs both retrievers concurrently and fuses their rankings with
+    reciprocal rank fusion. Each result carries the best matching transcript
+    chunk with its timestamps, offsets into the transcript and highlighted
+    ranges.
+    
+    With a speaker, only that speaker's diarized turns are searched, with the
+    full-text index whatever the mode, and each result carries the best
+    matching turn instead of a chunk.
+    
+    A date range restricts every mode to recordings created within it; the
+    BM25 backend skips monthly shards outside the range entirely.
     
     Args:
         query: The search query
         limit: Maximum number of results to return (1-50)
+        mode: "semantic", "full_text" or "hybrid"
+        speaker: Speaker label from the diarized transcript
+        date_from: First creation day, inclusive
+        date_to: Last creation day, inclusive
         db: Database session
         
     Returns:
         Dictionary containing search results and metadata
     """
-    logger.info(f"🔍 Text search request - Query: '{query}', Limit: {limit}")
+    logger.info(f"🔍 Search request - Query: '{query}', Limit: {limit}, Mode: {mode}, Speaker: {speaker}")
     
     if not query.strip():
         raise HTTPException(status_code=400, detail="Query cannot be empty")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    created = (
+        datetime.combine(date_from, time.min) if date_from else None,
+        datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+    )
     
     try:
-        # Set cache control headers to prevent caching of search results
+        # Clients must not cache results; the server-side cache is invalidated precisely
         response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
         response.headers["Pragma"] = "no-cache"
         response.headers["Expires"] = "0"
         
-        # Search in transcript and transcript_with_speakers fields
-        search_term = f"%{query.strip()}%"
+        # Repeated searches are served from memory until the corpus changes
+        cache_key = search_cache_service.key(
+            query, limit=limit, mode=mode, speaker=(speaker or "").strip(), date_from=date_from, date_to=date_to
+        )
+        # The corpus version is re-read from Redis now and then, which blocks, so off the event loop
+        cached = await run_in_threadpool(search_cache_service.get, cache_key)
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            logger.info(f"✅ Search served from cache - {cached['total_results']} results")
+            return ORJSONResponse(cached, headers=dict(response.headers))
+        response.headers["X-Cache"] = "MISS"
+        corpus_version = await run_in_threadpool(search_cache_service.current_version)
         
-        recordings = db.query(Recording).filter(
-            Recording.processing_status == "completed",  # Only search completed recordings
-            or_(
-                Recording.transcript.ilike(search_term),
-                Recording.transcript_with_speakers.ilike(search_term),
-                Recording.original_filename.ilike(search_term),
-                Recording.summary.ilike(search_term)
+        if speaker:
+            mode = "full_text"
+        elif mode in ("semantic", "hybrid") and not await run_in_threadpool(lambda: embedding_service.available):
+            logger.warning("⚠️  Embedding model unavailable - falling back to full-text search")
+            mode = "full_text"
+        
+        if speaker:
+            hits = await db.run_sync(
+                search_service.search_speaker_turns, query.strip(), speaker.strip(), limit, *created
             )
-        ).limit(limit).all()
+        elif mode == "hybrid":
+            hits = await _hybrid_hits(query.strip(), limit, created)
+        elif mode == "semantic":
+            hits = await _semantic_hits(db, query.strip(), limit, created)
+        else:
+            hits = await _full_text_hits(db, query.strip(), limit, created)
+        
+        # Only the listing columns are loaded; excerpts come from the chunk index
+        recording_ids = [recording_id for recording_id, _, _ in hits]
+        recordings = {
+            recording.id: recording
+            for recording in (await db.scalars(_in_created_range(
+                select(Recording).options(
+                    load_only(Recording.id, Recording.original_filename, Recording.created_at, Recording.duration)
+                ).filter(Recording.id.in_(recording_ids)),
+                created
+            ))).all()
+        } if hits else {}
         
         results = []
-        for recording in recordings:
-            # Find the best matching excerpt from transcript
-            transcript = recording.transcript_with_speakers or recording.transcript or ""
-            
-            # Find the position of the query in the transcript
-            query_lower = query.lower()
-            transcript_lower = transcript.lower()
-            
-            excerpt = ""
-            similarity = 0.8  # Default similarity for text matches
-            
-            if query_lower in transcript_lower:
-                # Find the position and create an excerpt around it
-                pos = transcript_lower.find(query_lower)
-                start = max(0, pos - 75)  # 75 chars before
-                end = min(len(transcript), pos + len(query) + 75)  # 75 chars after
-                excerpt = transcript[start:end]
-                
-                # Add ellipsis if we truncated
-                if start > 0:
-                    excerpt = "..." + excerpt
-                if end < len(transcript):
-                    excerpt = excerpt + "..."
-                    
-                similarity = 0.9  # Higher similarity for exact matches
-            else:
-                # Fallback to beginning of transcript
-                excerpt = transcript[:150]
-                if len(transcript) > 150:
-                    excerpt += "..."
+        for recording_id, relevance, chunk in hits:
+            recording = recordings.get(recording_id)
+            if recording is None:
+                continue
             
             results.append({
-                "chunk_id": recording.id,  # Using recording ID as chunk ID for compatibility
+                "chunk_id": chunk.get("chunk_id") if chunk else None,
                 "recording_id": recording.id,
                 "recording_title": recording.original_filename,
-                "chunk_text": excerpt,
-                "chunk_index": 0,  # Always 0 since we're not chunking
-                "similarity": similarity,
+                "chunk_text": chunk["text"] if chunk else "",
+                "chunk_index": chunk.get("chunk_index") if chunk else None,
+                "highlights": chunk["highlights"] if chunk else [],
+                "start_time": chunk["start_time"] if chunk else None,
+                "end_time": chunk["end_time"] if chunk else None,
+                "char_start": chunk.get("char_start") if chunk else None,
+                "char_end": chunk.get("char_end") if chunk else None,
+                "speaker": chunk.get("speaker") if chunk else None,
+                "similarity": relevance,
                 "created_at": recording.created_at.isoformat(),
                 "duration": recording.duration
             })
         
-        # Sort by relevance (exact filename matches first, then by date)
-        results.sort(key=lambda x: (
-            -1 if query.lower() in x["recording_title"].lower() else 0,
-            -x["similarity"],
-            x["created_at"]
-        ), reverse=True)
-        
-        logger.info(f"✅ Text search completed - Found {len(results)} results")
+        logger.info(f"✅ Search completed - Found {len(results)} results")
         
-        return {
+        body = {
             "query": query,
             "results": results,
             "total_results": len(results),
             "search_params": {
                 "limit": limit,
-                "search_type": "text_matching"
+                "search_type": mode,
+                "speaker": speaker,
+                "date_from": date_from.isoformat() if date_from else None,
+                "date_to": date_to.isoformat() if date_to else None
             }
         }
+        search_cache_service.put(cache_key, body, corpus_version)
+        # Plain JSON types throughout, so orjson can encode the body without FastAPI's encoder
+        return ORJSONResponse(body, headers=dict(response.headers))
         
     except Exception as e:
         logger.error(f"❌ Search failed: {e}")
-        raise HTTPException(status_code=500, detail="Search failed") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Search failed")
+
+
+async def _full_text_hits(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    created: CreatedRange = (None, None)
+) -> List[SearchHit]:
+    """Rank recordings with the configured full-text backend and attach their best matching chunk"""
+    if settings.full_text_backend == "bm25":
+        # Over-fetch since several of the best chunks usually share a recording; scoring the
+        # memory-mapped shards is CPU work, so it runs in the shared thread pool
+        ranked = await run_in_threadpool(bm25_index_service.search, query, limit * 5, *created)
+        hits = await _best_chunk_per_recording(db, ranked, limit, created)
+        for _, _, chunk in hits:
+            if chunk:
+                chunk["highlights"] = bm25_index_service.highlight(chunk["text"], query)
+        # Squash unbounded BM25 scores into [0, 1) like ts_rank_cd's normalization
+        return [(recording_id, score / (score + 1), chunk) for recording_id, score, chunk in hits]
+    
+    ranked = await db.run_sync(search_service.search, query, limit, *created)
+    chunks = await db.run_sync(search_service.best_chunks, query, [recording_id for recording_id, _ in ranked])
+    return [(recording_id, relevance, chunks.get(recording_id)) for recording_id, relevance in ranked]
+
+
+async def _semantic_hits(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    created: CreatedRange = (None, None)
+) -> List[SearchHit]:
+    """Find the nearest chunks in the vector index, keeping the best chunk per completed recording"""
+    # Embedding and the index scan are CPU work; over-fetch since several of the
+    # nearest chunks usually share a recording. The scan applies the date range itself.
+    nearest = await run_in_threadpool(
+        lambda: vector_index_service.search(embedding_service.embed_query(query), limit * 5, *created)
+    )
+    return [
+        (recording_id, max(0.0, score), chunk)
+        for recording_id, score, chunk in await _best_chunk_per_recording(db, nearest, limit, created)
+    ]
+
+
+@router.get("/search/titles")
+async def search_titles(
+    query: str = Query(..., min_length=1, description="Partial or misspelled meeting name"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum number of suggestions")
+) -> Dict[str, Any]:
+    """
+    Typeahead lookup of recordings by filename and summary title
+    
+    Matching is fuzzy on trigrams, so prefixes and typos still find the meeting.
+    
+    Args:
+        query: The partial name typed so far
+        limit: Maximum number of suggestions (1-20)
+        
+    Returns:
+        Dictionary with the matching recordings, best first
+    """
+    try:
+        # The in-process index refreshes from the database, so the lookup runs off the event loop
+        results = await run_in_threadpool(title_search_service.lookup, query.strip(), limit)
+    except Exception as e:
+        logger.error(f"❌ Title search failed: {e}")
+        raise HTTPException(status_code=500, detail="Title search failed")
+    return {"query": query, "results": results}
+
+
+@router.get("/search/autocomplete")
+async def autocomplete(
+    prefix: str = Query(..., min_length=1, description="Text typed so far"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum number of suggestions")
+) -> Dict[str, Any]:
+    """
+    Suggest completions for the search box
+    
+    Served from the in-memory prefix index over filenames, speakers, labels,
+    people and frequent transcript phrases; no database access.
+    
+    Args:
+        prefix: Text typed so far
+        limit: Maximum number of suggestions (1-20)
+        
+    Returns:
+        Dictionary with the suggestions, best first
+    """
+    return {
+        "prefix": prefix,
+        "suggestions": autocomplete_service.suggest(prefix, limit),
+        "ready": autocomplete_service.ready
+    }
+
+
+async def _hybrid_hits(query: str, limit: int, created: CreatedRange = (None, None)) -> List[SearchHit]:
+    """
+    Fuse full-text and semantic rankings with reciprocal rank fusion
+    
+    Both retrievers run concurrently, each with its own session, so the
+    latency is that of the slower one. A recording scores
+    sum(1 / (k + rank)) over the rankings it appears in, normalized so a
+    recording ranked first by both retrievers scores 1.0.
+    
+    Args:
+        query: The search query
+        limit: Maximum number of results
+        created: Recording creation time bounds
+        
+    Returns:
+        Fused hits, best first; the chunk comes from full-text when it matched (it has highlights)
+    """
+    depth = limit * settings.search_hybrid_depth
+    full_text, semantic = await asyncio.gather(
+        _run_with_session(_full_text_hits, query, depth, created),
+        _run_with_session(_semantic_hits, query, depth, created)
+    )
+    
+    k = settings.search_rrf_k
+    fused: Dict[int, float] = {}
+    chunks: Dict[int, Optional[Dict[str, Any]]] = {}
+    for ranking in (semantic, full_text):
+        for rank, (recording_id, _, chunk) in enumerate(ranking, start=1):
+            fused[recording_id] = fused.get(recording_id, 0.0) + 1.0 / (k + rank)
+            if chunk is not None:
+                chunks[recording_id] = chunk
+    
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(recording_id, score * (k + 1) / 2, chunks.get(recording_id)) for recording_id, score in best]
+
+
+async def _run_with_session(
+    retriever: Callable[[AsyncSession, str, int, CreatedRange], Awaitable[List[SearchHit]]],
+    query: str,
+    limit: int,
+    created: CreatedRange
+) -> List[SearchHit]:
+    """Run a retriever with a session of its own, since one session cannot serve concurrent queries"""
+    async with AsyncSessionLocal() as db:
+        return await retriever(db, query, limit, created)
+
+
+async def _best_chunk_per_recording(
+    db: AsyncSession,
+    ranked: List[Tuple[int, int, float]],
+    limit: int,
+    created: CreatedRange = (None, None)
+) -> List[SearchHit]:
+    """Keep the top-ranked chunk of each completed recording from (chunk_id, recording_id, score) rows"""
+    completed = set((await db.scalars(_in_created_range(
+        select(Recording.id).filter(
+            Recording.id.in_({recording_id for _, recording_id, _ in ranked}),
+            Recording.processing_status == "completed"
+        ),
+        created
+    ))).all()) if ranked else set()
+    
+    best: Dict[int, Tuple[int, float]] = {}
+    for chunk_id, recording_id, score in ranked:
+        if recording_id in completed and recording_id not in best:
+            best[recording_id] = (chunk_id, score)
+            if len(best) == limit:
+                break
+    
+    chunks = await db.run_sync(chunk_service.get_chunks, [chunk_id for chunk_id, _ in best.values()])
+    return [
+        (recording_id, score, chunks.get(chunk_id))
+        for recording_id, (chunk_id, score) in best.items()
+    ]
+
+
+def _in_created_range(query, created: CreatedRange):
+    """Restrict a Recording select to a creation time range"""
+    created_from, created_to = created
+    if created_from:
+        query = query.filter(Recording.created_at >= created_from)
+    if created_to:
+        query = query.filter(Recording.created_at < created_to)
+    return query
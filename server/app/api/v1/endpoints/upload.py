@@ -1,7 +1,10 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any, List
 import logging
 
+from app.models.database import get_db
 from app.models.schemas import FileUploadResponse, MultipleFileUploadResponse, RecordingResponse
 from app.services.storage_service import storage_service
 from app.services.file_service import file_service
@@ -30,7 +33,8 @@ def should_transcribe(content_type: str) -> bool:
 
 @router.post("/upload", response_model=RecordingResponse)
 async def upload_file(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Upload a single file to Supabase Storage bucket and create recording entry
@@ -56,7 +60,8 @@ async def upload_file(
         logger.info(f"📖 Read {len(file_content)} bytes from file")
         
         # Upload to Supabase Storage
-        file_details = storage_service.upload_file(
+        file_details = await run_in_threadpool(
+            storage_service.upload_file,
             file_content=file_content,
             filename=file.filename,
             content_type=file.content_type
@@ -64,7 +69,8 @@ async def upload_file(
         logger.info("☁️  File uploaded to storage successfully")
         
         # Create recording entry in database
-        recording = recording_service.create_recording(
+        recording = await recording_service.create_recording(
+            db,
             original_filename=file_details['original_filename'],
             media_url=file_details['public_url'],
             storage_path=file_details['storage_path'],
@@ -76,7 +82,9 @@ async def upload_file(
         # Start transcription and analysis process if it's an audio/video file
         if should_transcribe(file.content_type or ""):
             logger.info(f"🎤 Scheduling transcription and analysis for {file.filename}")
-            job_id = task_service.enqueue_task(
+            # Off the event loop: without a queue the task runs synchronously
+            job_id = await run_in_threadpool(
+                task_service.enqueue_task,
                 process_transcription_task,
                 recording.id,
                 file_details['public_url'],
@@ -87,7 +95,7 @@ async def upload_file(
             logger.info(f"⏭️  Skipping transcription for {file.content_type} file")
         
         logger.info(f"✅ Single file upload completed: {file.filename}")
-        return RecordingResponse.from_orm(recording)
+        return RecordingResponse.model_validate(recording)
         
     except Exception as e:
         logger.error(f"❌ Upload failed for {file.filename}: {str(e)}")
@@ -99,7 +107,8 @@ async def upload_file(
 
 @router.post("/upload-multiple", response_model=MultipleFileUploadResponse)
 async def upload_multiple_files(
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_db)
 ) -> Any:
     """
     Upload multiple files to Supabase Storage bucket and create recording entries
@@ -131,7 +140,8 @@ async def upload_multiple_files(
             logger.debug(f"📖 Read {len(file_content)} bytes from file")
             
             # Upload to Supabase Storage
-            file_details = storage_service.upload_file(
+            file_details = await run_in_threadpool(
+                storage_service.upload_file,
                 file_content=file_content,
                 filename=file.filename,
                 content_type=file.content_type
@@ -139,7 +149,8 @@ async def upload_multiple_files(
             logger.debug("☁️  File uploaded to storage successfully")
             
             # Create recording entry in database
-            recording = recording_service.create_recording(
+            recording = await recording_service.create_recording(
+                db,
                 original_filename=file_details['original_filename'],
                 media_url=file_details['public_url'],
                 storage_path=file_details['storage_path'],
@@ -151,7 +162,9 @@ async def upload_multiple_files(
             # Start transcription and analysis process if it's an audio/video file
             if should_transcribe(file.content_type or ""):
                 logger.info(f"🎤 Scheduling transcription and analysis for {file.filename}")
-                job_id = task_service.enqueue_task(
+                # Off the event loop: without a queue the task runs synchronously
+                job_id = await run_in_threadpool(
+                    task_service.enqueue_task,
                     process_transcription_task,
                     recording.id,
                     file_details['public_url'],
@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Clients may keep responses but must revalidate them, which costs a 304 when nothing changed
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def recording_etag(recording_id: int, updated_at: Optional[datetime]) -> str:
+    """Strong validator of one recording's representation"""
+    version = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+    return f'"r{recording_id}-{version}"'
+
+
+def list_etag(query: str, keys: Iterable[Tuple[int, Optional[datetime]]], total: Optional[int]) -> str:
+    """
+    Strong validator of a list page
+
+    Args:
+        query: Query string the page was requested with, which selects its filters and fields
+        keys: (id, updated_at) of each recording on the page, in order
+        total: Total reported with the page
+    """
+    digest = hashlib.sha1(query.encode())
+    for recording_id, updated_at in keys:
+        digest.update(f"|{recording_id}:{updated_at.isoformat() if updated_at else ''}".encode())
+    digest.update(f"|{total}".encode())
+    return f'"l-{digest.hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC timestamp as an HTTP date"""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def has_validators(request: Request) -> bool:
+    """Whether the request is conditional, so checking the validators first can save the full load"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when it is absent, as RFC 9110 orders them
+
+    Args:
+        request: Incoming GET request
+        etag: Current validator of the resource
+        last_modified: Naive UTC modification time, if the resource has one
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: a W/ prefix added by an intermediary still matches
+        candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole seconds
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """Headers sent with both full and 304 responses"""
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    # Typed like the full response, so compression gives both the same validator
+    return Response(status_code=304, headers=validator_headers(etag, last_modified), media_type="application/json")
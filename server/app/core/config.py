@@ -22,6 +22,12 @@ class Settings(BaseSettings):
     # OpenAI Settings
     openai_api_key: Optional[str] = None
     
+    # Visual summary style: "flowchart" renders locally to SVG, "dalle" uses DALL·E 3
+    visual_summary_style: str = "flowchart"
+    visual_summary_lock_ttl: int = 600  # Seconds a queued on-demand generation blocks duplicate jobs
+    visual_summary_retry_after: int = 60  # Seconds before a failed generation may be retried
+    visual_summary_variant_sizes: dict[str, int] = {"thumbnail": 256, "card": 512, "full": 1024}
+    
     # HuggingFace Settings (for speaker diarization)
     huggingface_access_token: Optional[str] = None
     
@@ -37,7 +43,42 @@ class Settings(BaseSettings):
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
-    
+
+    # Cross-process cache invalidation
+    version_poll_interval: float = 5.0  # Seconds between Redis re-reads of shared version counters
+    status_stream_heartbeat: float = 15.0  # Seconds between keep-alive comments on idle status streams
+
+    # Search
+    transcript_chunk_chars: int = 600  # Target size of the transcript chunks returned as search hits
+
+    search_mode: str = "semantic"  # Default /search/semantic mode: semantic, full_text, hybrid
+    search_rrf_k: int = 60  # Reciprocal rank fusion constant for hybrid search
+    search_hybrid_depth: int = 3  # Each hybrid retriever returns limit * depth recordings
+    search_cache_size: int = 512  # Search responses kept until the corpus changes
+    title_search_min_similarity: float = 0.3  # Share of query trigrams a fuzzy title match needs
+    autocomplete_top_k: int = 10  # Most suggestions returned per prefix
+    autocomplete_phrases_per_recording: int = 30  # Most repeated transcript phrases taken from each recording
+    autocomplete_min_phrase_recordings: int = 2  # Recordings a phrase must appear in to be suggested
+    full_text_backend: str = "database"  # database (tsvector / FTS5) or bm25 (in-process index)
+    bm25_index_path: str = "./data/bm25_index"
+    bm25_merge_factor: int = 8  # Segments allowed per shard before the smallest ones are merged
+    bm25_hot_months: int = 2  # Monthly shards kept writable; older ones are compacted and sealed
+    bm25_max_open_cold_shards: int = 24  # Sealed shards kept mapped after a query
+    bm25_search_workers: int = 4  # Threads scoring shards concurrently
+    # Semantic search (local CPU embedding model + on-disk vector index)
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_batch_size: int = 32
+    embedding_query_cache_size: int = 1024  # Query embeddings kept in the LRU cache
+    vector_index_path: str = "./data/vector_index"
+    vector_index_train_threshold: int = 4096  # Live rows before switching from exact scan to IVF
+    vector_index_nprobe: int = 16  # IVF lists scanned per query
+
+    # Local label pre-classifier (settles confident decisions without the LLM)
+    label_classifier_features: int = 2 ** 16  # Hashed feature space size
+    label_classifier_min_samples: int = 20  # LLM verdicts needed before a rule's model is trusted
+    label_classifier_confidence: float = 0.9  # Probability needed to settle a decision locally
+    label_classifier_audit_rate: float = 0.05  # Share of confident decisions still sent to the LLM
+
     @property
     def database_connection_string(self) -> str:
         """Build database connection string from Supabase or individual components"""
@@ -50,6 +91,23 @@ class Settings(BaseSettings):
             
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
     
+    @property
+    def async_database_connection_string(self) -> str:
+        """The same database through an asyncio driver: asyncpg for PostgreSQL, aiosqlite for SQLite"""
+        url = self.database_connection_string
+        if url.startswith("postgresql://"):
+            # asyncpg takes `ssl` where libpq takes `sslmode`
+            return "postgresql+asyncpg://" + url[len("postgresql://"):].replace("sslmode=", "ssl=")
+        if url.startswith("sqlite://"):
+            return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+        return url
+    
+    # Recordings read per database round trip by the NDJSON export
+    export_batch_size: int = 500
+    
+    # Response compression (zstd, brotli or gzip, as the client accepts)
+    compression_minimum_size: int = 1024  # Smaller bodies are sent as they are
+    
     # CORS Settings
     cors_origins: list[str] = ["*"]
     cors_methods: list[str] = ["*"]
@@ -3,13 +3,176 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import time
 import logging
+import zlib
+from typing import Optional
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Preferred first when the client accepts several equally
+COMPRESSION_ENCODINGS = ("zstd", "br", "gzip")
+# Levels tuned for compressing on every request rather than for the smallest output
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+# A streamed body is flushed to the client after this much input; flushing every small chunk costs ratio
+STREAM_FLUSH_SIZE = 16 * 1024
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "image/svg+xml", "text/"
+)
+# Events must reach the client as they are sent
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class _Compressor:
+    """One response's streaming compressor for a content coding"""
+    
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self._unflushed = 0
+        if encoding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        elif encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """Compress a chunk, flushing once enough input has gone in so the client can decode it"""
+        self._unflushed += len(data)
+        if not final and self._unflushed < STREAM_FLUSH_SIZE:
+            if self.encoding == "zstd":
+                return self._zstd.compress(data)
+            if self.encoding == "br":
+                return self._brotli.process(data)
+            return self._zlib.compress(data)
+        self._unflushed = 0
+        if self.encoding == "zstd":
+            mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            return self._zstd.compress(data) + self._zstd.flush(mode)
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content coding for a response from an Accept-Encoding header
+    
+    Returns:
+        "zstd", "br" or "gzip", or None to send the body as it is
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding.strip()] = quality
+    wildcard = accepted.get("*", 0.0)
+    best = max(COMPRESSION_ENCODINGS, key=lambda coding: accepted.get(coding, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best coding the client accepts
+    
+    A complete body is compressed when it reaches the minimum size; a
+    streamed body is compressed as it goes and flushed every few KB of input.
+    Media, already encoded responses and event streams pass through. Every
+    response of a compressible type gets a weak ETag and Vary, whether its
+    body was compressed, too small to be, or is a 304, so a resource keeps
+    one validator however it was last sent; compressed bytes differ from the
+    identity representation while If-None-Match still matches it.
+    """
+    
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+        
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk shows whether compressing pays
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                encodable = "content-encoding" not in headers and self._compressible(headers.get("content-type", ""))
+                if encodable:
+                    self._mark_encoded(headers)
+                if (
+                    not encodable
+                    or start["status"] in (204, 304)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    body = compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body
+            })
+        
+        await self.app(scope, receive, send_compressed)
+    
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+    
+    def _compressible(self, content_type: str) -> bool:
+        content_type = content_type.lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSED_TYPES)
+
 
 def setup_cors(app: FastAPI) -> None:
     """Setup CORS middleware"""
@@ -57,8 +220,16 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+def setup_compression(app: FastAPI) -> None:
+    """Setup negotiated response compression"""
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_size)
+
+
 def setup_middleware(app: FastAPI) -> None:
     """Setup all middleware"""
+    # Compression sits innermost, so the other middleware see the encoded response
+    setup_compression(app)
+    
     # Request logging middleware
     app.middleware("http")(log_requests)
     
@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 import logging
 import sys
 from datetime import datetime
@@ -7,7 +8,13 @@ from app.core.config import settings
 from app.core.middleware import setup_middleware
 from app.core.exceptions import http_exception_handler, general_exception_handler
 from app.api.v1.api import api_router
-from app.models.database import engine, Base
+from app.models.database import engine, async_engine, Base
+from app.services.search_service import search_service
+from app.services.recording_service import recording_service
+from app.services.meeting_item_service import meeting_item_service
+from app.services.title_search_service import title_search_service
+from app.services.autocomplete_service import autocomplete_service
+from app.services.status_stream_service import status_stream_service
 
 # Configure comprehensive logging
 logging.basicConfig(
@@ -36,6 +43,7 @@ def create_application() -> FastAPI:
         debug=settings.debug,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
+        default_response_class=ORJSONResponse,
     )
     
     # Setup middleware
@@ -68,11 +76,28 @@ def create_application() -> FastAPI:
         except Exception as e:
             logger.error(f"❌ Failed to create database tables: {e}")
             raise e
+        
+        # Full-text search index (tsvector column or FTS5 table, outside the ORM models)
+        search_service.ensure_index()
+        title_search_service.ensure_index()
+        
+        # Listing counters for databases created before they were maintained
+        recording_service.ensure_counts()
+        
+        # Action item and decision rows for recordings analyzed before they were normalized
+        meeting_item_service.backfill()
+        
+        # In-memory typeahead index, built in the background and patched on recording changes
+        autocomplete_service.start()
+        
+        # Processing status changes from the workers, pushed to streaming clients
+        status_stream_service.start()
     
     # Add shutdown event
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutting down application")
+        await async_engine.dispose()
     
     return app
 
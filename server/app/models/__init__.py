@@ -1,4 +1,10 @@
 # Import all models to ensure they are properly registered with SQLAlchemy
 from .recording import Recording
+from .recording_label import RecordingLabel
+from .recording_count import RecordingCount
+from .label_classifier import LabelVerdict, LabelClassifier
+from .transcript_chunk import TranscriptChunk
+from .speaker_turn import SpeakerTurn
+from .meeting_item import ActionItem, Decision
 
-__all__ = ["Recording"]
\ No newline at end of file
+__all__ = ["Recording", "RecordingLabel", "RecordingCount", "LabelVerdict", "LabelClassifier", "TranscriptChunk", "SpeakerTurn", "ActionItem", "Decision"]
\ No newline at end of file
@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator
 import logging
 
 from app.core.config import settings
@@ -55,21 +57,39 @@ else:
         echo=settings.debug
     )
 
+# Async engine for API requests, so endpoints await queries on the event loop
+if is_postgresql:
+    async_engine = create_async_engine(
+        settings.async_database_connection_string,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=20,
+        max_overflow=30,
+        pool_timeout=30,
+        echo=settings.debug
+    )
+else:
+    async_engine = create_async_engine(settings.async_database_connection_string, echo=settings.debug)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+# Objects stay readable after commit; async sessions cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    Get an async database session for an API request
+
+    Services whose query code is shared with the synchronous background tasks
+    run it through `await db.run_sync(...)`, which still awaits the I/O.
+    """
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def get_background_db():
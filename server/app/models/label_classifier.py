@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, LargeBinary, ForeignKey
+from datetime import datetime
+
+from app.models.database import Base
+
+
+class LabelVerdict(Base):
+    """A single labeling decision for one rule on one recording, made locally or by the LLM"""
+    __tablename__ = "label_verdicts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False, index=True)
+    rule_id = Column(Integer, ForeignKey("labeling_rules.id", ondelete="CASCADE"), nullable=False, index=True)
+    applied = Column(Boolean, nullable=False)
+    confidence = Column(Float)
+    source = Column(String(10), nullable=False)  # llm, local
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class LabelClassifier(Base):
+    """Persisted state of the local pre-classifier for one labeling rule"""
+    __tablename__ = "label_classifiers"
+
+    rule_id = Column(Integer, ForeignKey("labeling_rules.id", ondelete="CASCADE"), primary_key=True)
+    rule_fingerprint = Column(String(16), nullable=False)  # Model is reset when the rule text changes
+    weights = Column(LargeBinary, nullable=False)  # zlib-compressed float32 array
+    bias = Column(Float, nullable=False, default=0.0)
+    n_samples = Column(Integer, nullable=False, default=0)
+    n_positive = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, Index, func
+
+from app.models.database import Base
+
+
+class ActionItem(Base):
+    """An action item extracted from a recording, queryable across recordings"""
+    __tablename__ = "action_items"
+
+    id = Column(Integer, primary_key=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # Order within the recording's analysis
+    description = Column(Text, nullable=False)
+    assignee = Column(String)
+    due_date = Column(Date)
+    priority = Column(String(10))  # high, medium, low
+    status = Column(String(10), nullable=False, default="open")  # open, done
+
+    __table_args__ = (
+        Index("ix_action_items_recording_id_position", "recording_id", "position", unique=True),
+        # Dashboard filters: equality columns first, then the (due_date, id) keyset order
+        Index("ix_action_items_assignee_status_due_date", func.lower(assignee), "status", "due_date", "id"),
+        Index("ix_action_items_status_priority_due_date", "status", "priority", "due_date", "id"),
+        Index("ix_action_items_due_date", "due_date", "id"),
+    )
+
+
+class Decision(Base):
+    """A decision extracted from a recording, queryable across recordings"""
+    __tablename__ = "decisions"
+
+    id = Column(Integer, primary_key=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    description = Column(Text, nullable=False)
+    owner = Column(String)
+    context = Column(Text)
+    impact = Column(Text)
+
+    __table_args__ = (
+        Index("ix_decisions_recording_id_position", "recording_id", "position", unique=True),
+        Index("ix_decisions_owner", func.lower(owner), "id"),
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index
+from sqlalchemy.orm import column_property, relationship
 from datetime import datetime
 
 from app.models.database import Base
@@ -17,13 +17,17 @@ class Recording(Base):
     content_type = Column(String)
     transcript = Column(Text)
     transcript_with_speakers = Column(Text)  # For diarized transcript
+    transcript_preview = Column(String)  # Start of the transcript, so list views never read the full text
     
     # Analysis fields
     summary = Column(Text)  # Meeting/recording summary
+    title = Column(String)  # Short title from the summary's first sentence, fuzzy-searchable
     action_items = Column(JSON)  # List of action items with details
     decisions = Column(JSON)  # List of decisions with owners
-    visual_summary_url = Column(String)  # DALL·E 3 generated visual summary
+    visual_summary_url = Column(String)  # Generated visual summary (local SVG or DALL·E 3)
+    visual_summary_variants = Column(JSON)  # WebP derivative URLs by size name (thumbnail, card, full)
     labels = Column(JSON)  # List of applied labels based on rules
+    has_summary = column_property(summary.isnot(None), deferred=True)  # Loaded by list views only
     
     processing_status = Column(String, default="pending")  # pending, processing, completed, failed
     processing_error = Column(Text)
@@ -31,5 +35,12 @@ class Recording(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationship to text chunks (using lazy loading to avoid circular imports)
-    # Embeddings functionality removed - using simple text search instead 
\ No newline at end of file
+    # Transcript chunks live in transcript_chunks; their embeddings in the on-disk vector index 
+    
+    __table_args__ = (
+        # Keyset pagination of the recordings list, newest first
+        Index("ix_recordings_created_at_id", "created_at", "id"),
+        # Filtered listings: the equality filter first, then the same sort key
+        Index("ix_recordings_processing_status_created_at_id", "processing_status", "created_at", "id"),
+        Index("ix_recordings_content_type_created_at_id", "content_type", "created_at", "id"),
+    )
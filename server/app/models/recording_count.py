@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from app.models.database import Base
+
+
+class RecordingCount(Base):
+    """Number of recordings per listing scope, adjusted in the same transaction as each change"""
+    __tablename__ = "recording_counts"
+    
+    # "all", or "label:<name>" for the recordings carrying a label
+    scope = Column(String(120), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+
+from app.models.database import Base
+
+
+class RecordingLabel(Base):
+    """Normalized association between a recording and an applied label"""
+    __tablename__ = "recording_labels"
+    
+    # The (recording_id, label_name) primary key doubles as the per-recording index
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), primary_key=True)
+    label_name = Column(String(100), primary_key=True)
+    label_color = Column(String(7))
+    confidence = Column(Float)
+    
+    __table_args__ = (
+        Index("ix_recording_labels_label_name_recording_id", "label_name", "recording_id"),
+    )
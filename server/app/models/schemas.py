@@ -64,6 +64,38 @@ class DecisionResponse(BaseModel):
     impact: Optional[str] = None
 
 
+class ActionItemRecord(ActionItemResponse):
+    """Normalized action item with the recording it came from"""
+    id: int
+    recording_id: int
+    recording_title: str
+    status: str
+
+
+class ActionItemListResponse(BaseModel):
+    """One keyset page of action items"""
+    items: List[ActionItemRecord]
+    next_cursor: Optional[str] = None
+
+
+class ActionItemStatusUpdate(BaseModel):
+    """Schema for marking an action item open or done"""
+    status: str = Field(..., pattern=r'^(open|done)$')
+
+
+class DecisionRecord(DecisionResponse):
+    """Normalized decision with the recording it came from"""
+    id: int
+    recording_id: int
+    recording_title: str
+
+
+class DecisionListResponse(BaseModel):
+    """One keyset page of decisions"""
+    items: List[DecisionRecord]
+    next_cursor: Optional[str] = None
+
+
 class AppliedLabel(BaseModel):
     """Schema for an applied label on a recording"""
     label_name: str
@@ -84,9 +116,11 @@ class RecordingResponse(BaseModel):
     
     # Analysis fields
     summary: Optional[str]
+    title: Optional[str] = None
     action_items: Optional[List[Dict[str, Any]]]
     decisions: Optional[List[Dict[str, Any]]]
     visual_summary_url: Optional[str]
+    visual_summary_variants: Optional[Dict[str, str]] = None
     labels: Optional[List[AppliedLabel]] = None
     
     processing_status: str
@@ -129,7 +163,78 @@ class LabelingRuleResponse(BaseModel):
         from_attributes = True
 
 
+class LabelClassifierModelStats(BaseModel):
+    """Training state of the local pre-classifier for one rule"""
+    rule_id: int
+    samples: int
+    positive_samples: int
+    ready: bool
+
+
+class LabelClassifierStatsResponse(BaseModel):
+    """Share of labeling decisions made locally vs by the LLM"""
+    total_decisions: int
+    local_decisions: int
+    llm_decisions: int
+    local_share: float
+    models: List[LabelClassifierModelStats]
+
+
+class RecordingListItem(BaseModel):
+    """
+    Recording in a list response
+
+    Only the fields that were requested are set; by default the compact
+    `RECORDING_LIST_FIELDS`, which leave out transcripts and analysis JSON.
+    """
+    id: int
+    original_filename: Optional[str] = None
+    title: Optional[str] = None
+    media_url: Optional[str] = None
+    storage_path: Optional[str] = None
+    file_size: Optional[int] = None
+    content_type: Optional[str] = None
+    transcript_preview: Optional[str] = None
+    has_summary: Optional[bool] = None
+    transcript: Optional[str] = None
+    transcript_with_speakers: Optional[str] = None
+    summary: Optional[str] = None
+    action_items: Optional[List[Dict[str, Any]]] = None
+    decisions: Optional[List[Dict[str, Any]]] = None
+    visual_summary_url: Optional[str] = None
+    visual_summary_variants: Optional[Dict[str, str]] = None
+    labels: Optional[List[AppliedLabel]] = None
+    processing_status: Optional[str] = None
+    processing_error: Optional[str] = None
+    duration: Optional[float] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+# Fields of a list item when the client does not ask for specific ones. Only generated
+# images have resized variants; flowchart SVGs are light enough to list by their URL.
+RECORDING_LIST_FIELDS = (
+    "id", "original_filename", "title", "media_url", "file_size", "content_type", "transcript_preview",
+    "has_summary", "visual_summary_url", "visual_summary_variants", "labels", "processing_status",
+    "processing_error", "duration", "created_at", "updated_at",
+)
+
+
 class RecordingListResponse(BaseModel):
     """Recording list response model"""
-    recordings: List[RecordingResponse]
-    total: int 
\ No newline at end of file
+    recordings: List[RecordingListItem]
+    total: Optional[int]  # None for filters without a maintained counter unless an exact count was asked for
+    total_exact: bool = False  # False when total is the maintained counter
+    next_cursor: Optional[str] = None
+
+
+class LabelFacet(BaseModel):
+    """Number of recordings carrying a label"""
+    label_name: str
+    label_color: Optional[str] = None
+    count: int
+
+
+class LabelFacetsResponse(BaseModel):
+    """Per-label recording counts"""
+    facets: List[LabelFacet]
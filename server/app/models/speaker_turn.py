@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Index
+
+from app.models.database import Base
+
+
+class SpeakerTurn(Base):
+    """One diarized speaker turn of a recording, the unit of speaker-scoped search"""
+    __tablename__ = "speaker_turns"
+    
+    id = Column(Integer, primary_key=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False)
+    turn_index = Column(Integer, nullable=False)  # Position within the diarized transcript
+    speaker = Column(String, nullable=False)  # Label as written in transcript_with_speakers, e.g. "B"
+    start_time = Column(Float)  # Seconds from the start of the recording
+    end_time = Column(Float)
+    text = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_speaker_turns_recording_id_turn_index", "recording_id", "turn_index", unique=True),
+        Index("ix_speaker_turns_speaker_recording_id", "speaker", "recording_id"),
+    )
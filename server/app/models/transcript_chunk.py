@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Text, Float, ForeignKey, Index
+
+from app.models.database import Base
+
+
+class TranscriptChunk(Base):
+    """Time-anchored slice of a recording's transcript, the unit of search hits"""
+    __tablename__ = "transcript_chunks"
+    
+    id = Column(Integer, primary_key=True)
+    recording_id = Column(Integer, ForeignKey("recordings.id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)  # Position within the transcript
+    text = Column(Text, nullable=False)
+    start_time = Column(Float)  # Seconds from the start of the recording
+    end_time = Column(Float)
+    char_start = Column(Integer, nullable=False)  # Offsets into Recording.transcript
+    char_end = Column(Integer, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_transcript_chunks_recording_id_chunk_index", "recording_id", "chunk_index", unique=True),
+    )
@@ -0,0 +1,282 @@
+import bisect
+import logging
+import queue
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.meeting_item import ActionItem, Decision
+from app.models.recording import Recording
+from app.models.recording_label import RecordingLabel
+from app.models.speaker_turn import SpeakerTurn
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+RECORDING_CHANGES_CHANNEL = "recording_changes"
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+MAX_WORD_STARTS = 4  # Suggestions also match from their first few word starts
+PHRASE_STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i if in is it its me my no not of on or "
+    "our she so that the their them then there they this to uh um up us was we were what when which who "
+    "will with would yeah yes you your".split()
+)
+
+# (kind, display text), e.g. ("speaker", "B")
+Term = Tuple[str, str]
+
+KEY_END = "\U0010ffff"  # Sorts after every continuation of a prefix
+LENGTH_SLOTS = 4096  # Ranks order equal weights by shorter text first
+COMPACT_AFTER = 500  # Changed terms kept beside the sorted index before it is rebuilt
+
+
+class _Index:
+    """Sorted word-start keys of every term, never modified once built"""
+    __slots__ = ("keys", "terms", "weights", "ranks")
+
+    def __init__(self, entries: List[Tuple[str, int, Term]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.terms = [term for _, _, term in entries]
+        self.weights = np.fromiter((weight for _, weight, _ in entries), dtype=np.int64, count=len(entries))
+        lengths = np.fromiter((len(term[1]) for _, _, term in entries), dtype=np.int64, count=len(entries))
+        self.ranks = self.weights * LENGTH_SLOTS - np.minimum(lengths, LENGTH_SLOTS - 1)
+
+
+class AutocompleteService:
+    """
+    In-memory typeahead suggestions
+
+    Filenames, speaker names, label names, assignees and owners, and
+    frequent transcript phrases are indexed under their normalized text from
+    each of their first word starts. The keys are one sorted list with
+    parallel weight arrays, so a lookup bisects to the prefix's range and
+    takes its heaviest entries with a partial sort, without touching the
+    database. Weights are kept per recording; when a recording is created,
+    completes processing, is relabeled or deleted, a message on the
+    "recording_changes" channel makes every API process re-read just that
+    recording. Its changed terms go into a small overlay read next to the
+    index, which is rebuilt once the overlay grows. Index and overlay are
+    replaced together by reference and never modified, so lookups take no
+    lock.
+    """
+
+    def __init__(self):
+        # (index, overlay of Term -> (weight, keys) for terms changed since the index was built)
+        self._snapshot: Tuple[_Index, Dict[Term, Tuple[int, Tuple[str, ...]]]] = (_Index([]), {})
+        # Only the index thread touches these
+        self._weights: Counter = Counter()  # Term -> weight summed over recordings
+        self._contributions: Dict[int, Counter] = {}  # recording_id -> Term -> weight
+        self._pending: "queue.Queue[int]" = queue.Queue()
+        self._ready = False
+        self._started = False
+
+    def start(self) -> None:
+        """Subscribe to recording changes and build the index in the background"""
+        if self._started:
+            return
+        self._started = True
+        pubsub_service.subscribe(RECORDING_CHANGES_CHANNEL, self._on_change)
+        threading.Thread(target=self._run, name="ordo-autocomplete", daemon=True).start()
+
+    def notify_recording_changed(self, recording_id: int) -> None:
+        """Tell every process to refresh one recording's suggestions"""
+        if not pubsub_service.publish(RECORDING_CHANGES_CHANNEL, {"recording_id": recording_id}) and self._started:
+            # Without Redis only this process can be told
+            self._pending.put(recording_id)
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Suggestions for a typed prefix, best first
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of dicts with `text`, `kind` (filename, speaker, label,
+            person or phrase) and `weight`
+        """
+        key = self._normalize(prefix)
+        if not key:
+            return []
+        limit = min(limit, settings.autocomplete_top_k)
+        index, overlay = self._snapshot
+
+        best: Dict[Term, int] = {}
+        lo = bisect.bisect_left(index.keys, key)
+        hi = bisect.bisect_left(index.keys, key + KEY_END, lo)
+        # Enough entries that a term's other word starts and terms shadowed
+        # by the overlay cannot crowd out the real top suggestions
+        wanted = (limit + len(overlay)) * MAX_WORD_STARTS
+        positions = range(lo, hi)
+        if hi - lo > wanted:
+            positions = lo + np.argpartition(-index.ranks[lo:hi], wanted)[:wanted]
+        for position in positions:
+            term = index.terms[position]
+            if term not in overlay:
+                best[term] = int(index.weights[position])
+        for term, (weight, keys) in overlay.items():
+            if weight > 0 and any(candidate.startswith(key) for candidate in keys):
+                best[term] = weight
+
+        top = sorted(best.items(), key=lambda item: (-item[1], len(item[0][1])))[:limit]
+        return [{"text": text, "kind": kind, "weight": weight} for (kind, text), weight in top]
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    # Index maintenance
+
+    def _run(self) -> None:
+        try:
+            self._build()
+        except Exception as e:
+            logger.error(f"❌ Failed to build autocomplete index: {e}")
+        self._ready = True
+        while True:
+            recording_id = self._pending.get()
+            try:
+                self._refresh_recording(recording_id)
+            except Exception as e:
+                logger.error(f"❌ Failed to refresh autocomplete for recording {recording_id}: {e}")
+
+    def _on_change(self, data: Any) -> None:
+        # Runs on the pub/sub listener thread, so only queue the work
+        if isinstance(data, dict) and isinstance(data.get("recording_id"), int):
+            self._pending.put(data["recording_id"])
+
+    def _build(self, batch_size: int = 200) -> None:
+        """Load suggestions for every recording, one batch of recordings at a time"""
+        contributions: Dict[int, Counter] = {}
+        weights: Counter = Counter()
+        db = SessionLocal()
+        try:
+            last_id = 0
+            total = 0
+            while True:
+                recordings = db.query(Recording.id, Recording.original_filename, Recording.transcript).filter(
+                    Recording.id > last_id
+                ).order_by(Recording.id).limit(batch_size).all()
+                if not recordings:
+                    break
+                related = self._load_related(db, [row[0] for row in recordings])
+                for recording_id, filename, transcript in recordings:
+                    contributions[recording_id] = self._contribution(filename, transcript, related[recording_id])
+                    weights.update(contributions[recording_id])
+                total += len(recordings)
+                last_id = recordings[-1][0]
+
+            # Compiled without blocking lookups, which keep using the old index until the swap
+            self._contributions = contributions
+            self._weights = weights
+            self._compact()
+            logger.info(f"🔠 Autocomplete index built from {total} recordings ({len(self._weights)} suggestions)")
+        finally:
+            db.close()
+
+    def _refresh_recording(self, recording_id: int) -> None:
+        db = SessionLocal()
+        try:
+            row = db.query(Recording.original_filename, Recording.transcript).filter(
+                Recording.id == recording_id
+            ).first()
+            if row is None:
+                self._set_contribution(recording_id, Counter())
+                return
+            names = self._load_related(db, [recording_id])[recording_id]
+            self._set_contribution(recording_id, self._contribution(row[0], row[1], names))
+        finally:
+            db.close()
+        logger.debug(f"🔠 Autocomplete refreshed for recording {recording_id}")
+
+    def _load_related(self, db, recording_ids: List[int]) -> Dict[int, List[Term]]:
+        """Speaker, label and person names of a batch of recordings, in one query per table"""
+        related: Dict[int, List[Term]] = {recording_id: [] for recording_id in recording_ids}
+        sources = (
+            ("speaker", SpeakerTurn.recording_id, SpeakerTurn.speaker),
+            ("label", RecordingLabel.recording_id, RecordingLabel.label_name),
+            ("person", ActionItem.recording_id, ActionItem.assignee),
+            ("person", Decision.recording_id, Decision.owner),
+        )
+        for kind, recording_column, name_column in sources:
+            for recording_id, name in db.query(recording_column, name_column).filter(
+                recording_column.in_(recording_ids), name_column.isnot(None)
+            ).distinct():
+                related[recording_id].append((kind, name))
+        return related
+
+    def _contribution(self, filename: Optional[str], transcript: Optional[str], names: List[Term]) -> Counter:
+        """Terms one recording adds, each counted once per recording"""
+        terms: Counter = Counter()
+        if filename:
+            terms[("filename", filename)] = 1
+        for term in names:
+            terms[term] = 1
+        for phrase in self._phrases(transcript or ""):
+            terms[("phrase", phrase)] = 1
+        return terms
+
+    def _phrases(self, transcript: str) -> List[str]:
+        """The recording's most repeated two- and three-word phrases without edge stopwords"""
+        words = TOKEN_PATTERN.findall(transcript.lower())
+        counts: Counter = Counter()
+        for size in (2, 3):
+            for i in range(len(words) - size + 1):
+                gram = words[i:i + size]
+                if gram[0] in PHRASE_STOPWORDS or gram[-1] in PHRASE_STOPWORDS:
+                    continue
+                counts[" ".join(gram)] += 1
+        return [phrase for phrase, count in counts.most_common(settings.autocomplete_phrases_per_recording) if count > 1]
+
+    def _set_contribution(self, recording_id: int, terms: Counter) -> None:
+        previous = self._contributions.pop(recording_id, Counter())
+        if terms:
+            self._contributions[recording_id] = terms
+        index, overlay = self._snapshot
+        overlay = dict(overlay)
+        for term in set(previous) | set(terms):
+            delta = terms.get(term, 0) - previous.get(term, 0)
+            if delta:
+                self._weights[term] += delta
+                overlay[term] = (self._effective_weight(term, self._weights[term]), tuple(self._keys(term[1])))
+                if self._weights[term] <= 0:
+                    del self._weights[term]
+        if len(overlay) > COMPACT_AFTER:
+            self._compact()
+        else:
+            self._snapshot = (index, overlay)
+
+    def _compact(self) -> None:
+        """Rebuild the sorted index from the summed weights and publish it with an empty overlay"""
+        entries = []
+        for term, weight in self._weights.items():
+            weight = self._effective_weight(term, weight)
+            if weight > 0:
+                entries.extend((key, weight, term) for key in self._keys(term[1]))
+        self._snapshot = (_Index(entries), {})
+
+    def _effective_weight(self, term: Term, weight: int) -> int:
+        """Phrases are only suggested once enough recordings share them"""
+        if term[0] == "phrase" and weight < settings.autocomplete_min_phrase_recordings:
+            return 0
+        return weight
+
+    def _keys(self, text: str) -> List[str]:
+        """The normalized text from each of its first word starts"""
+        normalized = self._normalize(text)
+        starts = [match.start() for match in TOKEN_PATTERN.finditer(normalized)][:MAX_WORD_STARTS]
+        return list(dict.fromkeys(normalized[start:] for start in starts))
+
+    def _normalize(self, text: str) -> str:
+        return " ".join(TOKEN_PATTERN.findall(text.lower()))
+
+
+# Global autocomplete service instance
+autocomplete_service = AutocompleteService()
@@ -0,0 +1,746 @@
+import fcntl
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.recording import Recording
+from app.models.transcript_chunk import TranscriptChunk
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+MAX_TERM_BYTES = 48  # Longer tokens are not indexed
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "index.lock"
+MERGE_LOCK_FILE = "merge.lock"
+SHARD_NAME_PATTERN = re.compile(r"^\d{4}-\d{2}$")  # One shard per month, e.g. 2026-10
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _encode_varints(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Variable-byte encode unsigned integers, 7 bits per byte, little-endian groups
+
+    Returns:
+        Tuple of (encoded bytes, byte length of each value)
+    """
+    values = values.astype(np.uint64)
+    lengths = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 5):
+        lengths += values >= (1 << (7 * k))
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    for k in range(5):
+        mask = lengths > k
+        if not mask.any():
+            break
+        byte = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        # High bit marks that more bytes of the same value follow
+        byte |= np.where(lengths[mask] > k + 1, np.uint64(0x80), np.uint64(0))
+        out[starts[mask] + k] = byte.astype(np.uint8)
+    return out, lengths
+
+
+def _decode_varints(data: np.ndarray) -> np.ndarray:
+    data = np.asarray(data)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.empty_like(ends)
+    starts[0:1] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    values = np.zeros(ends.size, dtype=np.uint32)
+    for k in range(int(lengths.max()) if lengths.size else 0):
+        mask = lengths > k
+        values[mask] |= (data[starts[mask] + k].astype(np.uint32) & 0x7F) << (7 * k)
+    return values
+
+
+@dataclass
+class _Segment:
+    """Immutable on-disk segment, memory-mapped"""
+    name: str
+    docs: int
+    total_length: int
+    terms: np.ndarray  # Sorted fixed-width byte strings
+    term_offsets: np.ndarray  # Byte offset of each term's postings, plus the end
+    term_df: np.ndarray
+    postings: np.ndarray  # Varint stream of (doc delta, term frequency) pairs
+    doc_chunk_ids: np.ndarray
+    doc_recording_ids: np.ndarray
+    doc_lengths: np.ndarray
+    doc_created: np.ndarray  # Recording creation time, UTC epoch seconds
+    deleted: np.ndarray  # Shared writable tombstones, 1 = deleted
+
+    def df(self, term: bytes) -> int:
+        index = int(np.searchsorted(self.terms, term))
+        if index >= self.terms.size or self.terms[index] != term:
+            return 0
+        return int(self.term_df[index])
+
+    def postings_for(self, term: bytes) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Decode one term's postings into (doc numbers, term frequencies)"""
+        index = int(np.searchsorted(self.terms, term))
+        if index >= self.terms.size or self.terms[index] != term:
+            return None
+        pairs = _decode_varints(self.postings[self.term_offsets[index]:self.term_offsets[index + 1]])
+        return np.cumsum(pairs[0::2]), pairs[1::2]
+
+
+@dataclass
+class _ShardStats:
+    docs: int
+    total_length: int
+    df: Dict[bytes, int]
+
+
+class _Shard:
+    """
+    One month of the BM25 index: segments listed by a manifest in its own directory
+
+    Each indexed recording is flushed as a small immutable segment; segments
+    are merged once there are more than `bm25_merge_factor` of them. When the
+    month falls out of the hot window the shard is compacted into a single
+    segment without deleted chunks and sealed.
+    """
+
+    def __init__(self, key: str, path: str):
+        self.key = key
+        self.path = path
+        # (manifest mtime, segments by name, active segments in order), only ever replaced whole
+        self._loaded: Tuple[Optional[int], Dict[str, _Segment], Tuple[_Segment, ...]] = (None, {}, ())
+        self._lock = threading.Lock()
+        # Guarded by the service lock
+        self.users = 0  # Queries in flight on this shard
+        self.evicted = False
+
+    # Writing
+
+    def index_chunks(self, recording_id: int, chunks: List[Tuple[int, str]], created: int) -> None:
+        with self._write_lock():
+            manifest = self._read_manifest()
+            self._retire(manifest, recording_id)
+            if chunks:
+                name = f"seg_{manifest['next_generation']:08d}"
+                manifest["next_generation"] += 1
+                self._write_segment(name, *self._invert(chunks, recording_id, created))
+                manifest["segments"].append(name)
+            if manifest.get("sealed"):
+                # Reprocessing an old recording reopens its month until the next compaction
+                manifest["sealed"] = False
+                logger.info(f"📇 BM25 shard {self.key} reopened for recording {recording_id}")
+            self._write_manifest(manifest)
+
+    def remove_recording(self, recording_id: int) -> int:
+        with self._write_lock():
+            manifest = self._read_manifest()
+            retired = self._retire(manifest, recording_id)
+            if retired:
+                # Sealed shards are compacted again so the deleted chunks are dropped
+                manifest["sealed"] = False
+                self._write_manifest(manifest)
+            return retired
+
+    def needs_merge(self, hot: bool) -> bool:
+        manifest = self._read_manifest()
+        if hot:
+            return len(manifest["segments"]) > settings.bm25_merge_factor
+        return bool(manifest["segments"]) and not manifest.get("sealed")
+
+    def merge(self, compact: bool) -> None:
+        """Merge the smallest segments, or compact every segment and seal the shard"""
+        with open(self._path(MERGE_LOCK_FILE), "w") as merge_lock:
+            try:
+                fcntl.flock(merge_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info(f"📇 BM25 merge of shard {self.key} already running elsewhere")
+                return
+            try:
+                self._merge(compact)
+            finally:
+                fcntl.flock(merge_lock, fcntl.LOCK_UN)
+
+    def _merge(self, compact: bool) -> None:
+        with self._write_lock():
+            manifest = self._read_manifest()
+            if compact:
+                if manifest.get("sealed"):
+                    return
+                sources = list(manifest["segments"])
+                if len(sources) == 1 and not np.asarray(self._open_segment(sources[0], writable=False).deleted).any():
+                    manifest["sealed"] = True
+                    self._write_manifest(manifest)
+                    logger.info(f"📇 Sealed BM25 shard {self.key}")
+                    return
+            else:
+                if len(manifest["segments"]) <= settings.bm25_merge_factor:
+                    return
+                sources = sorted(manifest["segments"], key=lambda name: self._segment_docs(name))
+                sources = sources[:settings.bm25_merge_factor]
+            if not sources:
+                return
+            name = f"seg_{manifest['next_generation']:08d}"
+            manifest["next_generation"] += 1
+            self._write_manifest(manifest)
+
+        # Segments are immutable, so the merge itself runs without the write lock
+        segments = [self._open_segment(source, writable=False) for source in sources]
+        term_arrays, pair_terms, pair_docs, pair_tfs = [], [], [], []
+        doc_maps = []
+        chunk_ids, recording_ids, lengths, created = [], [], [], []
+        next_doc = 0
+        for term_offset, segment in zip(np.cumsum([0] + [s.terms.size for s in segments]), segments):
+            alive = np.asarray(segment.deleted) == 0
+            doc_map = np.full(segment.docs, -1, dtype=np.int64)
+            doc_map[alive] = np.arange(next_doc, next_doc + int(alive.sum()))
+            next_doc += int(alive.sum())
+            doc_maps.append(doc_map)
+            chunk_ids.append(np.asarray(segment.doc_chunk_ids)[alive])
+            recording_ids.append(np.asarray(segment.doc_recording_ids)[alive])
+            lengths.append(np.asarray(segment.doc_lengths)[alive])
+            created.append(np.asarray(segment.doc_created)[alive])
+
+            pairs = _decode_varints(segment.postings)
+            df = np.asarray(segment.term_df).astype(np.int64)
+            # Each term's first posting holds its doc number, the rest hold deltas
+            deltas = pairs[0::2].astype(np.int64)
+            running = np.concatenate([[0], np.cumsum(deltas)])
+            docs = doc_map[running[1:] - np.repeat(running[np.cumsum(df) - df], df)]
+            keep = docs >= 0
+            term_arrays.append(np.asarray(segment.terms))
+            pair_terms.append(np.repeat(np.arange(segment.terms.size), df)[keep] + term_offset)
+            pair_docs.append(docs[keep])
+            pair_tfs.append(pairs[1::2][keep].astype(np.int64))
+
+        # Global vocabulary of the terms that still have live postings
+        vocabulary, inverse = np.unique(np.concatenate(term_arrays), return_inverse=True)
+        pair_global = inverse[np.concatenate(pair_terms)]
+        used = np.unique(pair_global)
+        self._write_segment(
+            name,
+            vocabulary[used],
+            np.searchsorted(used, pair_global),
+            np.concatenate(pair_docs),
+            np.concatenate(pair_tfs),
+            np.concatenate(chunk_ids),
+            np.concatenate(recording_ids),
+            np.concatenate(lengths),
+            np.concatenate(created)
+        )
+
+        with self._write_lock():
+            merged = self._open_segment(name, writable=True)
+            # Carry over deletions that happened while merging
+            late_deletes = 0
+            for segment, doc_map in zip(segments, doc_maps):
+                late = doc_map[(np.asarray(segment.deleted) == 1) & (doc_map >= 0)]
+                merged.deleted[late] = 1
+                late_deletes += int(late.size)
+            merged.deleted.flush()
+            manifest = self._read_manifest()
+            manifest["segments"] = [s for s in manifest["segments"] if s not in sources] + [name]
+            if compact:
+                # Writes that landed during the compaction leave the shard open for the next one
+                manifest["sealed"] = len(manifest["segments"]) == 1 and not late_deletes
+            self._write_manifest(manifest)
+
+        for source in sources:
+            # Readers holding the old maps keep them valid until they drop them
+            shutil.rmtree(self._path(source), ignore_errors=True)
+        action = "Compacted" if compact else "Merged"
+        logger.info(f"📇 {action} {len(sources)} segments of BM25 shard {self.key} into {name} ({next_doc} chunks)")
+
+    def _invert(self, chunks: List[Tuple[int, str]], recording_id: int, created: int):
+        term_ids: Dict[bytes, int] = {}
+        pair_terms, pair_docs, pair_tfs, lengths = [], [], [], []
+        for doc, (_, text) in enumerate(chunks):
+            tokens = [token.encode() for token in tokenize(text)]
+            lengths.append(len(tokens))
+            for term, tf in Counter(t for t in tokens if len(t) <= MAX_TERM_BYTES).items():
+                pair_terms.append(term_ids.setdefault(term, len(term_ids)))
+                pair_docs.append(doc)
+                pair_tfs.append(tf)
+
+        unsorted = np.array(list(term_ids), dtype=f"S{MAX_TERM_BYTES}")
+        order = np.argsort(unsorted)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.size)
+        return (
+            unsorted[order],
+            rank[np.array(pair_terms, dtype=np.int64)] if pair_terms else np.zeros(0, dtype=np.int64),
+            np.array(pair_docs, dtype=np.int64),
+            np.array(pair_tfs, dtype=np.int64),
+            np.array([chunk_id for chunk_id, _ in chunks], dtype=np.int64),
+            np.full(len(chunks), recording_id, dtype=np.int64),
+            np.array(lengths, dtype=np.uint32),
+            np.full(len(chunks), created, dtype=np.int64)
+        )
+
+    def _write_segment(
+        self,
+        name: str,
+        terms: np.ndarray,
+        pair_terms: np.ndarray,
+        pair_docs: np.ndarray,
+        pair_tfs: np.ndarray,
+        chunk_ids: np.ndarray,
+        recording_ids: np.ndarray,
+        lengths: np.ndarray,
+        created: np.ndarray
+    ) -> None:
+        """Encode postings sorted by (term, doc) and write the segment's arrays"""
+        order = np.lexsort((pair_docs, pair_terms))
+        pair_terms, pair_docs, pair_tfs = pair_terms[order], pair_docs[order], pair_tfs[order]
+
+        deltas = np.diff(pair_docs, prepend=0)
+        term_starts = np.ones(pair_terms.size, dtype=bool)
+        term_starts[1:] = pair_terms[1:] != pair_terms[:-1]
+        deltas[term_starts] = pair_docs[term_starts]
+
+        interleaved = np.empty(pair_docs.size * 2, dtype=np.uint64)
+        interleaved[0::2] = deltas
+        interleaved[1::2] = pair_tfs
+        postings, value_lengths = _encode_varints(interleaved)
+        pair_bytes = value_lengths[0::2] + value_lengths[1::2]
+
+        df = np.bincount(pair_terms, minlength=terms.size).astype(np.uint32)
+        term_bytes = np.bincount(pair_terms, weights=pair_bytes, minlength=terms.size).astype(np.uint64)
+        term_offsets = np.concatenate([[0], np.cumsum(term_bytes)]).astype(np.uint64)
+
+        path = self._path(name + ".tmp")
+        os.makedirs(path, exist_ok=True)
+        for array_name, array in (
+            ("terms", terms.astype(f"S{MAX_TERM_BYTES}")),
+            ("term_offsets", term_offsets),
+            ("term_df", df),
+            ("postings", postings),
+            ("doc_chunk_ids", chunk_ids.astype(np.int64)),
+            ("doc_recording_ids", recording_ids.astype(np.int64)),
+            ("doc_lengths", lengths.astype(np.uint32)),
+            ("doc_created", created.astype(np.int64)),
+            ("deleted", np.zeros(chunk_ids.size, dtype=np.uint8)),
+        ):
+            np.save(os.path.join(path, f"{array_name}.npy"), array)
+        with open(os.path.join(path, "segment.json"), "w") as segment_file:
+            json.dump({"docs": int(chunk_ids.size), "total_length": int(lengths.sum())}, segment_file)
+        os.replace(path, self._path(name))
+
+    def _retire(self, manifest: Dict[str, Any], recording_id: int) -> int:
+        retired = 0
+        for name in manifest["segments"]:
+            segment = self._open_segment(name, writable=True)
+            rows = np.flatnonzero(
+                (np.asarray(segment.doc_recording_ids) == recording_id) & (np.asarray(segment.deleted) == 0)
+            )
+            if rows.size:
+                segment.deleted[rows] = 1
+                segment.deleted.flush()
+                retired += int(rows.size)
+        return retired
+
+    # Reading
+
+    def stats(self, terms: List[bytes]) -> _ShardStats:
+        """Collection statistics, so every shard scores with the same IDF and average length"""
+        segments = self.load()
+        return _ShardStats(
+            docs=sum(segment.docs for segment in segments),
+            total_length=sum(segment.total_length for segment in segments),
+            df={term: sum(segment.df(term) for segment in segments) for term in terms}
+        )
+
+    def score(
+        self,
+        terms: List[bytes],
+        idf: Dict[bytes, float],
+        average_length: float,
+        limit: int,
+        created_range: Tuple[Optional[int], Optional[int]]
+    ) -> List[Tuple[float, int, int]]:
+        """The shard's best live chunks as (score, chunk_id, recording_id), best first"""
+        created_from, created_to = created_range
+        candidates = []
+        for segment in self.load():
+            scores = None
+            for term in terms:
+                hit = segment.postings_for(term)
+                if hit is None:
+                    continue
+                docs, tfs = hit
+                if scores is None:
+                    scores = np.zeros(segment.docs, dtype=np.float32)
+                tfs = tfs.astype(np.float32)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.doc_lengths[docs] / average_length)
+                scores[docs] += idf[term] * tfs * (BM25_K1 + 1) / (tfs + norm)
+            if scores is None:
+                continue
+            scores[np.asarray(segment.deleted) == 1] = 0
+            if created_from is not None:
+                scores[np.asarray(segment.doc_created) < created_from] = 0
+            if created_to is not None:
+                scores[np.asarray(segment.doc_created) >= created_to] = 0
+            matched = np.flatnonzero(scores > 0)
+            if matched.size > limit:
+                matched = matched[np.argpartition(-scores[matched], limit)[:limit]]
+            candidates.extend(
+                (float(scores[doc]), int(segment.doc_chunk_ids[doc]), int(segment.doc_recording_ids[doc]))
+                for doc in matched
+            )
+        return heapq.nlargest(limit, candidates)
+
+    def indexed_recordings(self) -> set:
+        indexed = set()
+        for segment in self.load():
+            alive = np.asarray(segment.deleted) == 0
+            indexed.update(np.unique(np.asarray(segment.doc_recording_ids)[alive]).tolist())
+        return indexed
+
+    def load(self) -> Tuple[_Segment, ...]:
+        """Open the current segments, reusing maps of segments that are still active"""
+        try:
+            mtime = os.stat(self._path(MANIFEST_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return ()
+        # Read once: a concurrent load or release swaps in a new tuple rather than changing this one
+        loaded = self._loaded
+        if mtime == loaded[0]:
+            return loaded[2]
+
+        with self._lock:
+            loaded = self._loaded
+            if mtime != loaded[0]:
+                manifest = self._read_manifest()
+                segments = {}
+                try:
+                    for name in manifest["segments"]:
+                        segments[name] = loaded[1].get(name) or self._open_segment(name, writable=False)
+                except FileNotFoundError:
+                    # A merge replaced the manifest while it was being read; retry on the next query
+                    return loaded[2]
+                loaded = self._loaded = (mtime, segments, tuple(segments[name] for name in manifest["segments"]))
+                logger.debug(f"📇 Loaded BM25 shard {self.key} with {len(loaded[2])} segments")
+            return loaded[2]
+
+    def release(self) -> None:
+        """Drop the segment maps; the next query maps them again"""
+        with self._lock:
+            self._loaded = (None, {}, ())
+
+    # Files
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._path(LOCK_FILE), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _open_segment(self, name: str, writable: bool) -> _Segment:
+        path = self._path(name)
+        with open(os.path.join(path, "segment.json")) as segment_file:
+            info = json.load(segment_file)
+
+        def load(array_name: str, mode: str = "r") -> np.ndarray:
+            return np.load(os.path.join(path, f"{array_name}.npy"), mmap_mode=mode)
+
+        return _Segment(
+            name=name,
+            docs=info["docs"],
+            total_length=info["total_length"],
+            terms=load("terms"),
+            term_offsets=load("term_offsets"),
+            term_df=load("term_df"),
+            postings=load("postings"),
+            doc_chunk_ids=load("doc_chunk_ids"),
+            doc_recording_ids=load("doc_recording_ids"),
+            doc_lengths=load("doc_lengths"),
+            doc_created=load("doc_created"),
+            deleted=load("deleted", "r+") if writable else load("deleted")
+        )
+
+    def _segment_docs(self, name: str) -> int:
+        with open(os.path.join(self._path(name), "segment.json")) as segment_file:
+            return json.load(segment_file)["docs"]
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._path(MANIFEST_FILE)) as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {"segments": [], "next_generation": 1, "sealed": False}
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Publish the segment list; readers pick it up when the manifest changes"""
+        with open(self._path(MANIFEST_FILE) + ".tmp", "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(self._path(MANIFEST_FILE) + ".tmp", self._path(MANIFEST_FILE))
+
+
+class BM25IndexService:
+    """
+    In-process BM25 index over transcript chunks, partitioned by month
+
+    Chunks are stored in the shard of their recording's creation month, each
+    shard a directory of small immutable segments: a sorted, fixed-width term
+    array (binary searched in place), per-term offsets and document
+    frequencies, and a varint stream of delta-encoded document numbers
+    interleaved with term frequencies. All arrays are .npy files opened with
+    mmap, so a cold start maps the index instead of rebuilding it. Deletions
+    set tombstones in place.
+
+    A query first gathers collection statistics from the shards its date
+    range overlaps, then scores those shards concurrently and merges their
+    top chunks with a heap, so scores stay comparable across shards and
+    latency follows the largest shard rather than the whole history. The
+    last `bm25_hot_months` shards take writes and are merged by a queued
+    task once they have more than `bm25_merge_factor` segments; older shards
+    are compacted into a single segment and sealed. Hot shards stay mapped,
+    while only the most recently queried sealed shards are kept open.
+    """
+
+    def __init__(self):
+        self._shards: Dict[str, _Shard] = {}
+        self._open_cold: "OrderedDict[str, None]" = OrderedDict()
+        self._keys: List[str] = []
+        self._root_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # Writing
+
+    def index_recording(self, recording_id: int) -> int:
+        """
+        Index a recording's transcript chunks as a new segment of its month's shard
+
+        Returns:
+            Number of chunks indexed
+        """
+        db = SessionLocal()
+        try:
+            row = db.query(Recording.created_at).filter(Recording.id == recording_id).first()
+            chunks = db.query(TranscriptChunk.id, TranscriptChunk.text).filter(
+                TranscriptChunk.recording_id == recording_id
+            ).order_by(TranscriptChunk.chunk_index).all() if row else []
+        finally:
+            db.close()
+
+        if row is None:
+            self.remove_recording(recording_id)
+            return 0
+        created_at = row[0] or datetime.utcnow()
+        shard = self._shard(self._shard_key(created_at))
+        shard.index_chunks(recording_id, chunks, self._epoch(created_at))
+        logger.info(
+            f"📇 Indexed {len(chunks)} chunks for recording {recording_id} in BM25 shard {shard.key}"
+        )
+        return len(chunks)
+
+    def remove_recording(self, recording_id: int, created_at: Optional[datetime] = None) -> None:
+        """
+        Tombstone a recording's chunks
+
+        Args:
+            recording_id: Recording to remove
+            created_at: The recording's creation time, so only its shard is touched
+        """
+        keys = [self._shard_key(created_at)] if created_at else self._shard_keys()
+        for key in keys:
+            self._shard(key).remove_recording(recording_id)
+
+    def needs_merge(self) -> bool:
+        return any(self._shard(key).needs_merge(self._is_hot(key)) for key in self._shard_keys())
+
+    def merge_segments(self) -> None:
+        """Merge segments of the hot shards and compact and seal the older ones"""
+        for key in self._shard_keys():
+            shard = self._shard(key)
+            hot = self._is_hot(key)
+            if shard.needs_merge(hot):
+                shard.merge(compact=not hot)
+
+    # Reading
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Rank chunks against a query with BM25
+
+        Args:
+            query: Free-text search query
+            limit: Maximum number of chunks
+            created_from: Only recordings created at or after this time (UTC)
+            created_to: Only recordings created before this time (UTC)
+
+        Returns:
+            List of (chunk_id, recording_id, score), best first
+        """
+        terms = [term.encode() for term in set(tokenize(query)) if len(term.encode()) <= MAX_TERM_BYTES]
+        keys = [
+            key for key in self._shard_keys()
+            if self._month_overlaps(key, created_from, created_to)
+        ]
+        if not terms or not keys:
+            return []
+        with self._pinned(keys) as shards:
+            return self._rank(terms, shards, limit, created_from, created_to)
+
+    def _rank(
+        self,
+        terms: List[bytes],
+        shards: List[_Shard],
+        limit: int,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> List[Tuple[int, int, float]]:
+        """Score pinned shards with statistics gathered across all of them"""
+        stats = self._fan_out(lambda shard: shard.stats(terms), shards)
+        total_docs = sum(shard_stats.docs for shard_stats in stats)
+        if not total_docs:
+            return []
+        average_length = max(1.0, sum(shard_stats.total_length for shard_stats in stats) / total_docs)
+        idf = {}
+        for term in terms:
+            df = sum(shard_stats.df[term] for shard_stats in stats)
+            idf[term] = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+
+        created_range = (
+            self._epoch(created_from) if created_from else None,
+            self._epoch(created_to) if created_to else None
+        )
+        per_shard = self._fan_out(
+            lambda shard: shard.score(terms, idf, average_length, limit, created_range), shards
+        )
+        best = heapq.nlargest(limit, itertools.chain.from_iterable(per_shard))
+        return [(chunk_id, recording_id, score) for score, chunk_id, recording_id in best]
+
+    def highlight(self, text: str, query: str) -> List[Dict[str, int]]:
+        """Character ranges of query terms within a chunk's text"""
+        terms = set(tokenize(query))
+        return [
+            {"start": match.start(), "end": match.end()}
+            for match in TOKEN_PATTERN.finditer(text)
+            if match.group().lower() in terms
+        ]
+
+    def get_indexed_recordings(self) -> set:
+        """Recordings with live chunks in the index"""
+        indexed = set()
+        for key in self._shard_keys():
+            indexed.update(self._shard(key).indexed_recordings())
+        return indexed
+
+    def _fan_out(self, work: Callable[[_Shard], Any], shards: List[_Shard]) -> List[Any]:
+        """Run work on every shard, concurrently when there are several"""
+        if len(shards) == 1:
+            return [work(shards[0])]
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.bm25_search_workers, thread_name_prefix="ordo-bm25"
+                    )
+        return list(self._executor.map(work, shards))
+
+    # Shards
+
+    def _shard(self, key: str) -> _Shard:
+        with self._lock:
+            return self._open(key)
+
+    @contextmanager
+    def _pinned(self, keys: List[str]) -> Iterator[List[_Shard]]:
+        """Shards for one query, kept mapped until it finishes even if evicted meanwhile"""
+        with self._lock:
+            shards = [self._open(key) for key in keys]
+            for shard in shards:
+                shard.users += 1
+        try:
+            yield shards
+        finally:
+            with self._lock:
+                for shard in shards:
+                    shard.users -= 1
+                    if shard.evicted and not shard.users:
+                        shard.release()
+
+    def _open(self, key: str) -> _Shard:
+        """The shard of a month, evicting the least recently used sealed shards; call with the lock held"""
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = self._shards[key] = _Shard(key, os.path.join(settings.bm25_index_path, key))
+        if not self._is_hot(key):
+            self._open_cold[key] = None
+            self._open_cold.move_to_end(key)
+            while len(self._open_cold) > settings.bm25_max_open_cold_shards:
+                evicted_key, _ = self._open_cold.popitem(last=False)
+                evicted = self._shards.pop(evicted_key)
+                evicted.evicted = True
+                if not evicted.users:
+                    evicted.release()
+        return shard
+
+    def _shard_keys(self) -> List[str]:
+        """Monthly shard names on disk, oldest first; re-listed when a shard is added"""
+        try:
+            mtime = os.stat(settings.bm25_index_path).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if mtime != self._root_mtime:
+            self._keys = sorted(
+                name for name in os.listdir(settings.bm25_index_path) if SHARD_NAME_PATTERN.match(name)
+            )
+            self._root_mtime = mtime
+        return self._keys
+
+    def _shard_key(self, created_at: datetime) -> str:
+        return created_at.strftime("%Y-%m")
+
+    def _is_hot(self, key: str) -> bool:
+        now = datetime.utcnow()
+        months = now.year * 12 + now.month - 1 - (settings.bm25_hot_months - 1)
+        return key >= f"{months // 12:04d}-{months % 12 + 1:02d}"
+
+    def _month_overlaps(self, key: str, created_from: Optional[datetime], created_to: Optional[datetime]) -> bool:
+        year, month = int(key[:4]), int(key[5:7])
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        return (created_to is None or start < created_to) and (created_from is None or end > created_from)
+
+    def _epoch(self, value: datetime) -> int:
+        return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+# Global BM25 index service instance
+bm25_index_service = BM25IndexService()
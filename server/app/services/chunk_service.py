@@ -0,0 +1,149 @@
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.transcript_chunk import TranscriptChunk
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_PATTERN = re.compile(r"[^.!?\n]+(?:[.!?]+|\n+|$)")
+
+
+class TranscriptChunkService:
+    """Splits transcripts into time-anchored chunks stored in transcript_chunks"""
+
+    def build_chunks(
+        self,
+        transcript: str,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        duration: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pack transcript pieces into chunks of roughly `transcript_chunk_chars`
+
+        Whisper segments give each piece its real timestamps. Without them the
+        transcript is split into sentences and times are interpolated from the
+        character position over the recording's duration.
+
+        Args:
+            transcript: Full transcript text
+            segments: Whisper segments with `start`, `end` and `text`
+            duration: Recording duration in seconds
+
+        Returns:
+            List of chunk dicts with text, character offsets and times
+        """
+        if not transcript or not transcript.strip():
+            return []
+
+        pieces = self._segment_pieces(transcript, segments) if segments else []
+        if not pieces:
+            pieces = self._sentence_pieces(transcript, duration)
+
+        chunks: List[Dict[str, Any]] = []
+        current: List[Dict[str, Any]] = []
+        for piece in pieces:
+            current.append(piece)
+            if current[-1]["char_end"] - current[0]["char_start"] >= settings.transcript_chunk_chars:
+                chunks.append(self._merge(transcript, current, len(chunks)))
+                current = []
+        if current:
+            chunks.append(self._merge(transcript, current, len(chunks)))
+        return chunks
+
+    def replace_chunks(
+        self,
+        db: Session,
+        recording_id: int,
+        transcript: str,
+        segments: Optional[List[Dict[str, Any]]] = None,
+        duration: Optional[float] = None
+    ) -> int:
+        """Replace a recording's chunks within the caller's transaction"""
+        self.remove_chunks(db, recording_id)
+        chunks = self.build_chunks(transcript, segments, duration)
+        db.add_all(TranscriptChunk(recording_id=recording_id, **chunk) for chunk in chunks)
+        db.flush()
+        logger.debug(f"🧩 Stored {len(chunks)} transcript chunks for recording {recording_id}")
+        return len(chunks)
+
+    def remove_chunks(self, db: Session, recording_id: int) -> None:
+        db.query(TranscriptChunk).filter(TranscriptChunk.recording_id == recording_id).delete(
+            synchronize_session=False
+        )
+
+    def get_chunks(self, db: Session, chunk_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Load chunks by ID as search hits without highlights"""
+        if not chunk_ids:
+            return {}
+        rows = db.query(TranscriptChunk).filter(TranscriptChunk.id.in_(chunk_ids)).all()
+        return {
+            row.id: {
+                "chunk_id": row.id,
+                "chunk_index": row.chunk_index,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+                "char_start": row.char_start,
+                "char_end": row.char_end,
+                "text": row.text,
+                "highlights": []
+            }
+            for row in rows
+        }
+
+    def _segment_pieces(self, transcript: str, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Locate each Whisper segment in the transcript to anchor its offsets"""
+        pieces = []
+        cursor = 0
+        for segment in segments:
+            text = str(segment.get("text") or "").strip()
+            if not text:
+                continue
+            position = transcript.find(text, cursor)
+            if position < 0:
+                # Segment text does not match verbatim; assume it continues at the cursor
+                position = min(cursor, len(transcript))
+            end = min(len(transcript), position + len(text))
+            pieces.append({
+                "char_start": position,
+                "char_end": end,
+                "start_time": segment.get("start"),
+                "end_time": segment.get("end")
+            })
+            cursor = end
+        return pieces
+
+    def _sentence_pieces(self, transcript: str, duration: Optional[float]) -> List[Dict[str, Any]]:
+        length = len(transcript)
+        pieces = []
+        for match in SENTENCE_PATTERN.finditer(transcript):
+            sentence = match.group()
+            if not sentence.strip():
+                continue
+            start = match.start() + len(sentence) - len(sentence.lstrip())
+            end = match.start() + len(sentence.rstrip())
+            pieces.append({
+                "char_start": start,
+                "char_end": end,
+                "start_time": duration * start / length if duration else None,
+                "end_time": duration * end / length if duration else None
+            })
+        return pieces
+
+    def _merge(self, transcript: str, pieces: List[Dict[str, Any]], chunk_index: int) -> Dict[str, Any]:
+        char_start, char_end = pieces[0]["char_start"], pieces[-1]["char_end"]
+        return {
+            "chunk_index": chunk_index,
+            "text": transcript[char_start:char_end],
+            "start_time": pieces[0]["start_time"],
+            "end_time": pieces[-1]["end_time"],
+            "char_start": char_start,
+            "char_end": char_end
+        }
+
+
+# Global transcript chunk service instance
+chunk_service = TranscriptChunkService()
@@ -0,0 +1,92 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """Local CPU sentence embeddings for transcript chunks and search queries"""
+
+    def __init__(self):
+        self._model = None
+        self._model_failed = False
+        self._lock = threading.Lock()
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self._get_model() is not None
+
+    @property
+    def dimension(self) -> Optional[int]:
+        model = self._get_model()
+        return model.get_sentence_embedding_dimension() if model is not None else None
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed document texts
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension) with unit-length rows
+        """
+        model = self._get_model()
+        if model is None:
+            raise RuntimeError("Embedding model not available")
+        return model.encode(
+            texts,
+            batch_size=settings.embedding_batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query, serving repeated queries from an LRU cache"""
+        key = " ".join(query.lower().split())
+        with self._cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return cached
+
+        vector = self.embed_documents([key])[0]
+        vector.flags.writeable = False
+        with self._cache_lock:
+            self._query_cache[key] = vector
+            if len(self._query_cache) > settings.embedding_query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
+    def _get_model(self):
+        """Load the embedding model on first use"""
+        if self._model is not None or self._model_failed:
+            return self._model
+
+        with self._lock:
+            if self._model is None and not self._model_failed:
+                try:
+                    from sentence_transformers import SentenceTransformer
+
+                    logger.info(f"🔧 Loading embedding model {settings.embedding_model} on CPU...")
+                    self._model = SentenceTransformer(settings.embedding_model, device="cpu")
+                    logger.info(
+                        f"✅ Embedding model loaded ({self._model.get_sentence_embedding_dimension()} dimensions)"
+                    )
+                except Exception as e:
+                    self._model_failed = True
+                    logger.error(f"❌ Failed to load embedding model - semantic search disabled: {e}")
+        return self._model
+
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
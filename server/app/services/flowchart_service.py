@@ -0,0 +1,227 @@
+import re
+import textwrap
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+CANVAS_WIDTH = 780
+MARGIN = 30
+ROW_GAP = 36
+
+DECISION_CENTER_X = 200
+DECISION_WIDTH = 300
+DECISION_HEIGHT = 140
+
+ACTION_X = 400
+ACTION_WIDTH = 350
+ACTION_HEIGHT = 66
+ACTION_GAP = 12
+
+PRIORITY_COLORS = {
+    "high": ("#FEE2E2", "#DC2626"),
+    "medium": ("#FEF3C7", "#D97706"),
+    "low": ("#DCFCE7", "#16A34A"),
+}
+DEFAULT_ACTION_COLORS = ("#E0F2FE", "#0284C7")
+DECISION_COLORS = ("#DBEAFE", "#1D4ED8")
+TERMINAL_COLORS = ("#F3F4F6", "#4B5563")
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {
+    "the", "a", "an", "and", "or", "to", "of", "for", "in", "on", "with", "by", "be",
+    "is", "are", "will", "should", "we", "it", "this", "that", "from", "at", "as",
+}
+
+
+class FlowchartService:
+    """Deterministic local renderer for decision/action-item flowcharts"""
+
+    def render_svg(
+        self,
+        decisions: Optional[List[Dict[str, Any]]],
+        action_items: Optional[List[Dict[str, Any]]],
+        title: Optional[str] = None
+    ) -> str:
+        """
+        Render decisions and action items as an SVG flowchart
+
+        Decisions form the main flow as diamonds. Each action item is attached
+        to the decision it shares the most words or its owner with; the rest
+        follow the last decision as process boxes before the end node.
+
+        Args:
+            decisions: Decisions from the analysis stage
+            action_items: Action items from the analysis stage
+            title: Heading shown in the start node
+
+        Returns:
+            SVG document as a string
+        """
+        decisions = [d for d in (decisions or []) if isinstance(d, dict)]
+        action_items = [a for a in (action_items or []) if isinstance(a, dict)]
+        linked, unlinked = self._link_actions(decisions, action_items)
+
+        elements: List[str] = []
+        y = MARGIN
+
+        # Start node
+        start_height = 44
+        elements.append(self._terminal(DECISION_CENTER_X, y, start_height, title or "Meeting"))
+        previous_bottom = y + start_height
+        y += start_height + ROW_GAP
+
+        for index, decision in enumerate(decisions):
+            actions = linked.get(index, [])
+            actions_height = len(actions) * (ACTION_HEIGHT + ACTION_GAP) - ACTION_GAP if actions else 0
+            row_height = max(DECISION_HEIGHT, actions_height)
+            center_y = y + row_height / 2
+
+            elements.append(self._arrow(DECISION_CENTER_X, previous_bottom, DECISION_CENTER_X, center_y - DECISION_HEIGHT / 2))
+            elements.append(self._decision(DECISION_CENTER_X, center_y, decision))
+
+            action_y = center_y - actions_height / 2
+            for action in actions:
+                action_mid = action_y + ACTION_HEIGHT / 2
+                elements.append(self._arrow(DECISION_CENTER_X + DECISION_WIDTH / 2, center_y, ACTION_X, action_mid))
+                elements.append(self._action(ACTION_X, action_y, action))
+                action_y += ACTION_HEIGHT + ACTION_GAP
+
+            previous_bottom = center_y + DECISION_HEIGHT / 2
+            y += row_height + ROW_GAP
+
+        # Action items not tied to a decision continue the main flow
+        for action in unlinked:
+            x = DECISION_CENTER_X - ACTION_WIDTH / 2
+            elements.append(self._arrow(DECISION_CENTER_X, previous_bottom, DECISION_CENTER_X, y))
+            elements.append(self._action(x, y, action))
+            previous_bottom = y + ACTION_HEIGHT
+            y += ACTION_HEIGHT + ROW_GAP
+
+        # End node
+        elements.append(self._arrow(DECISION_CENTER_X, previous_bottom, DECISION_CENTER_X, y))
+        elements.append(self._terminal(DECISION_CENTER_X, y, start_height, "End"))
+        height = y + start_height + MARGIN
+
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{CANVAS_WIDTH}" height="{int(height)}" '
+            f'viewBox="0 0 {CANVAS_WIDTH} {int(height)}" font-family="Helvetica, Arial, sans-serif">'
+            '<defs><marker id="arrow" viewBox="0 0 10 10" refX="9" refY="5" markerWidth="7" markerHeight="7" '
+            'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z" fill="#6B7280"/></marker></defs>'
+            f'<rect width="100%" height="100%" fill="#FFFFFF"/>'
+            + "".join(elements)
+            + "</svg>"
+        )
+
+    def render_placeholder(self, message: str = "Generating visual summary…") -> str:
+        """Render a small placeholder shown while a visual summary is being generated"""
+        width, height = 480, 120
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Helvetica, Arial, sans-serif">'
+            f'<rect x="1" y="1" width="{width - 2}" height="{height - 2}" rx="10" fill="#F9FAFB" '
+            f'stroke="#D1D5DB" stroke-dasharray="6 4"/>'
+            + self._text_block(width / 2, height / 2, [(message, 14, "#6B7280")])
+            + "</svg>"
+        )
+
+    def _link_actions(
+        self,
+        decisions: List[Dict[str, Any]],
+        action_items: List[Dict[str, Any]]
+    ) -> Tuple[Dict[int, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """Attach each action item to its most related decision, if any"""
+        decision_words = [self._words(d.get("description"), d.get("context"), d.get("impact")) for d in decisions]
+        decision_owners = [str(d.get("owner") or "").strip().lower() for d in decisions]
+
+        linked: Dict[int, List[Dict[str, Any]]] = {}
+        unlinked = []
+        for action in action_items:
+            words = self._words(action.get("description"))
+            assignee = str(action.get("assignee") or "").strip().lower()
+            best_index, best_score = None, 0
+            for index, candidates in enumerate(decision_words):
+                score = len(words & candidates)
+                if assignee and assignee == decision_owners[index]:
+                    score += 2
+                if score > best_score:
+                    best_index, best_score = index, score
+            if best_index is not None and best_score >= 2:
+                linked.setdefault(best_index, []).append(action)
+            else:
+                unlinked.append(action)
+        return linked, unlinked
+
+    def _words(self, *texts: Optional[str]) -> set:
+        words = set()
+        for text in texts:
+            words.update(WORD_PATTERN.findall(str(text or "").lower()))
+        return {word for word in words if word not in STOP_WORDS and len(word) > 2}
+
+    def _text_block(self, center_x: float, center_y: float, lines: List[Tuple[str, int, str]]) -> str:
+        """Vertically centered lines of (text, font size, color)"""
+        line_height = [size + 4 for _, size, _ in lines]
+        y = center_y - sum(line_height) / 2
+        parts = []
+        for (text, size, color), step in zip(lines, line_height):
+            y += step
+            parts.append(
+                f'<text x="{center_x:.1f}" y="{y - 4:.1f}" font-size="{size}" fill="{color}" '
+                f'text-anchor="middle">{escape(text)}</text>'
+            )
+        return "".join(parts)
+
+    def _wrap(self, text: Optional[str], width: int, max_lines: int) -> List[str]:
+        lines = textwrap.wrap(str(text or "").strip(), width=width) or [""]
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+            lines[-1] = lines[-1][: max(0, width - 1)].rstrip() + "…"
+        return lines
+
+    def _terminal(self, center_x: float, y: float, height: float, label: str) -> str:
+        fill, stroke = TERMINAL_COLORS
+        width = 260
+        text = self._wrap(label, 34, 1)[0]
+        return (
+            f'<rect x="{center_x - width / 2:.1f}" y="{y:.1f}" width="{width}" height="{height}" '
+            f'rx="{height / 2:.1f}" fill="{fill}" stroke="{stroke}" stroke-width="1.5"/>'
+            + self._text_block(center_x, y + height / 2, [(text, 13, "#111827")])
+        )
+
+    def _decision(self, center_x: float, center_y: float, decision: Dict[str, Any]) -> str:
+        fill, stroke = DECISION_COLORS
+        half_w, half_h = DECISION_WIDTH / 2, DECISION_HEIGHT / 2
+        points = (
+            f"{center_x:.1f},{center_y - half_h:.1f} {center_x + half_w:.1f},{center_y:.1f} "
+            f"{center_x:.1f},{center_y + half_h:.1f} {center_x - half_w:.1f},{center_y:.1f}"
+        )
+        lines = [(line, 12, "#111827") for line in self._wrap(decision.get("description"), 24, 3)]
+        if decision.get("owner"):
+            lines.append((self._wrap(f"Owner: {decision['owner']}", 24, 1)[0], 10, "#1E3A8A"))
+        return (
+            f'<polygon points="{points}" fill="{fill}" stroke="{stroke}" stroke-width="1.5"/>'
+            + self._text_block(center_x, center_y, lines)
+        )
+
+    def _action(self, x: float, y: float, action: Dict[str, Any]) -> str:
+        priority = str(action.get("priority") or "").strip().lower()
+        fill, stroke = PRIORITY_COLORS.get(priority, DEFAULT_ACTION_COLORS)
+        lines = [(line, 12, "#111827") for line in self._wrap(action.get("description"), 46, 2)]
+        details = [str(action[key]) for key in ("assignee", "due_date") if action.get(key)]
+        if priority in PRIORITY_COLORS:
+            details.append(f"{priority} priority")
+        if details:
+            lines.append((self._wrap(" · ".join(details), 52, 1)[0], 10, "#374151"))
+        return (
+            f'<rect x="{x:.1f}" y="{y:.1f}" width="{ACTION_WIDTH}" height="{ACTION_HEIGHT}" rx="6" '
+            f'fill="{fill}" stroke="{stroke}" stroke-width="1.5"/>'
+            + self._text_block(x + ACTION_WIDTH / 2, y + ACTION_HEIGHT / 2, lines)
+        )
+
+    def _arrow(self, x1: float, y1: float, x2: float, y2: float) -> str:
+        return (
+            f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" stroke="#6B7280" '
+            f'stroke-width="1.5" marker-end="url(#arrow)"/>'
+        )
+
+
+# Global flowchart service instance
+flowchart_service = FlowchartService()
@@ -0,0 +1,304 @@
+import logging
+import math
+import random
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+from app.models.database import is_postgresql, SessionLocal
+from app.models.label_classifier import LabelClassifier, LabelVerdict
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+MAX_TRANSCRIPT_CHARS = 20000
+L2_PENALTY = 1e-4
+
+# Sparse feature vector: (hashed indices, L2-normalized weights)
+Features = Tuple[np.ndarray, np.ndarray]
+
+
+def rule_fingerprint(rule: Any) -> str:
+    """Fingerprint of the parts of a rule that define its meaning"""
+    text = f"{rule.label_name}\n{rule.rule_description}"
+    return f"{zlib.crc32(text.encode()):08x}"
+
+
+def is_trained(n_samples: int, n_positive: int) -> bool:
+    """Trust a model only once it has seen enough verdicts of both kinds"""
+    return n_samples >= settings.label_classifier_min_samples and 0 < n_positive < n_samples
+
+
+class RuleModel:
+    """Online logistic regression over hashed term-frequency features for one rule"""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        weights: Optional[np.ndarray] = None,
+        bias: float = 0.0,
+        n_samples: int = 0,
+        n_positive: int = 0
+    ):
+        self.fingerprint = fingerprint
+        self.weights = weights if weights is not None else np.zeros(settings.label_classifier_features, dtype=np.float32)
+        self.bias = bias
+        self.n_samples = n_samples
+        self.n_positive = n_positive
+
+    @classmethod
+    def from_row(cls, row: LabelClassifier) -> "RuleModel":
+        weights = np.frombuffer(zlib.decompress(row.weights), dtype=np.float32).copy()
+        return cls(row.rule_fingerprint, weights, row.bias, row.n_samples, row.n_positive)
+
+    def to_row(self, row: LabelClassifier) -> None:
+        row.rule_fingerprint = self.fingerprint
+        row.weights = zlib.compress(self.weights.tobytes())
+        row.bias = self.bias
+        row.n_samples = self.n_samples
+        row.n_positive = self.n_positive
+
+    def is_ready(self) -> bool:
+        return is_trained(self.n_samples, self.n_positive)
+
+    def predict(self, features: Features) -> float:
+        """Probability that the rule applies"""
+        indices, values = features
+        z = float(np.dot(self.weights[indices], values)) + self.bias
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    def partial_fit(self, features: Features, applied: bool) -> None:
+        """Take one SGD step towards an LLM verdict"""
+        indices, values = features
+        error = self.predict(features) - (1.0 if applied else 0.0)
+        learning_rate = 4.0 / math.sqrt(1 + self.n_samples / 10)
+        active = self.weights[indices]
+        self.weights[indices] = active - learning_rate * (error * values + L2_PENALTY * active)
+        self.bias -= learning_rate * error
+        self.n_samples += 1
+        self.n_positive += int(applied)
+
+
+class LabelClassifierService:
+    """Local CPU-only pre-classifier that settles confident labeling decisions without the LLM"""
+
+    def __init__(self):
+        self._version = pubsub_service.version_counter("label_classifiers")
+        self._models: Dict[int, RuleModel] = {}
+        self._loaded_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def featurize(
+        self,
+        summary: Optional[str],
+        action_items: List[Dict[str, Any]],
+        decisions: List[Dict[str, Any]],
+        transcript: Optional[str]
+    ) -> Features:
+        """Build a hashed unigram + bigram feature vector for a recording"""
+        parts = [summary or ""]
+        parts.extend(str(item.get("description", "")) for item in action_items if isinstance(item, dict))
+        parts.extend(str(item.get("description", "")) for item in decisions if isinstance(item, dict))
+        parts.append((transcript or "")[:MAX_TRANSCRIPT_CHARS])
+
+        tokens = TOKEN_PATTERN.findall(" ".join(parts).lower())
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        n_features = settings.label_classifier_features
+        counts: Dict[int, int] = {}
+        for term in terms:
+            index = zlib.crc32(term.encode()) % n_features
+            counts[index] = counts.get(index, 0) + 1
+
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        values /= np.linalg.norm(values)
+        return indices, values.astype(np.float32)
+
+    def pre_classify(
+        self,
+        rules: List[Any],
+        features: Features
+    ) -> Tuple[Dict[int, Tuple[bool, float]], List[Any]]:
+        """
+        Settle confident decisions locally
+
+        Returns:
+            Tuple of ({rule_id: (applied, confidence)} decided locally, rules left for the LLM)
+        """
+        models = self._get_models()
+        threshold = settings.label_classifier_confidence
+
+        local: Dict[int, Tuple[bool, float]] = {}
+        uncertain = []
+        for rule in rules:
+            model = models.get(rule.id)
+            if model and model.fingerprint == rule_fingerprint(rule) and model.is_ready():
+                probability = model.predict(features)
+                confident = probability >= threshold or probability <= 1 - threshold
+                # A small share of confident cases still goes to the LLM so the
+                # model keeps receiving fresh verdicts to stay calibrated
+                if confident and random.random() >= settings.label_classifier_audit_rate:
+                    applied = probability >= threshold
+                    local[rule.id] = (applied, probability if applied else 1 - probability)
+                    continue
+            uncertain.append(rule)
+
+        logger.info(f"🧮 Local pre-classifier settled {len(local)}/{len(rules)} rules")
+        return local, uncertain
+
+    def record_verdicts(
+        self,
+        recording_id: Optional[int],
+        rules: List[Any],
+        features: Features,
+        local_verdicts: Dict[int, Tuple[bool, float]],
+        llm_verdicts: Dict[int, Tuple[bool, float]]
+    ) -> None:
+        """Store verdicts for the recording and train each rule's model on the LLM's answers"""
+        if not local_verdicts and not llm_verdicts:
+            return
+
+        db = SessionLocal()
+        try:
+            # Committed on their own, so a failed model update cannot discard them
+            if recording_id is not None:
+                for source, verdicts in (("local", local_verdicts), ("llm", llm_verdicts)):
+                    for rule_id, (applied, confidence) in verdicts.items():
+                        db.add(LabelVerdict(
+                            recording_id=recording_id,
+                            rule_id=rule_id,
+                            applied=applied,
+                            confidence=confidence,
+                            source=source
+                        ))
+                db.commit()
+        except Exception as e:
+            logger.error(f"❌ Failed to record labeling verdicts: {e}")
+            db.rollback()
+
+        try:
+            if llm_verdicts:
+                self._train(db, [rule for rule in rules if rule.id in llm_verdicts], features, llm_verdicts)
+                self._version.bump()
+        except Exception as e:
+            logger.error(f"❌ Failed to update label classifier models: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def _train(
+        self,
+        db,
+        rules: List[Any],
+        features: Features,
+        llm_verdicts: Dict[int, Tuple[bool, float]]
+    ) -> None:
+        """
+        Apply one training step per rule as a row-locked read-modify-write
+
+        API processes and workers train concurrently, so each rule's row is
+        created if missing without conflicting, then locked until commit
+        (SQLite holds its write lock from the insert on). Rules are taken in
+        ID order so two updates cannot deadlock.
+        """
+        rule_ids = sorted(rule.id for rule in rules)
+        insert = postgresql.insert if is_postgresql else sqlite.insert
+        empty = RuleModel("")
+        db.execute(
+            insert(LabelClassifier).values([
+                {
+                    "rule_id": rule_id,
+                    "rule_fingerprint": "",
+                    "weights": zlib.compress(empty.weights.tobytes()),
+                    "bias": 0.0,
+                    "n_samples": 0,
+                    "n_positive": 0
+                }
+                for rule_id in rule_ids
+            ]).on_conflict_do_nothing(index_elements=["rule_id"])
+        )
+        rows = {
+            row.rule_id: row
+            for row in db.query(LabelClassifier).filter(
+                LabelClassifier.rule_id.in_(rule_ids)
+            ).order_by(LabelClassifier.rule_id).with_for_update().all()
+        }
+        for rule in rules:
+            fingerprint = rule_fingerprint(rule)
+            row = rows[rule.id]
+            if row.rule_fingerprint == fingerprint:
+                model = RuleModel.from_row(row)
+            else:
+                # New rule or rule text changed: start from scratch
+                model = RuleModel(fingerprint)
+            model.partial_fit(features, llm_verdicts[rule.id][0])
+            model.to_row(row)
+        db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Share of labeling decisions made locally, plus per-rule model state"""
+        db = SessionLocal()
+        try:
+            counts = dict(
+                db.query(LabelVerdict.source, func.count(LabelVerdict.id))
+                .group_by(LabelVerdict.source)
+                .all()
+            )
+            models = db.query(
+                LabelClassifier.rule_id,
+                LabelClassifier.n_samples,
+                LabelClassifier.n_positive
+            ).all()
+        finally:
+            db.close()
+
+        local_decisions = counts.get("local", 0)
+        llm_decisions = counts.get("llm", 0)
+        total = local_decisions + llm_decisions
+        return {
+            "total_decisions": total,
+            "local_decisions": local_decisions,
+            "llm_decisions": llm_decisions,
+            "local_share": local_decisions / total if total else 0.0,
+            "models": [
+                {
+                    "rule_id": rule_id,
+                    "samples": n_samples,
+                    "positive_samples": n_positive,
+                    "ready": is_trained(n_samples, n_positive)
+                }
+                for rule_id, n_samples, n_positive in models
+            ]
+        }
+
+    def _get_models(self) -> Dict[int, RuleModel]:
+        version = self._version.current()
+        if self._loaded_version == version:
+            return self._models
+
+        with self._lock:
+            if self._loaded_version == version:
+                return self._models
+            db = SessionLocal()
+            try:
+                self._models = {row.rule_id: RuleModel.from_row(row) for row in db.query(LabelClassifier).all()}
+            finally:
+                db.close()
+            self._loaded_version = version
+            logger.info(f"🧮 Loaded {len(self._models)} label classifier models (version {version})")
+            return self._models
+
+
+# Global label classifier service instance
+label_classifier_service = LabelClassifierService()
@@ -1,13 +1,16 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import logging
 import json
 from openai import OpenAI
 
 from app.models.labeling_rule import LabelingRule
-from app.models.database import SessionLocal
+from app.models.schemas import LabelingRuleResponse
 from app.core.config import settings
+from app.services.rule_cache_service import rule_cache_service
+from app.services.label_classifier_service import label_classifier_service
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,9 @@ class LabelingService:
             self.openai_client = None
             logger.warning("⚠️  OpenAI API key not configured - labeling will not be available")
     
-    def create_rule(
+    async def create_rule(
         self,
-        db: Session,
+        db: AsyncSession,
         rule_data: Any
     ) -> LabelingRule:
         """Create a new labeling rule"""
@@ -41,30 +44,28 @@ class LabelingService:
                 is_active=rule_data.is_active
             )
             db.add(rule)
-            db.commit()
-            db.refresh(rule)
+            await db.commit()
+            await db.refresh(rule)
+            await run_in_threadpool(rule_cache_service.invalidate)
             
             logger.info(f"✅ Labeling rule created with ID: {rule.id}")
             return rule
         except Exception as e:
             logger.error(f"❌ Failed to create labeling rule: {e}")
-            db.rollback()
+            await db.rollback()
             raise e
     
-    def get_rules(self, db: Session, active_only: bool = False) -> List[LabelingRule]:
-        """Get all labeling rules"""
-        query = db.query(LabelingRule)
-        if active_only:
-            query = query.filter(LabelingRule.is_active == True)
-        return query.order_by(LabelingRule.created_at.desc()).all()
+    def get_rules(self, active_only: bool = False) -> List[LabelingRuleResponse]:
+        """Get all labeling rules from the in-process cache"""
+        return rule_cache_service.get_rules(active_only=active_only)
     
-    def get_rule(self, db: Session, rule_id: int) -> Optional[LabelingRule]:
-        """Get a labeling rule by ID"""
-        return db.query(LabelingRule).filter(LabelingRule.id == rule_id).first()
+    def get_rule(self, rule_id: int) -> Optional[LabelingRuleResponse]:
+        """Get a labeling rule by ID from the in-process cache"""
+        return rule_cache_service.get_rule(rule_id)
     
-    def update_rule(
+    async def update_rule(
         self,
-        db: Session,
+        db: AsyncSession,
         rule_id: int,
         rule_data: Any
     ) -> Optional[LabelingRule]:
@@ -72,7 +73,7 @@ class LabelingService:
         logger.info(f"📝 Updating labeling rule {rule_id}")
         
         try:
-            rule = db.query(LabelingRule).filter(LabelingRule.id == rule_id).first()
+            rule = await db.get(LabelingRule, rule_id)
             if rule:
                 if rule_data.label_name is not None:
                     rule.label_name = rule_data.label_name
@@ -83,30 +84,32 @@ class LabelingService:
                 if rule_data.is_active is not None:
                     rule.is_active = rule_data.is_active
                 rule.updated_at = datetime.utcnow()
-                db.commit()
-                db.refresh(rule)
+                await db.commit()
+                await db.refresh(rule)
+                await run_in_threadpool(rule_cache_service.invalidate)
                 logger.info(f"✅ Labeling rule {rule_id} updated")
             return rule
         except Exception as e:
             logger.error(f"❌ Failed to update labeling rule {rule_id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise e
     
-    def delete_rule(self, db: Session, rule_id: int) -> bool:
+    async def delete_rule(self, db: AsyncSession, rule_id: int) -> bool:
         """Delete a labeling rule"""
         logger.info(f"🗑️  Deleting labeling rule {rule_id}")
         
         try:
-            rule = db.query(LabelingRule).filter(LabelingRule.id == rule_id).first()
+            rule = await db.get(LabelingRule, rule_id)
             if rule:
-                db.delete(rule)
-                db.commit()
+                await db.delete(rule)
+                await db.commit()
+                await run_in_threadpool(rule_cache_service.invalidate)
                 logger.info(f"✅ Labeling rule {rule_id} deleted")
                 return True
             return False
         except Exception as e:
             logger.error(f"❌ Failed to delete labeling rule {rule_id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise e
     
     async def apply_rules_to_recording(
@@ -114,34 +117,82 @@ class LabelingService:
         summary: str,
         action_items: List[Dict[str, Any]],
         decisions: List[Dict[str, Any]],
-        transcript: str
+        transcript: str,
+        recording_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Apply labeling rules to a recording and return applicable labels"""
-        if not self.openai_client:
-            logger.warning("⚠️  OpenAI API key not configured for labeling")
-            return []
+        """
+        Apply labeling rules to a recording and return applicable labels
         
-        # Get active rules using a new session
-        db = SessionLocal()
-        try:
-            active_rules = self.get_rules(db, active_only=True)
-            if not active_rules:
-                logger.info("📋 No active labeling rules found")
-                return []
-        finally:
-            db.close()
+        Confident decisions are settled by the local pre-classifier; only the
+        remaining rules are sent to the LLM, whose verdicts then train it.
+        """
+        # Active rules come from the in-process cache, which reads the database
+        # only after a change, and then off the event loop
+        active_rules = await run_in_threadpool(self.get_rules, True)
+        if not active_rules:
+            logger.info("📋 No active labeling rules found")
+            return []
         
         logger.info(f"🏷️  Applying {len(active_rules)} labeling rules to recording")
         
+        # Featurizing hashes the whole transcript and stale rule models are reloaded from the database
+        features = await run_in_threadpool(
+            label_classifier_service.featurize, summary, action_items, decisions, transcript
+        )
+        local_verdicts, uncertain_rules = await run_in_threadpool(
+            label_classifier_service.pre_classify, active_rules, features
+        )
+        
+        llm_verdicts: Dict[int, Tuple[bool, float]] = {}
+        if uncertain_rules:
+            if self.openai_client:
+                # The OpenAI client is synchronous, so it runs off the event loop
+                llm_verdicts = await run_in_threadpool(
+                    self._classify_with_llm, uncertain_rules, summary, action_items, decisions, transcript
+                )
+            else:
+                logger.warning("⚠️  OpenAI API key not configured - skipping rules the local classifier could not settle")
+        
+        # Storing verdicts also retrains the rule models, which is CPU work
+        await run_in_threadpool(
+            label_classifier_service.record_verdicts, recording_id, active_rules, features, local_verdicts, llm_verdicts
+        )
+        
+        verdicts = {**local_verdicts, **llm_verdicts}
+        applied_labels = [
+            {
+                "label_name": rule.label_name,
+                "label_color": rule.label_color,
+                "confidence": verdicts[rule.id][1]
+            }
+            for rule in active_rules
+            if rule.id in verdicts and verdicts[rule.id][0]
+        ]
+        
+        logger.info(
+            f"✅ Applied {len(applied_labels)} labels to recording "
+            f"({len(local_verdicts)} decided locally, {len(llm_verdicts)} by LLM)"
+        )
+        return applied_labels
+    
+    def _classify_with_llm(
+        self,
+        rules: List[LabelingRuleResponse],
+        summary: str,
+        action_items: List[Dict[str, Any]],
+        decisions: List[Dict[str, Any]],
+        transcript: str
+    ) -> Dict[int, Tuple[bool, float]]:
+        """Ask the LLM about the given rules and return {rule_id: (applied, confidence)}"""
         try:
             # Prepare rules for AI analysis
             rules_prompt = "Apply the following labeling rules to this meeting recording:\n\n"
-            for rule in active_rules:
+            for rule in rules:
                 rules_prompt += f"**{rule.label_name}**: {rule.rule_description}\n"
             
             rules_prompt += f"""
 Based on the meeting content below, determine which labels should be applied.
-Return a JSON array of objects with: {{"label_name": "string", "confidence": 0.0-1.0, "reasoning": "string"}}
+Return a JSON object {{"labels": [...]}} where each entry is: {{"label_name": "string", "confidence": 0.0-1.0, "reasoning": "string"}}
 
 Meeting Summary: {summary or "No summary available"}
 
@@ -166,28 +217,22 @@ Transcript Preview: {transcript[:500] if transcript else "No transcript availabl
             )
             
             result = json.loads(response.choices[0].message.content)
+            confidences = {
+                ai_label.get("label_name"): ai_label.get("confidence", 0.8)
+                for ai_label in result.get("labels", [])
+            }
             
-            # Convert AI response to our format and add colors
-            applied_labels = []
-            for ai_label in result.get("labels", []):
-                # Find the matching rule to get the color
-                matching_rule = next(
-                    (rule for rule in active_rules if rule.label_name == ai_label["label_name"]),
-                    None
-                )
-                if matching_rule and ai_label.get("confidence", 0) > 0.6:  # Only apply if confidence > 60%
-                    applied_labels.append({
-                        "label_name": matching_rule.label_name,
-                        "label_color": matching_rule.label_color,
-                        "confidence": ai_label.get("confidence", 0.8)
-                    })
-            
-            logger.info(f"✅ Applied {len(applied_labels)} labels to recording")
-            return applied_labels
+            # Rules the LLM did not return count as "not applied"
+            verdicts = {}
+            for rule in rules:
+                confidence = confidences.get(rule.label_name)
+                applied = confidence is not None and confidence > 0.6  # Only apply if confidence > 60%
+                verdicts[rule.id] = (applied, confidence if confidence is not None else 0.0)
+            return verdicts
             
         except Exception as e:
             logger.error(f"❌ Failed to apply labeling rules: {e}")
-            return []
+            return {}
 
 
 # Global labeling service instance
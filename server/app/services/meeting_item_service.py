@@ -0,0 +1,279 @@
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.database import SessionLocal
+from app.models.meeting_item import ActionItem, Decision
+from app.models.recording import Recording
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"high", "medium", "low"}
+
+
+class MeetingItemService:
+    """
+    Action items and decisions normalized out of the recording's analysis JSON
+
+    The JSON columns on Recording stay the source the recording detail page
+    reads; these tables mirror them with typed, indexed columns so dashboards
+    can filter across recordings and page with keyset cursors.
+    """
+
+    def replace_items(
+        self,
+        db: Session,
+        recording_id: int,
+        action_items: Optional[List[Dict[str, Any]]] = None,
+        decisions: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Replace a recording's rows within the caller's transaction
+
+        Lists that are None are left untouched. Action items keep their status
+        when re-analysis produces the same description.
+        """
+        if action_items is not None:
+            statuses = dict(
+                db.query(ActionItem.description, ActionItem.status).filter(ActionItem.recording_id == recording_id).all()
+            )
+            db.query(ActionItem).filter(ActionItem.recording_id == recording_id).delete(synchronize_session=False)
+            db.add_all(
+                ActionItem(
+                    recording_id=recording_id,
+                    position=position,
+                    description=str(item.get("description") or "").strip(),
+                    assignee=self._clean(item.get("assignee")),
+                    due_date=self._parse_date(item.get("due_date")),
+                    priority=self._parse_priority(item.get("priority")),
+                    status=statuses.get(str(item.get("description") or "").strip(), "open")
+                )
+                for position, item in enumerate(self._valid(action_items))
+            )
+        if decisions is not None:
+            db.query(Decision).filter(Decision.recording_id == recording_id).delete(synchronize_session=False)
+            db.add_all(
+                Decision(
+                    recording_id=recording_id,
+                    position=position,
+                    description=str(item.get("description") or "").strip(),
+                    owner=self._clean(item.get("owner")),
+                    context=self._clean(item.get("context")),
+                    impact=self._clean(item.get("impact"))
+                )
+                for position, item in enumerate(self._valid(decisions))
+            )
+        db.flush()
+
+    def remove_items(self, db: Session, recording_id: int) -> None:
+        db.query(ActionItem).filter(ActionItem.recording_id == recording_id).delete(synchronize_session=False)
+        db.query(Decision).filter(Decision.recording_id == recording_id).delete(synchronize_session=False)
+
+    def get_action_items(
+        self,
+        db: Session,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        recording_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Filter action items across recordings, ordered by due date then ID
+
+        Items without a due date come last. The filters match the leading
+        columns of the composite indexes, and dated and undated items are read
+        as two range scans of them: (due_date, id) after the cursor's row
+        value, then undated items by id. Each page stays a short index scan.
+
+        Args:
+            db: Database session
+            assignee: Case-insensitive assignee name
+            status: open or done
+            priority: high, medium or low
+            due_from: Earliest due date, inclusive
+            due_to: Latest due date, inclusive
+            recording_id: Only items of this recording
+            cursor: `next_cursor` of the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (items, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = db.query(ActionItem, Recording.original_filename).join(Recording, Recording.id == ActionItem.recording_id)
+        if assignee:
+            query = query.filter(func.lower(ActionItem.assignee) == assignee.strip().lower())
+        if status:
+            query = query.filter(ActionItem.status == status)
+        if priority:
+            query = query.filter(ActionItem.priority == priority.lower())
+        if due_from:
+            query = query.filter(ActionItem.due_date >= due_from)
+        if due_to:
+            query = query.filter(ActionItem.due_date <= due_to)
+        if recording_id:
+            query = query.filter(ActionItem.recording_id == recording_id)
+
+        after = decode_cursor(cursor)
+        if after:
+            try:
+                last_id = int(after["id"])
+                last_due = date.fromisoformat(after["due_date"]) if after.get("due_date") else None
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+
+        rows = []
+        if not after or last_due:
+            dated = query.filter(ActionItem.due_date.isnot(None))
+            if after:
+                dated = dated.filter(tuple_(ActionItem.due_date, ActionItem.id) > tuple_(last_due, last_id))
+            rows = dated.order_by(ActionItem.due_date, ActionItem.id).limit(limit + 1).all()
+        if len(rows) <= limit:
+            # The dated items are exhausted; continue with the undated ones
+            undated = query.filter(ActionItem.due_date.is_(None))
+            if after and not last_due:
+                undated = undated.filter(ActionItem.id > last_id)
+            rows += undated.order_by(ActionItem.id).limit(limit + 1 - len(rows)).all()
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = encode_cursor({"due_date": last.due_date, "id": last.id})
+        return [self._action_item_dict(item, title) for item, title in page], next_cursor
+
+    def update_action_item_status(self, db: Session, item_id: int, status: str) -> Optional[Dict[str, Any]]:
+        """Mark an action item open or done"""
+        row = db.query(ActionItem, Recording.original_filename).join(
+            Recording, Recording.id == ActionItem.recording_id
+        ).filter(ActionItem.id == item_id).first()
+        if not row:
+            return None
+        item, title = row
+        item.status = status
+        db.commit()
+        return self._action_item_dict(item, title)
+
+    def get_decisions(
+        self,
+        db: Session,
+        owner: Optional[str] = None,
+        recording_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Filter decisions across recordings, newest first
+
+        Args:
+            db: Database session
+            owner: Case-insensitive owner name
+            recording_id: Only decisions of this recording
+            cursor: `next_cursor` of the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (decisions, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = db.query(Decision, Recording.original_filename).join(Recording, Recording.id == Decision.recording_id)
+        if owner:
+            query = query.filter(func.lower(Decision.owner) == owner.strip().lower())
+        if recording_id:
+            query = query.filter(Decision.recording_id == recording_id)
+
+        after = decode_cursor(cursor)
+        if after:
+            try:
+                last_id = int(after["id"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            query = query.filter(Decision.id < last_id)
+
+        rows = query.order_by(Decision.id.desc()).limit(limit + 1).all()
+        page = rows[:limit]
+        next_cursor = encode_cursor({"id": page[-1][0].id}) if len(rows) > limit else None
+        return [
+            {
+                "id": decision.id,
+                "recording_id": decision.recording_id,
+                "recording_title": title,
+                "description": decision.description,
+                "owner": decision.owner,
+                "context": decision.context,
+                "impact": decision.impact
+            }
+            for decision, title in page
+        ], next_cursor
+
+    def backfill(self, batch_size: int = 100) -> None:
+        """Normalize analysis JSON of recordings analyzed before these tables existed"""
+        db = SessionLocal()
+        try:
+            total = 0
+            last_id = 0
+            while True:
+                rows = db.query(Recording.id, Recording.action_items, Recording.decisions).filter(
+                    Recording.id > last_id,
+                    or_(Recording.action_items.isnot(None), Recording.decisions.isnot(None)),
+                    ~db.query(ActionItem.id).filter(ActionItem.recording_id == Recording.id).exists(),
+                    ~db.query(Decision.id).filter(Decision.recording_id == Recording.id).exists()
+                ).order_by(Recording.id).limit(batch_size).all()
+                if not rows:
+                    break
+                for recording_id, action_items, decisions in rows:
+                    self.replace_items(db, recording_id, action_items or [], decisions or [])
+                db.commit()
+                total += len(rows)
+                last_id = rows[-1][0]
+            if total:
+                logger.info(f"📌 Backfilled action items and decisions for {total} recordings")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to backfill action items and decisions: {e}")
+        finally:
+            db.close()
+
+    def _action_item_dict(self, item: ActionItem, recording_title: str) -> Dict[str, Any]:
+        return {
+            "id": item.id,
+            "recording_id": item.recording_id,
+            "recording_title": recording_title,
+            "description": item.description,
+            "assignee": item.assignee,
+            "due_date": item.due_date.isoformat() if item.due_date else None,
+            "priority": item.priority,
+            "status": item.status
+        }
+
+    def _valid(self, items: List[Any]) -> List[Dict[str, Any]]:
+        return [item for item in items if isinstance(item, dict) and str(item.get("description") or "").strip()]
+
+    def _clean(self, value: Any) -> Optional[str]:
+        value = str(value).strip() if value is not None else ""
+        return value if value and value.lower() not in ("null", "none") else None
+
+    def _parse_date(self, value: Any) -> Optional[date]:
+        try:
+            return date.fromisoformat(str(value)[:10]) if value else None
+        except ValueError:
+            return None
+
+    def _parse_priority(self, value: Any) -> Optional[str]:
+        value = str(value or "").strip().lower()
+        return value if value in PRIORITIES else None
+
+
+# Global meeting item service instance
+meeting_item_service = MeetingItemService()
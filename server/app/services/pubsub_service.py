@@ -0,0 +1,179 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "ordo:"
+
+
+class VersionCounter:
+    """Monotonic version number shared by every API and worker process through Redis"""
+
+    def __init__(self, service: "PubSubService", name: str, poll_interval: float):
+        self.name = name
+        self.key = f"{CHANNEL_PREFIX}version:{name}"
+        self._service = service
+        self._poll_interval = poll_interval
+        self._version = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        service.subscribe(self.key, self._on_message)
+
+    def bump(self) -> int:
+        """Increment the version and notify all other processes"""
+        version = None
+        conn = self._service.connection
+        if conn is not None:
+            try:
+                version = int(conn.incr(self.key))
+                conn.publish(self.key, version)
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to publish version bump for {self.name}: {e}")
+                version = None
+
+        with self._lock:
+            # Without Redis the counter is process-local, which is still correct
+            # for a single-process deployment
+            self._version = version if version is not None else self._version + 1
+            self._checked_at = time.monotonic()
+            return self._version
+
+    def current(self) -> int:
+        """Return the latest known version, re-reading Redis at most every poll interval"""
+        now = time.monotonic()
+        if now - self._checked_at < self._poll_interval:
+            return self._version
+
+        conn = self._service.connection
+        if conn is not None:
+            try:
+                value = conn.get(self.key)
+                with self._lock:
+                    if value is not None:
+                        self._version = int(value)
+            except Exception as e:
+                logger.debug(f"Version poll for {self.name} failed: {e}")
+        self._checked_at = now
+        return self._version
+
+    def _on_message(self, data: Any) -> None:
+        try:
+            with self._lock:
+                self._version = int(data)
+                self._checked_at = time.monotonic()
+        except (TypeError, ValueError):
+            logger.warning(f"⚠️  Ignoring malformed version message for {self.name}: {data!r}")
+
+
+class PubSubService:
+    """Service for cross-process notifications over Redis pub/sub"""
+
+    def __init__(self):
+        self._connection: Optional[redis.Redis] = None
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._handlers_lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._counters: Dict[str, VersionCounter] = {}
+
+    @property
+    def connection(self) -> Optional[redis.Redis]:
+        """Get the Redis connection, creating it lazily"""
+        if self._connection is None:
+            try:
+                self._connection = redis.Redis(
+                    host=settings.redis_host,
+                    port=settings.redis_port,
+                    db=settings.redis_db,
+                    decode_responses=True,
+                    socket_connect_timeout=2
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to create Redis connection for pub/sub: {e}")
+                return None
+        return self._connection
+
+    def publish(self, channel: str, payload: Any) -> bool:
+        """Publish a JSON payload on an application channel"""
+        conn = self.connection
+        if conn is None:
+            return False
+        try:
+            conn.publish(f"{CHANNEL_PREFIX}{channel}", json.dumps(payload, default=str))
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to publish on {channel}: {e}")
+            return False
+
+    def subscribe(self, channel: str, handler: Callable[[Any], None]) -> None:
+        """
+        Register a handler for a channel
+
+        Handlers run on the listener thread and must not block. Channels
+        published through `publish` receive the decoded JSON payload.
+        """
+        if not channel.startswith(CHANNEL_PREFIX):
+            channel = f"{CHANNEL_PREFIX}{channel}"
+        with self._handlers_lock:
+            self._handlers.setdefault(channel, []).append(handler)
+        self._ensure_listener()
+
+    def version_counter(self, name: str) -> VersionCounter:
+        """Get the shared version counter with the given name"""
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = VersionCounter(self, name, settings.version_poll_interval)
+            self._counters[name] = counter
+        return counter
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name="ordo-pubsub", daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        """Listen on every application channel and reconnect when Redis goes away"""
+        warned = False
+        while True:
+            try:
+                pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                logger.info("📡 Pub/sub listener connected")
+                warned = False
+                for message in pubsub.listen():
+                    self._dispatch(message)
+            except Exception as e:
+                if not warned:
+                    logger.warning(f"⚠️  Pub/sub listener unavailable, retrying: {e}")
+                    warned = True
+                time.sleep(5)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        channel = message.get("channel")
+        with self._handlers_lock:
+            handlers = list(self._handlers.get(channel, []))
+        if not handlers:
+            return
+
+        data = message.get("data")
+        if not channel.startswith(f"{CHANNEL_PREFIX}version:"):
+            try:
+                data = json.loads(data)
+            except (TypeError, ValueError):
+                pass
+
+        for handler in handlers:
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"❌ Pub/sub handler for {channel} failed: {e}")
+
+
+# Global pub/sub service instance
+pubsub_service = PubSubService()
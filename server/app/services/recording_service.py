@@ -1,19 +1,69 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, select, text, tuple_
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.recording import Recording
-from app.models.database import SessionLocal
+from app.models.recording_label import RecordingLabel
+from app.models.recording_count import RecordingCount
+from app.models.label_classifier import LabelVerdict
+from app.models.database import SessionLocal, AsyncSessionLocal
+from app.services.search_service import search_service
+from app.services.chunk_service import chunk_service
+from app.services.speaker_turn_service import speaker_turn_service
+from app.services.meeting_item_service import meeting_item_service
+from app.services.title_search_service import title_search_service, title_from_summary
+from app.services.autocomplete_service import autocomplete_service
+from app.services.status_stream_service import status_stream_service, TERMINAL_STATUSES
 
 logger = logging.getLogger(__name__)
 
+TRANSCRIPT_PREVIEW_CHARS = 200  # Kept in transcript_preview for list views
+
+# Adjusts a listing counter within the caller's transaction, creating it on first use
+COUNT_UPSERT_SQL = text(
+    "INSERT INTO recording_counts (scope, total) VALUES (:scope, :delta) "
+    "ON CONFLICT (scope) DO UPDATE SET total = recording_counts.total + excluded.total"
+)
+
+
+@dataclass(frozen=True)
+class RecordingFilters:
+    """Conditions narrowing a recording listing; unset ones match every recording"""
+    label: Optional[str] = None
+    processing_status: Optional[str] = None
+    content_type: Optional[str] = None
+    created_from: Optional[datetime] = None  # Inclusive
+    created_to: Optional[datetime] = None  # Exclusive
+    min_duration: Optional[float] = None  # Seconds, inclusive
+    max_duration: Optional[float] = None
+    
+    @property
+    def counted(self) -> bool:
+        """Whether a maintained counter holds the number of matching recordings"""
+        return (
+            self.processing_status is None and self.content_type is None
+            and self.created_from is None and self.created_to is None
+            and self.min_duration is None and self.max_duration is None
+        )
+
 
 class RecordingService:
-    """Service for handling Recording database operations"""
+    """
+    Service for handling Recording database operations
     
-    def create_recording(
+    Methods taking an `AsyncSession` serve API requests; the others open
+    their own session and serve the synchronous background tasks.
+    """
+    
+    async def create_recording(
         self,
+        db: AsyncSession,
         original_filename: str,
         media_url: str,
         storage_path: str,
@@ -25,7 +75,6 @@ class RecordingService:
         logger.debug(f"🔗 Media URL: {media_url}")
         logger.debug(f"📁 Storage path: {storage_path}")
         
-        db = SessionLocal()
         try:
             recording = Recording(
                 original_filename=original_filename,
@@ -36,17 +85,19 @@ class RecordingService:
                 processing_status="pending"
             )
             db.add(recording)
-            db.commit()
-            db.refresh(recording)
+            await db.run_sync(self._adjust_counts, {"all": 1})
+            await db.commit()
+            await db.refresh(recording)
+            await run_in_threadpool(
+                self._announce, recording.id, recording.processing_status, recording.updated_at
+            )
             
             logger.info(f"✅ Recording created with ID: {recording.id}")
             return recording
         except Exception as e:
             logger.error(f"❌ Failed to create recording: {e}")
-            db.rollback()
+            await db.rollback()
             raise e
-        finally:
-            db.close()
     
     def update_transcription(
         self,
@@ -55,21 +106,30 @@ class RecordingService:
         transcript_with_speakers: Optional[str] = None,
         duration: Optional[float] = None,
         status: str = "completed",
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        segments: Optional[List[Dict[str, Any]]] = None
     ) -> Optional[Recording]:
-        """Update recording with transcription results"""
+        """Update recording with transcription results, re-chunking the transcript and speaker turns for search"""
         db = SessionLocal()
         try:
             recording = db.query(Recording).filter(Recording.id == recording_id).first()
             if recording:
                 recording.transcript = transcript
+                recording.transcript_preview = transcript[:TRANSCRIPT_PREVIEW_CHARS] if transcript else None
                 recording.transcript_with_speakers = transcript_with_speakers
                 recording.duration = duration
                 recording.processing_status = status
                 recording.processing_error = error
                 recording.updated_at = datetime.utcnow()
+                db.flush()
+                search_service.index_recording(db, recording_id)
+                chunk_service.replace_chunks(db, recording_id, transcript, segments, duration)
+                speaker_turn_service.replace_turns(db, recording_id, transcript_with_speakers, segments, duration)
                 db.commit()
                 db.refresh(recording)
+                status_stream_service.publish(
+                    recording_id, status, error, recording.updated_at, self._status_fields(recording)
+                )
             return recording
         finally:
             db.close()
@@ -93,6 +153,7 @@ class RecordingService:
                 # Only update fields that are explicitly provided
                 if summary is not None:
                     recording.summary = summary
+                    recording.title = title_from_summary(summary)
                 if action_items is not None:
                     recording.action_items = action_items
                 if decisions is not None:
@@ -101,8 +162,17 @@ class RecordingService:
                 if error:
                     recording.processing_error = error
                 recording.updated_at = datetime.utcnow()
+                db.flush()
+                search_service.index_recording(db, recording_id)
+                meeting_item_service.replace_items(db, recording_id, action_items, decisions)
                 db.commit()
                 db.refresh(recording)
+                if summary is not None:
+                    title_search_service.invalidate()
+                status_stream_service.publish(
+                    recording_id, status, recording.processing_error, recording.updated_at,
+                    self._status_fields(recording)
+                )
                 logger.info(f"✅ Analysis updated for recording {recording_id}")
             return recording
         except Exception as e:
@@ -116,7 +186,8 @@ class RecordingService:
         self,
         recording_id: int,
         visual_summary_url: Optional[str] = None,
-        labels: Optional[List[Dict[str, Any]]] = None
+        labels: Optional[List[Dict[str, Any]]] = None,
+        visual_summary_variants: Optional[Dict[str, str]] = None
     ) -> Optional[Recording]:
         """Update recording with additional data like visual summary"""
         logger.info(f"📝 Updating recording {recording_id}")
@@ -127,11 +198,15 @@ class RecordingService:
             if recording:
                 if visual_summary_url:
                     recording.visual_summary_url = visual_summary_url
+                    recording.visual_summary_variants = visual_summary_variants
                 if labels is not None:
                     recording.labels = labels
+                    self._sync_labels(db, recording_id, labels)
                 recording.updated_at = datetime.utcnow()
                 db.commit()
                 db.refresh(recording)
+                if labels is not None:
+                    autocomplete_service.notify_recording_changed(recording_id)
                 logger.info(f"✅ Recording {recording_id} updated successfully")
             return recording
         except Exception as e:
@@ -149,34 +224,363 @@ class RecordingService:
         finally:
             db.close()
     
-    def get_recordings(self, skip: int = 0, limit: int = 100) -> List[Recording]:
-        """Get all recordings with pagination"""
+    async def fetch_recording(self, db: AsyncSession, recording_id: int) -> Optional[Recording]:
+        """Get a recording by ID within an API request"""
+        return await db.get(Recording, recording_id)
+    
+    async def get_recording_version(self, db: AsyncSession, recording_id: int) -> Optional[datetime]:
+        """
+        Get when a recording last changed without loading the row
+        
+        Returns:
+            updated_at of the recording, or None if it does not exist
+        """
+        return await db.scalar(select(Recording.updated_at).where(Recording.id == recording_id))
+    
+    async def set_labels(
+        self,
+        db: AsyncSession,
+        recording_id: int,
+        labels: List[Dict[str, Any]]
+    ) -> Optional[Recording]:
+        """Replace a recording's labels and their index rows"""
+        logger.info(f"🏷️  Updating labels of recording {recording_id}")
+        try:
+            recording = await db.get(Recording, recording_id)
+            if recording:
+                recording.labels = labels
+                recording.updated_at = datetime.utcnow()
+                await db.run_sync(self._sync_labels, recording_id, labels)
+                await db.commit()
+                # Redis calls block, so they run off the event loop
+                await run_in_threadpool(autocomplete_service.notify_recording_changed, recording_id)
+            return recording
+        except Exception as e:
+            logger.error(f"❌ Failed to update labels of recording {recording_id}: {e}")
+            await db.rollback()
+            raise e
+    
+    def _status_fields(self, recording: Recording) -> Optional[Dict[str, Any]]:
+        """Listing fields written by processing, sent along once it finishes"""
+        if recording.processing_status not in TERMINAL_STATUSES:
+            return None
+        return {
+            "title": recording.title,
+            "duration": recording.duration,
+            "has_summary": recording.summary is not None,
+            "transcript_preview": recording.transcript_preview
+        }
+    
+    def _sync_labels(self, db: Session, recording_id: int, labels: List[Dict[str, Any]]) -> None:
+        """Mirror the labels JSON into the indexed recording_labels table"""
+        # Concurrent label changes of one recording queue here, so each diffs against the other's result
+        db.query(Recording.id).filter(Recording.id == recording_id).with_for_update().first()
+        previous = {
+            row[0] for row in db.query(RecordingLabel.label_name).filter(RecordingLabel.recording_id == recording_id)
+        }
+        db.query(RecordingLabel).filter(RecordingLabel.recording_id == recording_id).delete(
+            synchronize_session=False
+        )
+        seen = set()
+        for label in labels:
+            label_name = label.get("label_name")
+            if not label_name or label_name in seen:
+                continue
+            seen.add(label_name)
+            db.add(RecordingLabel(
+                recording_id=recording_id,
+                label_name=label_name,
+                label_color=label.get("label_color"),
+                confidence=label.get("confidence")
+            ))
+        deltas = {self._count_scope(name): 1 for name in seen - previous}
+        deltas.update({self._count_scope(name): -1 for name in previous - seen})
+        self._adjust_counts(db, deltas)
+    
+    def _adjust_counts(self, db: Session, deltas: Dict[str, int]) -> None:
+        for scope, delta in deltas.items():
+            if delta:
+                db.execute(COUNT_UPSERT_SQL, {"scope": scope, "delta": delta})
+    
+    def _count_scope(self, label: Optional[str]) -> str:
+        return f"label:{label}" if label else "all"
+    
+    def _apply_filters(self, query, filters: RecordingFilters):
+        if filters.label:
+            query = query.join(RecordingLabel, RecordingLabel.recording_id == Recording.id).filter(
+                RecordingLabel.label_name == filters.label
+            )
+        if filters.processing_status:
+            query = query.filter(Recording.processing_status == filters.processing_status)
+        if filters.content_type:
+            query = query.filter(Recording.content_type == filters.content_type)
+        if filters.created_from:
+            query = query.filter(Recording.created_at >= filters.created_from)
+        if filters.created_to:
+            query = query.filter(Recording.created_at < filters.created_to)
+        if filters.min_duration is not None:
+            query = query.filter(Recording.duration >= filters.min_duration)
+        if filters.max_duration is not None:
+            query = query.filter(Recording.duration <= filters.max_duration)
+        return query
+    
+    async def get_recordings(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        filters: RecordingFilters = RecordingFilters(),
+        fields: Sequence[str] = ("id",)
+    ) -> Tuple[List[Recording], Optional[str]]:
+        """
+        Get one page of recordings matching the filters, newest first
+
+        Pages are ordered by (created_at, id) and the cursor continues after
+        the last row's key. Each equality filter (status, content type) has an
+        index leading with it and ending in that key, and the created range
+        bounds the key itself, so a page is one index range scan however deep
+        it is; a duration range is checked on the rows that scan visits.
+        Only the requested columns are read; every other column is deferred
+        and must not be accessed on the returned recordings.
+
+        Args:
+            db: Async database session
+            cursor: `next_cursor` of the previous page, from the same filters
+            limit: Number of recordings to return
+            filters: Conditions the recordings must meet
+            fields: Recording attributes to load
+
+        Returns:
+            Tuple of (recordings, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        columns = dict.fromkeys([*fields, "id", "created_at"])  # The cursor needs the sort key
+        query = self._apply_filters(
+            select(Recording).options(load_only(*(getattr(Recording, field) for field in columns))),
+            filters
+        )
+        after = decode_cursor(cursor)
+        if after:
+            try:
+                last_key = (datetime.fromisoformat(after["created_at"]), int(after["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            # A row-value comparison keeps the continuation a single index range
+            query = query.filter(tuple_(Recording.created_at, Recording.id) < tuple_(*last_key))
+        
+        rows = (await db.scalars(
+            query.order_by(Recording.created_at.desc(), Recording.id.desc()).limit(limit + 1)
+        )).all()
+        page = list(rows[:limit])
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor({"created_at": page[-1].created_at, "id": page[-1].id})
+        return page, next_cursor
+    
+    async def get_recordings_count(
+        self,
+        db: AsyncSession,
+        filters: RecordingFilters = RecordingFilters(),
+        exact: bool = False
+    ) -> Optional[int]:
+        """
+        Get the number of recordings matching the filters
+        
+        Counters are kept for all recordings and per label only. Those are
+        read unless an exact count is asked for, which scans the matching
+        rows; other filters are counted only when asked.
+        
+        Returns:
+            The number of recordings, or None for uncounted filters without `exact`
+        """
+        if exact:
+            return await db.scalar(self._apply_filters(select(func.count()).select_from(Recording), filters))
+        if not filters.counted:
+            return None
+        total = await db.scalar(
+            select(RecordingCount.total).where(RecordingCount.scope == self._count_scope(filters.label))
+        )
+        return max(0, total or 0)
+    
+    async def stream_recordings(
+        self,
+        filters: RecordingFilters,
+        fields: Sequence[str],
+        batch_size: int = 500
+    ) -> AsyncIterator[List[Tuple]]:
+        """
+        Stream matching recordings, oldest first, a batch at a time
+        
+        Only the requested columns are selected, as plain rows that never
+        enter an identity map, and `yield_per` keeps the driver to one batch
+        in memory (a server-side cursor on PostgreSQL). The session is held
+        for the whole stream and closed when the caller stops iterating.
+        
+        Args:
+            filters: Conditions the recordings must meet
+            fields: Recording attributes to read, in row order
+            batch_size: Rows fetched per round trip
+        
+        Yields:
+            Lists of row tuples ordered like `fields`
+        """
+        query = self._apply_filters(select(*(getattr(Recording, field) for field in fields)), filters)
+        query = query.order_by(Recording.created_at, Recording.id).execution_options(yield_per=batch_size)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query)
+            async for rows in result.partitions():
+                yield rows
+    
+    def ensure_counts(self) -> None:
+        """Seed the listing counters when none exist yet; safe to run on every startup"""
         db = SessionLocal()
         try:
-            return db.query(Recording).offset(skip).limit(limit).all()
+            if db.query(RecordingCount.scope).first() is not None:
+                return
+            counts = self._count_rows(db)
+            db.add_all(RecordingCount(scope=scope, total=total) for scope, total in counts.items())
+            db.commit()
+            logger.info(f"🔢 Seeded recording counts ({counts['all']} recordings)")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to seed recording counts: {e}")
         finally:
             db.close()
     
-    def get_recordings_count(self) -> int:
-        """Get total count of recordings"""
+    def reconcile_counts(self) -> None:
+        """Recompute the listing counters from the tables, correcting any drift; run when a worker starts"""
         db = SessionLocal()
         try:
-            return db.query(Recording).count()
+            # Locked first, so adjustments in flight commit before the counts
+            # below are read and later ones wait and apply on top of them
+            stored = {row.scope: row for row in db.query(RecordingCount).with_for_update().all()}
+            counts = self._count_rows(db)
+            drifted = 0
+            for scope, row in stored.items():
+                total = counts.pop(scope, 0)
+                if row.total != total:
+                    drifted += 1
+                    row.total = total
+            db.add_all(RecordingCount(scope=scope, total=total) for scope, total in counts.items())
+            db.commit()
+            if drifted or counts:
+                logger.warning(f"⚠️  Corrected {drifted + len(counts)} drifted recording counts")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to reconcile recording counts: {e}")
         finally:
             db.close()
     
-    def delete_recording(self, recording_id: int) -> bool:
-        """Delete a recording"""
+    def _count_rows(self, db: Session) -> Dict[str, int]:
+        """Recording totals per counter scope, counted from the tables"""
+        counts = {"all": db.query(func.count(Recording.id)).scalar()}
+        for label_name, total in db.query(
+            RecordingLabel.label_name, func.count(RecordingLabel.recording_id)
+        ).group_by(RecordingLabel.label_name):
+            counts[self._count_scope(label_name)] = total
+        return counts
+    
+    def get_completed_recording_ids(self) -> List[int]:
+        """Get IDs of all recordings that finished processing"""
         db = SessionLocal()
         try:
-            recording = db.query(Recording).filter(Recording.id == recording_id).first()
-            if recording:
-                db.delete(recording)
-                db.commit()
-                return True
-            return False
+            rows = db.query(Recording.id).filter(Recording.processing_status == "completed").order_by(Recording.id).all()
+            return [row[0] for row in rows]
         finally:
             db.close()
+    
+    async def get_statuses(
+        self,
+        db: AsyncSession,
+        recording_ids: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the processing status of recordings
+        
+        Args:
+            db: Async database session
+            recording_ids: Recordings to report; all recordings still in flight when None
+        
+        Returns:
+            List of dicts shaped like status stream events
+        """
+        query = select(
+            Recording.id, Recording.processing_status, Recording.processing_error, Recording.updated_at
+        )
+        if recording_ids is None:
+            query = query.where(Recording.processing_status.notin_(("completed", "failed")))
+        else:
+            query = query.where(Recording.id.in_(recording_ids))
+        return [
+            {
+                "recording_id": recording_id,
+                "processing_status": status,
+                "processing_error": error,
+                "updated_at": updated_at.isoformat() if updated_at else None
+            }
+            for recording_id, status, error, updated_at in (await db.execute(query.order_by(Recording.id))).all()
+        ]
+    
+    async def get_label_facets(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Get per-label recording counts from the label index"""
+        rows = await db.execute(
+            select(
+                RecordingLabel.label_name,
+                func.max(RecordingLabel.label_color),
+                func.count(RecordingLabel.recording_id)
+            ).group_by(RecordingLabel.label_name).order_by(
+                func.count(RecordingLabel.recording_id).desc()
+            )
+        )
+        return [
+            {"label_name": name, "label_color": color, "count": count}
+            for name, color, count in rows
+        ]
+    
+    async def delete_recording(self, db: AsyncSession, recording_id: int) -> bool:
+        """Delete a recording and its dependent rows"""
+        try:
+            # The dependent-row services share their query code with the background tasks
+            deleted = await db.run_sync(self._delete_recording, recording_id)
+            if deleted:
+                await db.commit()
+                await run_in_threadpool(self._announce, recording_id, "deleted")
+            return deleted
+        except Exception as e:
+            logger.error(f"❌ Failed to delete recording {recording_id}: {e}")
+            await db.rollback()
+            raise e
+    
+    def _announce(self, recording_id: int, status: str, updated_at: Optional[datetime] = None) -> None:
+        """Tell every process a recording was added or removed; blocks on Redis, so async callers use the threadpool"""
+        title_search_service.invalidate()
+        autocomplete_service.notify_recording_changed(recording_id)
+        status_stream_service.publish(recording_id, status, updated_at=updated_at)
+    
+    def _delete_recording(self, db: Session, recording_id: int) -> bool:
+        recording = db.query(Recording).filter(Recording.id == recording_id).first()
+        if not recording:
+            return False
+        label_names = [
+            row[0] for row in db.query(RecordingLabel.label_name).filter(RecordingLabel.recording_id == recording_id)
+        ]
+        self._adjust_counts(db, {"all": -1, **{self._count_scope(name): -1 for name in label_names}})
+        # Dependent rows are removed explicitly since SQLite does not enforce cascades
+        db.query(RecordingLabel).filter(RecordingLabel.recording_id == recording_id).delete(
+            synchronize_session=False
+        )
+        db.query(LabelVerdict).filter(LabelVerdict.recording_id == recording_id).delete(
+            synchronize_session=False
+        )
+        chunk_service.remove_chunks(db, recording_id)
+        speaker_turn_service.remove_turns(db, recording_id)
+        meeting_item_service.remove_items(db, recording_id)
+        search_service.remove_recording(db, recording_id)
+        db.delete(recording)
+        db.flush()
+        return True
 
 
 
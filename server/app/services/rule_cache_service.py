@@ -0,0 +1,62 @@
+import logging
+import threading
+from typing import List, Optional
+
+from app.models.database import SessionLocal
+from app.models.labeling_rule import LabelingRule
+from app.models.schemas import LabelingRuleResponse
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+
+class RuleCacheService:
+    """In-process cache of labeling rules invalidated through a shared version counter"""
+
+    def __init__(self):
+        self._version = pubsub_service.version_counter("labeling_rules")
+        self._rules: List[LabelingRuleResponse] = []
+        self._loaded_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get_rules(self, active_only: bool = False) -> List[LabelingRuleResponse]:
+        """Get cached rules, newest first"""
+        rules = self._ensure_loaded()
+        if active_only:
+            return [rule for rule in rules if rule.is_active]
+        return list(rules)
+
+    def get_rule(self, rule_id: int) -> Optional[LabelingRuleResponse]:
+        """Get a cached rule by ID"""
+        return next((rule for rule in self._ensure_loaded() if rule.id == rule_id), None)
+
+    def invalidate(self) -> None:
+        """Bump the rules version so every process reloads on its next read"""
+        version = self._version.bump()
+        logger.info(f"🔄 Labeling rules cache invalidated (version {version})")
+
+    def _ensure_loaded(self) -> List[LabelingRuleResponse]:
+        version = self._version.current()
+        if self._loaded_version == version:
+            return self._rules
+
+        with self._lock:
+            if self._loaded_version == version:
+                return self._rules
+
+            db = SessionLocal()
+            try:
+                rules = db.query(LabelingRule).order_by(LabelingRule.created_at.desc()).all()
+                self._rules = [LabelingRuleResponse.model_validate(rule) for rule in rules]
+            finally:
+                db.close()
+
+            # Record the version read before loading so a bump during the
+            # load triggers another reload instead of being lost
+            self._loaded_version = version
+            logger.info(f"📋 Loaded {len(self._rules)} labeling rules into cache (version {version})")
+            return self._rules
+
+
+# Global rule cache instance
+rule_cache_service = RuleCacheService()
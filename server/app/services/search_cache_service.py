@@ -0,0 +1,71 @@
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCacheService:
+    """
+    In-process LRU cache of search responses
+
+    Entries are stamped with the shared "search_corpus" version. The pipeline
+    bumps it once a recording is indexed and the API once one is deleted, so
+    a cached response is served until the searchable corpus actually changes
+    in any process.
+    """
+
+    def __init__(self):
+        self._version = pubsub_service.version_counter("search_corpus")
+        self._entries: "OrderedDict[Hashable, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, query: str, **params: Any) -> Hashable:
+        """Cache key from the normalized query and the other search parameters"""
+        return (" ".join(query.lower().split()),) + tuple(sorted(params.items()))
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Cached response for the current corpus version, if any"""
+        version = self._version.current()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: Hashable, response: Dict[str, Any], version: int) -> None:
+        """
+        Store a response computed while `version` was current
+
+        Args:
+            key: Key from `key()`
+            response: Response body
+            version: Corpus version read before the search ran, so a bump
+                during the search leaves the entry already stale
+        """
+        with self._lock:
+            self._entries[key] = (version, copy.deepcopy(response))
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.search_cache_size:
+                self._entries.popitem(last=False)
+
+    def current_version(self) -> int:
+        return self._version.current()
+
+    def invalidate(self) -> None:
+        """Bump the corpus version so every process drops its cached responses"""
+        version = self._version.bump()
+        logger.debug(f"🔄 Search cache invalidated (corpus version {version})")
+
+
+# Global search cache instance
+search_cache_service = SearchCacheService()
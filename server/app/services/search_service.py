@@ -0,0 +1,555 @@
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.models.database import engine, is_postgresql, SessionLocal
+from app.services.chunk_service import chunk_service
+from app.services.speaker_turn_service import speaker_turn_service
+
+logger = logging.getLogger(__name__)
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Weighted document: filename (A) > summary (B) > transcript (C)
+POSTGRES_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce(original_filename, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(transcript_with_speakers, transcript, '')), 'C')
+"""
+
+# bm25() column weights for the FTS5 table, in the same order of importance
+SQLITE_BM25_WEIGHTS = "10.0, 4.0, 1.0"
+
+# Control characters delimit highlighted terms in snippets; they never occur in transcripts
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+SNIPPET_WORDS = 32
+
+# Chunk index statements. PostgreSQL keeps a generated tsvector column and
+# SQLite an external-content FTS5 table synced by triggers, so writes to
+# transcript_chunks keep the index current without extra work.
+POSTGRES_CHUNK_INDEX_SQL = [
+    "ALTER TABLE transcript_chunks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_transcript_chunks_search_vector ON transcript_chunks USING GIN (search_vector)",
+]
+SQLITE_CHUNK_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transcript_chunks_fts USING fts5("
+    "text, content = 'transcript_chunks', content_rowid = 'id', tokenize = 'porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS transcript_chunks_ai AFTER INSERT ON transcript_chunks BEGIN "
+    "INSERT INTO transcript_chunks_fts (rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS transcript_chunks_ad AFTER DELETE ON transcript_chunks BEGIN "
+    "INSERT INTO transcript_chunks_fts (transcript_chunks_fts, rowid, text) VALUES ('delete', old.id, old.text); END",
+]
+
+# Speaker turn index statements. The SQLite FTS5 table indexes the speaker
+# label as a column, so a speaker-scoped match reads only that speaker's postings.
+POSTGRES_TURN_INDEX_SQL = [
+    "ALTER TABLE speaker_turns ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_speaker_turns_search_vector ON speaker_turns USING GIN (search_vector)",
+]
+SQLITE_TURN_INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS speaker_turns_fts USING fts5("
+    "speaker, text, content = 'speaker_turns', content_rowid = 'id', tokenize = 'porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS speaker_turns_ai AFTER INSERT ON speaker_turns BEGIN "
+    "INSERT INTO speaker_turns_fts (rowid, speaker, text) VALUES (new.id, new.speaker, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS speaker_turns_ad AFTER DELETE ON speaker_turns BEGIN "
+    "INSERT INTO speaker_turns_fts (speaker_turns_fts, rowid, speaker, text) "
+    "VALUES ('delete', old.id, old.speaker, old.text); END",
+]
+
+
+class SearchService:
+    """
+    Full-text index over recordings
+
+    PostgreSQL keeps a weighted `search_vector` tsvector column with a GIN index,
+    ranked by `ts_rank_cd`. SQLite uses an FTS5 virtual table keyed by recording
+    ID, ranked by `bm25`. The index is refreshed whenever transcripts or analysis
+    results are written. Transcript chunks are indexed the same way so each hit
+    can point at the passage that matched, and so are diarized speaker turns
+    for speaker-scoped search.
+    """
+
+    def __init__(self):
+        self._available = True
+
+    def ensure_index(self) -> None:
+        """Create the index structures if missing; cheap enough to run on every startup"""
+        try:
+            with engine.begin() as conn:
+                if is_postgresql:
+                    conn.execute(text("ALTER TABLE recordings ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+                    conn.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_recordings_search_vector "
+                        "ON recordings USING GIN (search_vector)"
+                    ))
+                    for statement in POSTGRES_CHUNK_INDEX_SQL + POSTGRES_TURN_INDEX_SQL:
+                        conn.execute(text(statement))
+                else:
+                    exists = conn.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recordings_fts'"
+                    )).first()
+                    if not exists:
+                        conn.execute(text(
+                            "CREATE VIRTUAL TABLE recordings_fts USING fts5("
+                            "filename, summary, transcript, tokenize = 'porter unicode61')"
+                        ))
+                    for statement in SQLITE_CHUNK_INDEX_SQL + SQLITE_TURN_INDEX_SQL:
+                        conn.execute(text(statement))
+            self._available = True
+            logger.info("✅ Full-text search index ready")
+        except Exception as e:
+            # Without an index, search falls back to substring matching
+            self._available = False
+            logger.error(f"❌ Failed to prepare full-text search index: {e}")
+
+    def index_recording(self, db: Session, recording_id: int) -> None:
+        """Refresh the index entry of a recording within the caller's transaction"""
+        if not self._available:
+            return
+        if is_postgresql:
+            db.execute(
+                text(f"UPDATE recordings SET search_vector = {POSTGRES_VECTOR_SQL} WHERE id = :id"),
+                {"id": recording_id}
+            )
+        else:
+            db.execute(text("DELETE FROM recordings_fts WHERE rowid = :id"), {"id": recording_id})
+            db.execute(
+                text(
+                    "INSERT INTO recordings_fts (rowid, filename, summary, transcript) "
+                    "SELECT id, original_filename, summary, coalesce(transcript_with_speakers, transcript) "
+                    "FROM recordings WHERE id = :id"
+                ),
+                {"id": recording_id}
+            )
+
+    def remove_recording(self, db: Session, recording_id: int) -> None:
+        """Drop a recording from the index (the tsvector column goes with its row)"""
+        if self._available and not is_postgresql:
+            db.execute(text("DELETE FROM recordings_fts WHERE rowid = :id"), {"id": recording_id})
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        limit: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank completed recordings against a query
+
+        Args:
+            db: Database session
+            query: Free-text search query
+            limit: Maximum number of results
+            created_from: Only recordings created at or after this time
+            created_to: Only recordings created before this time
+
+        Returns:
+            List of (recording_id, relevance) tuples, best first, relevance in [0, 1)
+        """
+        created_sql, params = self._created_filter("created_at", created_from, created_to)
+        if not self._available:
+            return self._search_substring(db, query, limit, created_sql, params)
+        if is_postgresql:
+            # Normalization 32 scales the rank to rank / (rank + 1)
+            rows = db.execute(
+                text(
+                    "SELECT id, ts_rank_cd(search_vector, q, 32) AS rank "
+                    "FROM recordings, websearch_to_tsquery('english', :query) q "
+                    f"WHERE processing_status = 'completed' AND search_vector @@ q{created_sql} "
+                    "ORDER BY rank DESC, created_at DESC LIMIT :limit"
+                ),
+                {"query": query, "limit": limit, **params}
+            ).all()
+            return [(row[0], float(row[1])) for row in rows]
+
+        match = self._fts5_query(query)
+        if not match:
+            return []
+        created_sql, params = self._created_filter("r.created_at", created_from, created_to)
+        rows = db.execute(
+            text(
+                f"SELECT r.id, -bm25(recordings_fts, {SQLITE_BM25_WEIGHTS}) AS score "
+                "FROM recordings_fts JOIN recordings r ON r.id = recordings_fts.rowid "
+                f"WHERE recordings_fts MATCH :match AND r.processing_status = 'completed'{created_sql} "
+                "ORDER BY score DESC, r.created_at DESC LIMIT :limit"
+            ),
+            {"match": match, "limit": limit, **params}
+        ).all()
+        return [(row[0], max(0.0, row[1]) / (max(0.0, row[1]) + 1)) for row in rows]
+
+    def best_chunks(self, db: Session, query: str, recording_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Find the best matching transcript chunk of each recording
+
+        Recordings that matched only on filename or summary fall back to their
+        first chunk without highlights.
+
+        Args:
+            db: Database session
+            query: Free-text search query
+            recording_ids: Recordings to pick chunks for
+
+        Returns:
+            Dict of recording_id -> chunk with `text`, `highlights` (character
+            ranges within `text`), offsets and times
+        """
+        if not recording_ids:
+            return {}
+
+        rows = []
+        if self._available and is_postgresql:
+            rows = db.execute(
+                text(
+                    "WITH q AS (SELECT websearch_to_tsquery('english', :query) AS q), best AS ("
+                    "SELECT DISTINCT ON (c.recording_id) c.id FROM transcript_chunks c, q "
+                    "WHERE c.recording_id IN :ids AND c.search_vector @@ q.q "
+                    "ORDER BY c.recording_id, ts_rank_cd(c.search_vector, q.q) DESC, c.chunk_index) "
+                    "SELECT c.id, c.recording_id, c.chunk_index, c.start_time, c.end_time, c.char_start, c.char_end, "
+                    "ts_headline('english', c.text, q.q, :options) "
+                    "FROM best JOIN transcript_chunks c ON c.id = best.id, q"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {
+                    "query": query,
+                    "ids": recording_ids,
+                    "options": (
+                        f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", '
+                        f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1"
+                    )
+                }
+            ).all()
+        elif self._available:
+            match = self._fts5_query(query)
+            if match:
+                rows = db.execute(
+                    text(
+                        # FTS5 auxiliary functions cannot run inside a window, so
+                        # scores and snippets are computed in an inner query first
+                        "SELECT id, recording_id, chunk_index, start_time, end_time, char_start, char_end, highlight "
+                        "FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY recording_id "
+                        "ORDER BY score, chunk_index) AS position "
+                        "FROM (SELECT c.id, c.recording_id, c.chunk_index, c.start_time, c.end_time, "
+                        "c.char_start, c.char_end, bm25(transcript_chunks_fts) AS score, "
+                        f"snippet(transcript_chunks_fts, 0, char(2), char(3), '…', {SNIPPET_WORDS}) AS highlight "
+                        "FROM transcript_chunks_fts JOIN transcript_chunks c ON c.id = transcript_chunks_fts.rowid "
+                        "WHERE transcript_chunks_fts MATCH :match AND c.recording_id IN :ids)) "
+                        "WHERE position = 1"
+                    ).bindparams(bindparam("ids", expanding=True)),
+                    {"match": match, "ids": recording_ids}
+                ).all()
+
+        chunks = {row[1]: self._chunk_hit(row) for row in rows}
+
+        missing = [recording_id for recording_id in recording_ids if recording_id not in chunks]
+        if missing:
+            first_rows = db.execute(
+                text(
+                    "SELECT id, recording_id, chunk_index, start_time, end_time, char_start, char_end, "
+                    f"substr(text, 1, {SNIPPET_WORDS * 6}) "
+                    "FROM transcript_chunks WHERE chunk_index = 0 AND recording_id IN :ids"
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"ids": missing}
+            ).all()
+            chunks.update({row[1]: self._chunk_hit(row) for row in first_rows})
+        return chunks
+
+    def search_speaker_turns(
+        self,
+        db: Session,
+        query: str,
+        speaker: str,
+        limit: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Rank completed recordings by what one speaker said
+
+        Only the speaker's turns are read: PostgreSQL filters through the
+        (speaker, recording_id) index, SQLite through the speaker column of the
+        turn FTS5 table. Each recording is represented by its best turn.
+
+        Args:
+            db: Database session
+            query: Free-text search query
+            speaker: Speaker label as it appears in the diarized transcript, e.g. "B"
+            limit: Maximum number of results
+            created_from: Only recordings created at or after this time
+            created_to: Only recordings created before this time
+
+        Returns:
+            List of (recording_id, relevance, turn) tuples, best first, where
+            turn has `turn_id`, `speaker`, `text`, `highlights` and times
+        """
+        # Filtered before the limit, so older matches cannot fill it
+        created_sql, params = self._created_filter("r.created_at", created_from, created_to)
+        if self._available and is_postgresql:
+            rows = db.execute(
+                text(
+                    "WITH q AS (SELECT websearch_to_tsquery('english', :query) AS q), best AS ("
+                    "SELECT DISTINCT ON (t.recording_id) t.id, t.recording_id, "
+                    "ts_rank_cd(t.search_vector, q.q, 32) AS rank "
+                    "FROM speaker_turns t JOIN recordings r ON r.id = t.recording_id, q "
+                    "WHERE t.speaker = :speaker AND t.search_vector @@ q.q AND r.processing_status = 'completed'"
+                    f"{created_sql} ORDER BY t.recording_id, rank DESC, t.turn_index) "
+                    "SELECT t.id, t.recording_id, t.turn_index, t.start_time, t.end_time, t.speaker, "
+                    "ts_headline('english', t.text, q.q, :options), best.rank "
+                    "FROM best JOIN speaker_turns t ON t.id = best.id, q "
+                    "ORDER BY best.rank DESC LIMIT :limit"
+                ),
+                {
+                    "query": query,
+                    "speaker": speaker,
+                    "limit": limit,
+                    "options": (
+                        f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}", '
+                        f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=1"
+                    ),
+                    **params
+                }
+            ).all()
+            return [(row[1], float(row[7]), self._turn_hit(row)) for row in rows]
+
+        if self._available:
+            match = self._fts5_query(query)
+            speaker_match = self._fts5_query(speaker)
+            if not match or not speaker_match:
+                return []
+            rows = db.execute(
+                text(
+                    "SELECT id, recording_id, turn_index, start_time, end_time, speaker, highlight, score "
+                    "FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY recording_id "
+                    "ORDER BY score DESC, turn_index) AS position "
+                    "FROM (SELECT t.id, t.recording_id, t.turn_index, t.start_time, t.end_time, t.speaker, "
+                    "-bm25(speaker_turns_fts) AS score, "
+                    f"snippet(speaker_turns_fts, 1, char(2), char(3), '…', {SNIPPET_WORDS}) AS highlight "
+                    "FROM speaker_turns_fts JOIN speaker_turns t ON t.id = speaker_turns_fts.rowid "
+                    "JOIN recordings r ON r.id = t.recording_id "
+                    "WHERE speaker_turns_fts MATCH :match AND t.speaker = :speaker "
+                    f"AND r.processing_status = 'completed'{created_sql})) "
+                    "WHERE position = 1 ORDER BY score DESC LIMIT :limit"
+                ),
+                {
+                    "match": f"speaker : ({speaker_match}) AND text : ({match})",
+                    "speaker": speaker,
+                    "limit": limit,
+                    **params
+                }
+            ).all()
+            return [(row[1], max(0.0, row[7]) / (max(0.0, row[7]) + 1), self._turn_hit(row)) for row in rows]
+
+        logger.warning("⚠️  Full-text index unavailable - falling back to substring search")
+        rows = db.execute(
+            text(
+                "SELECT t.id, t.recording_id, t.turn_index, t.start_time, t.end_time, t.speaker, t.text "
+                "FROM speaker_turns t JOIN recordings r ON r.id = t.recording_id "
+                "WHERE t.speaker = :speaker AND lower(t.text) LIKE :term AND r.processing_status = 'completed'"
+                f"{created_sql} ORDER BY r.created_at DESC, t.turn_index"
+            ),
+            {"speaker": speaker, "term": f"%{query.lower()}%", **params}
+        ).all()
+        best: Dict[int, Tuple[int, float, Dict[str, Any]]] = {}
+        for row in rows:
+            if row[1] not in best:
+                best[row[1]] = (row[1], 0.5, self._turn_hit(row))
+        return list(best.values())[:limit]
+
+    def _turn_hit(self, row: Any) -> Dict[str, Any]:
+        snippet, highlights = self._parse_highlights(row[6] or "")
+        return {
+            "turn_id": row[0],
+            "turn_index": row[2],
+            "start_time": row[3],
+            "end_time": row[4],
+            "speaker": row[5],
+            "text": snippet,
+            "highlights": highlights
+        }
+
+    def _chunk_hit(self, row: Any) -> Dict[str, Any]:
+        snippet, highlights = self._parse_highlights(row[7] or "")
+        return {
+            "chunk_id": row[0],
+            "chunk_index": row[2],
+            "start_time": row[3],
+            "end_time": row[4],
+            "char_start": row[5],
+            "char_end": row[6],
+            "text": snippet,
+            "highlights": highlights
+        }
+
+    def _parse_highlights(self, snippet: str) -> Tuple[str, List[Dict[str, int]]]:
+        """Strip highlight delimiters, returning the plain text and highlighted ranges"""
+        plain: List[str] = []
+        highlights = []
+        length = 0
+        start = None
+        for part in re.split(f"([{HIGHLIGHT_START}{HIGHLIGHT_END}])", snippet):
+            if part == HIGHLIGHT_START:
+                start = length
+            elif part == HIGHLIGHT_END:
+                if start is not None and length > start:
+                    highlights.append({"start": start, "end": length})
+                start = None
+            else:
+                plain.append(part)
+                length += len(part)
+        return "".join(plain), highlights
+
+    def backfill(self) -> None:
+        """
+        Index recordings, transcript chunks and speaker turns stored before their
+        index existed. Scans every recording, so it runs in a worker rather than
+        at API startup
+        """
+        if not self._available:
+            return
+        self._backfill_recordings()
+        self._backfill_chunks()
+        self._backfill_turns()
+
+    def _backfill_recordings(self, batch_size: int = 200) -> None:
+        """Add recordings missing from the full-text index"""
+        if is_postgresql:
+            missing_sql = "search_vector IS NULL"
+        else:
+            missing_sql = "NOT EXISTS (SELECT 1 FROM recordings_fts f WHERE f.rowid = r.id)"
+        db = SessionLocal()
+        try:
+            total = 0
+            last_id = 0
+            while True:
+                recording_ids = db.execute(
+                    text(f"SELECT id FROM recordings r WHERE id > :last_id AND {missing_sql} ORDER BY id LIMIT :limit"),
+                    {"last_id": last_id, "limit": batch_size}
+                ).scalars().all()
+                if not recording_ids:
+                    break
+                for recording_id in recording_ids:
+                    self.index_recording(db, recording_id)
+                db.commit()
+                total += len(recording_ids)
+                last_id = recording_ids[-1]
+            if total:
+                logger.info(f"🔎 Backfilled the full-text index for {total} recordings")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to backfill the full-text index: {e}")
+        finally:
+            db.close()
+
+    def _backfill_chunks(self, batch_size: int = 50) -> None:
+        """Chunk transcripts of recordings stored before transcript chunks existed"""
+        db = SessionLocal()
+        try:
+            total = 0
+            last_id = 0
+            while True:
+                rows = db.execute(
+                    text(
+                        "SELECT id, transcript, duration FROM recordings r "
+                        "WHERE id > :last_id AND coalesce(transcript, '') <> '' AND NOT EXISTS "
+                        "(SELECT 1 FROM transcript_chunks c WHERE c.recording_id = r.id) "
+                        "ORDER BY id LIMIT :limit"
+                    ),
+                    {"last_id": last_id, "limit": batch_size}
+                ).all()
+                if not rows:
+                    break
+                for recording_id, transcript, duration in rows:
+                    chunk_service.replace_chunks(db, recording_id, transcript, duration=duration)
+                db.commit()
+                total += len(rows)
+                last_id = rows[-1][0]
+            if total:
+                logger.info(f"🧩 Backfilled transcript chunks for {total} recordings")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to backfill transcript chunks: {e}")
+        finally:
+            db.close()
+
+    def _backfill_turns(self, batch_size: int = 50) -> None:
+        """Split diarized transcripts of recordings stored before speaker turns existed"""
+        db = SessionLocal()
+        try:
+            total = 0
+            last_id = 0
+            while True:
+                rows = db.execute(
+                    text(
+                        "SELECT id, transcript_with_speakers, duration FROM recordings r "
+                        "WHERE id > :last_id AND transcript_with_speakers LIKE '%[Speaker %' AND NOT EXISTS "
+                        "(SELECT 1 FROM speaker_turns t WHERE t.recording_id = r.id) "
+                        "ORDER BY id LIMIT :limit"
+                    ),
+                    {"last_id": last_id, "limit": batch_size}
+                ).all()
+                if not rows:
+                    break
+                for recording_id, transcript_with_speakers, duration in rows:
+                    speaker_turn_service.replace_turns(db, recording_id, transcript_with_speakers, duration=duration)
+                db.commit()
+                total += len(rows)
+                last_id = rows[-1][0]
+            if total:
+                logger.info(f"🗣️  Backfilled speaker turns for {total} recordings")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to backfill speaker turns: {e}")
+        finally:
+            db.close()
+
+    def _fts5_query(self, query: str) -> Optional[str]:
+        """Quote each term so user input cannot inject FTS5 query syntax"""
+        terms = TERM_PATTERN.findall(query)
+        return " ".join(f'"{term}"' for term in terms) or None
+
+    def _search_substring(
+        self,
+        db: Session,
+        query: str,
+        limit: int,
+        created_sql: str = "",
+        params: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[int, float]]:
+        logger.warning("⚠️  Full-text index unavailable - falling back to substring search")
+        rows = db.execute(
+            text(
+                "SELECT id FROM recordings WHERE processing_status = 'completed' AND ("
+                "lower(original_filename) LIKE :term OR lower(summary) LIKE :term OR "
+                f"lower(coalesce(transcript_with_speakers, transcript, '')) LIKE :term){created_sql} "
+                "ORDER BY created_at DESC LIMIT :limit"
+            ),
+            {"term": f"%{query.lower()}%", "limit": limit, **(params or {})}
+        ).all()
+        return [(row[0], 0.5) for row in rows]
+
+    def _created_filter(
+        self,
+        column: str,
+        created_from: Optional[datetime],
+        created_to: Optional[datetime]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """SQL conditions and parameters for a creation time range"""
+        sql, params = "", {}
+        if created_from:
+            sql += f" AND {column} >= :created_from"
+            params["created_from"] = created_from
+        if created_to:
+            sql += f" AND {column} < :created_to"
+            params["created_to"] = created_to
+        return sql, params
+
+
+# Global search service instance
+search_service = SearchService()
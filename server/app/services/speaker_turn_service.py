@@ -0,0 +1,111 @@
+import bisect
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.speaker_turn import SpeakerTurn
+
+logger = logging.getLogger(__name__)
+
+# Diarized transcripts prefix every turn with "[Speaker X]: "
+SPEAKER_TAG_PATTERN = re.compile(r"\[Speaker ([^\]]+)\]:\s*")
+
+
+class SpeakerTurnService:
+    """Persists diarized speaker turns so speaker-scoped search can use an index"""
+
+    def build_turns(
+        self,
+        transcript_with_speakers: Optional[str],
+        segments: Optional[List[Dict[str, Any]]] = None,
+        duration: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a diarized transcript into speaker turns
+
+        Turn times come from the Whisper segments: each segment's words are
+        spread evenly over its time span and a turn takes the times of its
+        first and last word. Without segments, times are interpolated from the
+        word position over the recording's duration.
+
+        Args:
+            transcript_with_speakers: Transcript with "[Speaker X]: " prefixes
+            segments: Whisper segments with `start`, `end` and `text`
+            duration: Recording duration in seconds
+
+        Returns:
+            List of turn dicts with turn_index, speaker, text and times
+        """
+        if not transcript_with_speakers:
+            return []
+        parts = SPEAKER_TAG_PATTERN.split(transcript_with_speakers)
+        # parts = [preamble, speaker, text, speaker, text, ...]
+        if len(parts) < 3:
+            return []
+
+        total_words = sum(len(part.split()) for part in parts[0::2])
+        word_time = self._word_timeline(segments, duration, total_words)
+        turns: List[Dict[str, Any]] = []
+        word_cursor = len(parts[0].split())
+        for speaker, turn_text in zip(parts[1::2], parts[2::2]):
+            turn_text = turn_text.strip()
+            word_count = len(turn_text.split())
+            if word_count:
+                turns.append({
+                    "turn_index": len(turns),
+                    "speaker": speaker.strip(),
+                    "text": turn_text,
+                    "start_time": word_time(word_cursor),
+                    "end_time": word_time(word_cursor + word_count)
+                })
+            word_cursor += word_count
+        return turns
+
+    def replace_turns(
+        self,
+        db: Session,
+        recording_id: int,
+        transcript_with_speakers: Optional[str],
+        segments: Optional[List[Dict[str, Any]]] = None,
+        duration: Optional[float] = None
+    ) -> int:
+        """Replace a recording's speaker turns within the caller's transaction"""
+        self.remove_turns(db, recording_id)
+        turns = self.build_turns(transcript_with_speakers, segments, duration)
+        db.add_all(SpeakerTurn(recording_id=recording_id, **turn) for turn in turns)
+        db.flush()
+        logger.debug(f"🗣️  Stored {len(turns)} speaker turns for recording {recording_id}")
+        return len(turns)
+
+    def remove_turns(self, db: Session, recording_id: int) -> None:
+        db.query(SpeakerTurn).filter(SpeakerTurn.recording_id == recording_id).delete(
+            synchronize_session=False
+        )
+
+    def _word_timeline(self, segments: Optional[List[Dict[str, Any]]], duration: Optional[float], total_words: int):
+        """Map a word position in the transcript to seconds, or None when no timing is known"""
+        starts: List[int] = []
+        spans = []
+        position = 0
+        for segment in segments or []:
+            count = len(str(segment.get("text") or "").split())
+            if count and segment.get("start") is not None and segment.get("end") is not None:
+                starts.append(position)
+                spans.append((position, count, segment["start"], segment["end"]))
+            position += count
+
+        if spans:
+            def word_time(word: int) -> float:
+                first, count, start, end = spans[max(0, bisect.bisect_right(starts, word) - 1)]
+                return start + (end - start) * min(1.0, max(0.0, (word - first) / count))
+            return word_time
+
+        if duration and total_words:
+            return lambda word: duration * min(1.0, word / total_words)
+        return lambda word: None
+
+
+# Global speaker turn service instance
+speaker_turn_service = SpeakerTurnService()
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+RECORDING_STATUS_CHANNEL = "recording_status"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "deleted"})
+SUBSCRIBER_QUEUE_SIZE = 256  # Events a slow client may fall behind by before it is dropped
+_CLOSED = object()  # Queued to end a subscription
+
+
+class _Subscriber:
+    __slots__ = ("loop", "queue", "recording_ids")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, recording_ids: Optional[Set[int]]):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.recording_ids = recording_ids  # None follows every recording
+
+
+class StatusStreamService:
+    """
+    Fan-out of recording processing status changes to streaming clients
+
+    Status changes are published on the "recording_status" channel by
+    whichever process makes them, API or worker. Each API process listens
+    once and hands every event to the queues of its connected clients that
+    follow that recording, so a change reaches open pages as it happens and
+    nothing has to poll. Without Redis, tasks run inside the API process and
+    events are delivered locally.
+    """
+
+    def __init__(self):
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        """Listen for status changes from every process"""
+        if self._started:
+            return
+        self._started = True
+        pubsub_service.subscribe(RECORDING_STATUS_CHANNEL, self._deliver)
+
+    def publish(
+        self,
+        recording_id: int,
+        status: str,
+        error: Optional[str] = None,
+        updated_at: Optional[datetime] = None,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Announce a recording's new processing status
+
+        Args:
+            recording_id: Recording ID
+            status: New processing status, or "deleted"
+            error: Processing error, if any
+            updated_at: When the change was made
+            fields: Listing fields that changed with the status, so clients need not fetch the recording
+        """
+        event = {
+            **(fields or {}),
+            "recording_id": recording_id,
+            "processing_status": status,
+            "processing_error": error,
+            "updated_at": (updated_at or datetime.utcnow()).isoformat()
+        }
+        if not pubsub_service.publish(RECORDING_STATUS_CHANNEL, event):
+            # Without Redis only this process can be told
+            self._deliver(event)
+
+    def subscribe(self, recording_ids: Optional[Set[int]] = None) -> _Subscriber:
+        """
+        Follow status changes from now on; call from the client's event loop
+
+        Args:
+            recording_ids: Recordings to follow, or None for all
+
+        Returns:
+            Subscription to read with `events` and pass to `unsubscribe` when the client goes away
+        """
+        subscriber = _Subscriber(asyncio.get_running_loop(), recording_ids)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    async def events(
+        self,
+        subscriber: _Subscriber,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Status events of a subscription as they arrive
+
+        Yields None after `heartbeat` seconds without an event, so idle
+        connections can be kept open. Ends if the client fell too far behind.
+        """
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event is _CLOSED:
+                return
+            yield event
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _deliver(self, data: Any) -> None:
+        # Runs on the pub/sub listener thread, or the publishing thread without Redis
+        if not isinstance(data, dict) or not isinstance(data.get("recording_id"), int):
+            return
+        with self._lock:
+            subscribers = [
+                subscriber for subscriber in self._subscribers
+                if subscriber.recording_ids is None or data["recording_id"] in subscriber.recording_ids
+            ]
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(self._enqueue, subscriber, data)
+            except RuntimeError:
+                # The client's event loop has closed
+                self.unsubscribe(subscriber)
+
+    def _enqueue(self, subscriber: _Subscriber, event: Dict[str, Any]) -> None:
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("⚠️  Status stream client fell behind - closing its stream")
+            self.unsubscribe(subscriber)
+            # Make room for the end marker; the client reconnects and resynchronizes
+            subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(_CLOSED)
+
+
+# Global status stream service instance
+status_stream_service = StatusStreamService()
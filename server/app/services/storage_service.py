@@ -72,7 +72,40 @@ class SupabaseStorageService:
         Raises:
             HTTPException: If upload fails
         """
-        logger.info(f"📤 Starting file upload: {filename} ({len(file_content)} bytes, {content_type})")
+        return self._upload(file_content, len(file_content), filename, content_type)
+    
+    def upload_file_from_path(
+        self,
+        file_path: str,
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload a file from local disk to Supabase Storage, streaming it from disk
+        
+        Args:
+            file_path: Path of the local file
+            filename: Original filename
+            content_type: MIME type of the file
+            
+        Returns:
+            Dict containing upload details
+            
+        Raises:
+            HTTPException: If upload fails
+        """
+        with open(file_path, "rb") as file_obj:
+            return self._upload(file_obj, os.path.getsize(file_path), filename, content_type)
+    
+    def _upload(
+        self,
+        file: Any,
+        file_size: int,
+        filename: str,
+        content_type: Optional[str]
+    ) -> Dict[str, Any]:
+        """Upload bytes or an open binary file and build the upload details"""
+        logger.info(f"📤 Starting file upload: {filename} ({file_size} bytes, {content_type})")
         
         try:
             # Generate unique storage path
@@ -83,7 +116,7 @@ class SupabaseStorageService:
             logger.info(f"☁️  Uploading to Supabase bucket: {settings.storage_bucket_name}")
             response = self.client.storage.from_(settings.storage_bucket_name).upload(
                 path=storage_path,
-                file=file_content,
+                file=file,
                 file_options={
                     "content-type": content_type or 'application/octet-stream',
                     "cache-control": "3600",
@@ -106,7 +139,7 @@ class SupabaseStorageService:
                 'original_filename': filename,
                 'storage_path': storage_path,
                 'public_url': public_url,
-                'file_size': len(file_content),
+                'file_size': file_size,
                 'content_type': content_type,
                 'upload_timestamp': datetime.now().isoformat()
             }
@@ -0,0 +1,283 @@
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.database import engine, is_postgresql, SessionLocal
+from app.models.recording import Recording
+from app.services.pubsub_service import pubsub_service
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)  # pg_trgm splits on anything non-alphanumeric
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s")
+TITLE_MAX_CHARS = 80
+
+POSTGRES_TRGM_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_recordings_original_filename_trgm "
+    "ON recordings USING GIN (original_filename gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_recordings_title_trgm ON recordings USING GIN (title gin_trgm_ops)",
+]
+
+
+def trigrams(value: Optional[str]) -> Set[str]:
+    """Trigrams of each word padded like pg_trgm: two spaces before, one after"""
+    grams = set()
+    for word in WORD_PATTERN.findall((value or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def title_from_summary(summary: Optional[str]) -> Optional[str]:
+    """Short title from the summary's first sentence, cut at a word boundary"""
+    if not summary or not summary.strip():
+        return None
+    first = SENTENCE_END_PATTERN.split(summary.strip(), maxsplit=1)[0].strip().rstrip(".")
+    if len(first) > TITLE_MAX_CHARS:
+        first = first[:TITLE_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return first
+
+
+class _TitleIndex:
+    """One version of the in-process trigram index; a refresh builds the next instead of changing it"""
+    __slots__ = ("postings", "arrays", "docs")
+
+    def __init__(
+        self,
+        postings: Dict[str, Dict[str, FrozenSet[int]]],
+        arrays: Dict[Tuple[str, str], np.ndarray],
+        docs: Dict[int, Tuple[str, Optional[str], Set[str], Set[str]]]
+    ):
+        self.postings = postings  # Per field: trigram -> recording IDs
+        self.arrays = arrays  # Posting arrays built for scoring, filled in by lookups
+        self.docs = docs
+
+
+class TitleSearchService:
+    """
+    Fuzzy typeahead lookup of recordings by filename and summary title
+
+    PostgreSQL uses pg_trgm GIN indexes with word similarity, so partial and
+    misspelled input still matches. Elsewhere (or without the extension) an
+    in-process trigram index answers the same queries; it is refreshed
+    incrementally from `updated_at` whenever the shared "recording_titles"
+    version is bumped by a write in any process. A refresh copies what it
+    changes and publishes the new index by reference, so lookups read one
+    consistent version without locking.
+    """
+
+    def __init__(self):
+        self._version = pubsub_service.version_counter("recording_titles")
+        self._use_pg_trgm = False
+        self._index = _TitleIndex({"filename": {}, "title": {}}, {}, {})
+        self._watermark: Optional[datetime] = None
+        self._loaded_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_index(self) -> None:
+        """Create the trigram indexes and fill missing titles; safe to run on every startup"""
+        self._backfill_titles()
+        if not is_postgresql:
+            return
+        try:
+            with engine.begin() as conn:
+                for statement in POSTGRES_TRGM_SQL:
+                    conn.execute(text(statement))
+            self._use_pg_trgm = True
+            logger.info("✅ Trigram title index ready (pg_trgm)")
+        except Exception as e:
+            logger.warning(f"⚠️  pg_trgm unavailable - using the in-process trigram index: {e}")
+
+    def invalidate(self) -> None:
+        """Signal every process that recording titles changed"""
+        self._version.bump()
+
+    def lookup(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find recordings whose filename or title fuzzily matches the query
+
+        Blocks on the database, so async callers run it in the threadpool.
+
+        Args:
+            query: Partial or misspelled name
+            limit: Maximum number of results
+
+        Returns:
+            List of dicts with recording_id, original_filename, title and
+            score (share of the query's trigrams found in the best field), best first
+        """
+        threshold = settings.title_search_min_similarity
+        if self._use_pg_trgm:
+            # word_similarity scores the best matching extent of the field, which suits typeahead prefixes
+            db = SessionLocal()
+            try:
+                db.execute(
+                    text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                    {"threshold": str(threshold)}
+                )
+                rows = db.execute(
+                    text(
+                        "SELECT id, original_filename, title, greatest("
+                        "word_similarity(:query, original_filename), "
+                        "word_similarity(:query, coalesce(title, ''))) AS score "
+                        "FROM recordings WHERE :query <% original_filename OR :query <% title "
+                        "ORDER BY score DESC, length(original_filename) LIMIT :limit"
+                    ),
+                    {"query": query, "limit": limit}
+                ).all()
+            finally:
+                db.close()
+            return [self._result(row[0], row[1], row[2], float(row[3])) for row in rows]
+
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        self._refresh()
+        index = self._index
+
+        # Count the query trigrams each recording shares per field; the score
+        # is the better field's share of the query's trigrams
+        field_ids = [
+            np.concatenate([self._posting_array(index, field, gram) for gram in query_grams])
+            for field in ("filename", "title")
+        ]
+        size = max((int(ids.max()) + 1 for ids in field_ids if ids.size), default=0)
+        best = np.maximum(*(np.bincount(ids, minlength=size) for ids in field_ids))
+        scores = best / len(query_grams)
+
+        matched = np.flatnonzero(scores >= threshold)
+        if matched.size > limit * 4:
+            matched = matched[np.argpartition(-scores[matched], limit * 4)[:limit * 4]]
+        ranked = sorted(
+            (-float(scores[recording_id]), len(index.docs[recording_id][0]), int(recording_id))
+            for recording_id in matched if int(recording_id) in index.docs
+        )
+        results = []
+        for negative_score, _, recording_id in ranked[:limit]:
+            filename, title, _, _ = index.docs[recording_id]
+            results.append(self._result(recording_id, filename, title, -negative_score))
+        return results
+
+    def _posting_array(self, index: _TitleIndex, field: str, gram: str) -> np.ndarray:
+        array = index.arrays.get((field, gram))
+        if array is None:
+            array = np.fromiter(index.postings[field].get(gram, ()), dtype=np.int64)
+            index.arrays[(field, gram)] = array
+        return array
+
+    def _refresh(self) -> None:
+        """Bring the in-process index up to date with the shared version"""
+        version = self._version.current()
+        if self._loaded_version == version:
+            return
+
+        with self._lock:
+            if self._loaded_version == version:
+                return
+            db = SessionLocal()
+            try:
+                query = db.query(Recording.id, Recording.original_filename, Recording.title, Recording.updated_at)
+                if self._watermark is not None:
+                    query = query.filter(Recording.updated_at >= self._watermark)
+                changed = query.all()
+                live = {row[0] for row in db.query(Recording.id).all()} if self._index.docs else None
+            finally:
+                db.close()
+
+            # Lookups keep reading the current index, so only copies are changed
+            current = self._index
+            docs = dict(current.docs)
+            postings = {field: dict(grams) for field, grams in current.postings.items()}
+            touched: Dict[Tuple[str, str], Set[int]] = {}
+            removed = [recording_id for recording_id in docs if recording_id not in live] if live is not None else []
+            for recording_id in removed:
+                self._remove(docs, touched, postings, recording_id)
+            for recording_id, filename, title, updated_at in changed:
+                self._remove(docs, touched, postings, recording_id)
+                filename_grams, title_grams = trigrams(filename), trigrams(title)
+                docs[recording_id] = (filename, title, filename_grams, title_grams)
+                for field, grams in (("filename", filename_grams), ("title", title_grams)):
+                    for gram in grams:
+                        self._touch(touched, postings, field, gram).add(recording_id)
+                if updated_at and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+
+            for (field, gram), ids in touched.items():
+                if ids:
+                    postings[field][gram] = frozenset(ids)
+                else:
+                    postings[field].pop(gram, None)
+            arrays = {key: array for key, array in current.arrays.items() if key not in touched}
+            self._index = _TitleIndex(postings, arrays, docs)
+
+            # Record the version read before loading so a bump during the
+            # load triggers another refresh instead of being lost
+            self._loaded_version = version
+            logger.debug(f"🔤 Title index refreshed ({len(changed)} changed, {len(docs)} recordings)")
+
+    def _remove(
+        self,
+        docs: Dict[int, Tuple[str, Optional[str], Set[str], Set[str]]],
+        touched: Dict[Tuple[str, str], Set[int]],
+        postings: Dict[str, Dict[str, FrozenSet[int]]],
+        recording_id: int
+    ) -> None:
+        doc = docs.pop(recording_id, None)
+        if doc is None:
+            return
+        for field, grams in (("filename", doc[2]), ("title", doc[3])):
+            for gram in grams:
+                self._touch(touched, postings, field, gram).discard(recording_id)
+
+    def _touch(
+        self,
+        touched: Dict[Tuple[str, str], Set[int]],
+        postings: Dict[str, Dict[str, FrozenSet[int]]],
+        field: str,
+        gram: str
+    ) -> Set[int]:
+        """Mutable copy of a posting set, made once per refresh"""
+        ids = touched.get((field, gram))
+        if ids is None:
+            ids = touched[(field, gram)] = set(postings[field].get(gram, ()))
+        return ids
+
+    def _backfill_titles(self, batch_size: int = 200) -> None:
+        """Derive titles for recordings summarized before titles existed"""
+        db = SessionLocal()
+        try:
+            total = 0
+            last_id = 0
+            while True:
+                recordings = db.query(Recording).filter(
+                    Recording.id > last_id, Recording.title.is_(None), Recording.summary.isnot(None)
+                ).order_by(Recording.id).limit(batch_size).all()
+                if not recordings:
+                    break
+                for recording in recordings:
+                    recording.title = title_from_summary(recording.summary)
+                db.commit()
+                total += len(recordings)
+                last_id = recordings[-1].id
+            if total:
+                logger.info(f"🔤 Backfilled titles for {total} recordings")
+                self.invalidate()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to backfill recording titles: {e}")
+        finally:
+            db.close()
+
+    def _result(self, recording_id: int, filename: str, title: Optional[str], score: float) -> Dict[str, Any]:
+        return {"recording_id": recording_id, "original_filename": filename, "title": title, "score": score}
+
+
+# Global title search service instance
+title_search_service = TitleSearchService()
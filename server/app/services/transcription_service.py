@@ -2,7 +2,7 @@ import os
 import tempfile
 import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from openai import OpenAI
 import json
 
@@ -84,6 +84,7 @@ class TranscriptionService:
             "transcript": "",
             "transcript_with_speakers": "",
             "duration": None,
+            "segments": [],
             "error": None
         }
         
@@ -99,12 +100,12 @@ class TranscriptionService:
                 logger.info("🤖 Starting OpenAI Whisper transcription...")
                 with open(temp_file_path, "rb") as audio_file:
                     try:
-                        # Try with word-level timestamps (newer API)
+                        # Try with word- and segment-level timestamps (newer API)
                         transcript_response = self.openai_client.audio.transcriptions.create(
                             model="whisper-1",
                             file=audio_file,
                             response_format="verbose_json",
-                            timestamp_granularities=["word"]
+                            timestamp_granularities=["word", "segment"]
                         )
                     except Exception as e:
                         logger.warning(f"⚠️  Word-level timestamps not supported, falling back to basic transcription: {e}")
@@ -117,6 +118,7 @@ class TranscriptionService:
                 
                 result["transcript"] = transcript_response.text
                 result["duration"] = transcript_response.duration
+                result["segments"] = self._extract_segments(transcript_response)
                 
                 logger.info(f"✅ Whisper transcription completed. Duration: {result['duration']}s")
                 logger.debug(f"📝 Transcript length: {len(result['transcript'])} characters")
@@ -137,6 +139,17 @@ class TranscriptionService:
         logger.info("🎯 Transcription process completed")
         return result
     
+    def _extract_segments(self, whisper_response) -> List[Dict[str, Any]]:
+        """Time-anchored segments from a verbose Whisper response, used to chunk the transcript"""
+        segments = []
+        for segment in getattr(whisper_response, 'segments', None) or []:
+            if isinstance(segment, dict):
+                start, end, text = segment.get('start'), segment.get('end'), segment.get('text')
+            else:
+                start, end, text = segment.start, segment.end, segment.text
+            segments.append({'start': start, 'end': end, 'text': text})
+        return segments
+    
     async def _add_speaker_diarization(self, audio_file_path: str, whisper_response) -> str:
         """
         Add speaker diarization to the Whisper transcript
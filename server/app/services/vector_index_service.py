@@ -0,0 +1,415 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.recording import Recording
+from app.models.transcript_chunk import TranscriptChunk
+from app.services.embedding_service import embedding_service
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+LOCK_FILE = "index.lock"
+CENTROIDS_FILE = "centroids.npy"
+
+# Row-aligned arrays, each a raw memory-mapped file. Vectors are int8 with one
+# float32 scale per row, a quarter of the size of float32 storage.
+ARRAYS = {
+    "vectors": np.int8,
+    "scales": np.float32,
+    "chunk_ids": np.int64,
+    "recording_ids": np.int64,
+    "created": np.int64,  # Creation time of the row's recording, epoch seconds
+    "lists": np.int32,  # IVF list of each row
+    "alive": np.uint8,  # 0 once the row's recording is deleted or re-indexed
+}
+
+INITIAL_CAPACITY = 1024
+KMEANS_SAMPLE = 50_000
+KMEANS_ITERATIONS = 10
+BATCH_ROWS = 2048
+
+
+@dataclass
+class _Snapshot:
+    """Read-only view of the index as of one meta.json version"""
+    mtime_ns: int
+    count: int
+    arrays: Dict[str, np.ndarray]
+    centroids: Optional[np.ndarray]
+    list_rows: Optional[List[np.ndarray]]  # Row indices per IVF list
+
+
+def _quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+
+class VectorIndexService:
+    """
+    On-disk approximate nearest-neighbor index over transcript chunk embeddings
+
+    Rows are appended to memory-mapped files as recordings complete. Below
+    `vector_index_train_threshold` live rows queries scan every row; above it
+    an IVF index (spherical k-means centroids) restricts the scan to the
+    `vector_index_nprobe` closest lists. Rows carry their recording's creation
+    time, so a date range is applied within the scan. Writers serialize on a file lock so
+    the API and worker processes can share the directory; readers reopen the
+    files whenever meta.json changes.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    def index_recording(self, recording_id: int) -> int:
+        """
+        Embed a recording's transcript chunks and add them to the index
+
+        Rows from an earlier indexing of the same recording are retired.
+
+        Returns:
+            Number of chunks indexed
+        """
+        db = SessionLocal()
+        try:
+            created_at = db.query(Recording.created_at).filter(Recording.id == recording_id).scalar()
+            chunks = db.query(TranscriptChunk.id, TranscriptChunk.text).filter(
+                TranscriptChunk.recording_id == recording_id
+            ).order_by(TranscriptChunk.chunk_index).all()
+        finally:
+            db.close()
+
+        if not chunks:
+            self.remove_recording(recording_id)
+            return 0
+
+        embeddings = embedding_service.embed_documents([text for _, text in chunks])
+        chunk_ids = np.array([chunk_id for chunk_id, _ in chunks], dtype=np.int64)
+
+        with self._write_lock():
+            meta = self._read_meta()
+            if meta and (meta["model"] != settings.embedding_model or meta["dim"] != embeddings.shape[1]):
+                logger.warning("⚠️  Embedding model changed - rebuilding the vector index from scratch")
+                self._reset()
+                meta = None
+            if meta is None:
+                meta = {
+                    "model": settings.embedding_model,
+                    "dim": int(embeddings.shape[1]),
+                    "count": 0,
+                    "live": 0,
+                    "capacity": 0,
+                    "nlist": 0,
+                    "trained_live": 0,
+                    "created_times": True
+                }
+            self._add_created_times(meta)
+
+            self._retire(meta, recording_id)
+
+            start, end = meta["count"], meta["count"] + len(chunks)
+            if end > meta["capacity"]:
+                self._grow(meta, end)
+            arrays = self._open_arrays(meta, "r+")
+
+            quantized, scales = _quantize(embeddings)
+            arrays["vectors"][start:end] = quantized
+            arrays["scales"][start:end] = scales
+            arrays["chunk_ids"][start:end] = chunk_ids
+            arrays["recording_ids"][start:end] = recording_id
+            arrays["created"][start:end] = self._epoch(created_at or datetime.utcnow())
+            arrays["alive"][start:end] = 1
+            centroids = self._load_centroids() if meta["nlist"] else None
+            arrays["lists"][start:end] = self._assign(embeddings, centroids) if centroids is not None else 0
+            for array in arrays.values():
+                array.flush()
+
+            meta["count"] = end
+            meta["live"] += len(chunks)
+            if self._needs_training(meta):
+                self._train(meta, arrays)
+            self._write_meta(meta)
+
+        logger.info(f"🧭 Indexed {len(chunks)} chunk embeddings for recording {recording_id}")
+        return len(chunks)
+
+    def remove_recording(self, recording_id: int) -> None:
+        """Retire a recording's rows from the index"""
+        with self._write_lock():
+            meta = self._read_meta()
+            if meta and self._retire(meta, recording_id):
+                self._write_meta(meta)
+
+    def ensure_created_times(self) -> None:
+        """Record creation times in an index built before they were stored; safe to run on every worker start"""
+        with self._write_lock():
+            meta = self._read_meta()
+            if meta and self._add_created_times(meta):
+                self._write_meta(meta)
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        limit: int,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Find the chunks closest to a query embedding
+
+        Args:
+            query_vector: Unit-length query embedding
+            limit: Maximum number of chunks
+            created_from: Only recordings created at or after this time (UTC)
+            created_to: Only recordings created before this time (UTC)
+
+        Returns:
+            List of (chunk_id, recording_id, cosine similarity), best first
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is None or snapshot.count == 0:
+            return []
+
+        if snapshot.list_rows is not None:
+            probes = np.argsort(-(snapshot.centroids @ query_vector))[:settings.vector_index_nprobe]
+            rows = np.concatenate([snapshot.list_rows[probe] for probe in probes])
+        else:
+            rows = np.arange(snapshot.count)
+        if rows.size == 0:
+            return []
+
+        arrays = snapshot.arrays
+        keep = arrays["alive"][rows] == 1
+        # Rows outside the range are dropped before ranking, so they cannot crowd out the limit
+        if "created" in arrays:
+            if created_from is not None:
+                keep &= arrays["created"][rows] >= self._epoch(created_from)
+            if created_to is not None:
+                keep &= arrays["created"][rows] < self._epoch(created_to)
+        rows = rows[keep]
+        scores = np.empty(rows.size, dtype=np.float32)
+        for offset in range(0, rows.size, BATCH_ROWS * 8):
+            batch = rows[offset:offset + BATCH_ROWS * 8]
+            scores[offset:offset + batch.size] = (
+                arrays["vectors"][batch].astype(np.float32) @ query_vector
+            ) * arrays["scales"][batch]
+
+        if rows.size > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(rows.size)
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(arrays["chunk_ids"][rows[i]]), int(arrays["recording_ids"][rows[i]]), float(scores[i]))
+            for i in top
+        ]
+
+    def get_missing_recordings(self, recording_ids: List[int]) -> List[int]:
+        """Recordings from the list that have no live rows in the index"""
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return list(recording_ids)
+        count = snapshot.count
+        live = snapshot.arrays["recording_ids"][:count][snapshot.arrays["alive"][:count] == 1]
+        indexed = set(np.unique(live).tolist())
+        return [recording_id for recording_id in recording_ids if recording_id not in indexed]
+
+    # Reading
+
+    def _get_snapshot(self) -> Optional[_Snapshot]:
+        try:
+            mtime_ns = os.stat(self._path(META_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if self._snapshot is not None and self._snapshot.mtime_ns == mtime_ns:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.mtime_ns == mtime_ns:
+                return self._snapshot
+            meta = self._read_meta()
+            if meta is None:
+                return None
+            arrays = self._open_arrays(meta, "r")
+            centroids = self._load_centroids() if meta["nlist"] else None
+            list_rows = None
+            if centroids is not None:
+                # Group rows by IVF list once per snapshot so queries gather a few slices
+                lists = np.asarray(arrays["lists"][:meta["count"]])
+                order = np.argsort(lists, kind="stable").astype(np.int64)
+                bounds = np.searchsorted(lists[order], np.arange(meta["nlist"] + 1))
+                list_rows = [order[bounds[i]:bounds[i + 1]] for i in range(meta["nlist"])]
+            self._snapshot = _Snapshot(mtime_ns, meta["count"], arrays, centroids, list_rows)
+            logger.info(f"🧭 Loaded vector index ({meta['live']} live rows, {meta['nlist']} IVF lists)")
+            return self._snapshot
+
+    # Writing
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(settings.vector_index_path, exist_ok=True)
+        with open(self._path(LOCK_FILE), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _retire(self, meta: Dict[str, Any], recording_id: int) -> int:
+        if not meta["count"]:
+            return 0
+        arrays = self._open_arrays(meta, "r+")
+        count = meta["count"]
+        rows = np.flatnonzero(
+            (arrays["recording_ids"][:count] == recording_id) & (arrays["alive"][:count] == 1)
+        )
+        if rows.size:
+            arrays["alive"][rows] = 0
+            arrays["alive"].flush()
+            meta["live"] -= int(rows.size)
+        return int(rows.size)
+
+    def _add_created_times(self, meta: Dict[str, Any]) -> bool:
+        """Fill the creation time column of an index written without one; returns whether it did"""
+        if meta.get("created_times"):
+            return False
+        meta["created_times"] = True
+        if meta["capacity"]:
+            with open(self._path("created"), "wb") as created_file:
+                created_file.truncate(meta["capacity"] * np.dtype(ARRAYS["created"]).itemsize)
+            arrays = self._open_arrays(meta, "r+")
+            recording_ids = np.asarray(arrays["recording_ids"][:meta["count"]])
+            ids = np.unique(recording_ids)
+            db = SessionLocal()
+            try:
+                created = dict(db.query(Recording.id, Recording.created_at).filter(
+                    Recording.id.in_(ids.tolist())
+                ).all())
+            finally:
+                db.close()
+            # Rows of recordings deleted since are dead, so any time will do for them
+            times = np.array(
+                [self._epoch(created.get(recording_id) or datetime.utcnow()) for recording_id in ids.tolist()],
+                dtype=np.int64
+            )
+            arrays["created"][:meta["count"]] = times[np.searchsorted(ids, recording_ids)]
+            arrays["created"].flush()
+        logger.info(f"🧭 Added creation times to {meta['count']} vector index rows")
+        return True
+
+    def _grow(self, meta: Dict[str, Any], needed: int) -> None:
+        capacity = max(needed, meta["capacity"] * 2, INITIAL_CAPACITY)
+        for name, dtype in ARRAYS.items():
+            row_bytes = np.dtype(dtype).itemsize * (meta["dim"] if name == "vectors" else 1)
+            with open(self._path(name), "ab") as array_file:
+                array_file.truncate(capacity * row_bytes)
+        meta["capacity"] = capacity
+
+    def _needs_training(self, meta: Dict[str, Any]) -> bool:
+        if meta["live"] < settings.vector_index_train_threshold:
+            return False
+        # Retrain as the corpus quadruples so lists stay balanced
+        return meta["nlist"] == 0 or meta["live"] >= 4 * meta["trained_live"]
+
+    def _train(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        """Fit spherical k-means centroids on a sample and reassign every row"""
+        count = meta["count"]
+        live_rows = np.flatnonzero(arrays["alive"][:count] == 1)
+        nlist = int(min(4096, max(16, 4 * math.sqrt(live_rows.size))))
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(live_rows, size=min(KMEANS_SAMPLE, live_rows.size), replace=False))
+        sample = self._dequantize(arrays, sample_rows)
+
+        centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            empty = norms[:, 0] == 0
+            # Empty lists keep their previous centroid
+            centroids = np.where(empty[:, None], centroids, sums / np.where(norms == 0, 1, norms))
+
+        lists = np.zeros(meta["capacity"], dtype=np.int32)
+        for start in range(0, count, BATCH_ROWS):
+            rows = np.arange(start, min(count, start + BATCH_ROWS))
+            lists[rows] = self._assign(self._dequantize(arrays, rows), centroids)
+
+        # Replace files atomically so concurrent readers never see a half-written list
+        lists.tofile(self._path("lists") + ".tmp")
+        os.replace(self._path("lists") + ".tmp", self._path("lists"))
+        with open(self._path(CENTROIDS_FILE) + ".tmp", "wb") as centroids_file:
+            np.save(centroids_file, centroids.astype(np.float32))
+        os.replace(self._path(CENTROIDS_FILE) + ".tmp", self._path(CENTROIDS_FILE))
+
+        meta["nlist"] = nlist
+        meta["trained_live"] = int(live_rows.size)
+        logger.info(f"🧭 Trained IVF index with {nlist} lists on {sample_rows.size} rows")
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignment = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], BATCH_ROWS):
+            assignment[start:start + BATCH_ROWS] = np.argmax(vectors[start:start + BATCH_ROWS] @ centroids.T, axis=1)
+        return assignment
+
+    def _epoch(self, value: datetime) -> int:
+        return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+    def _dequantize(self, arrays: Dict[str, np.ndarray], rows: np.ndarray) -> np.ndarray:
+        return arrays["vectors"][rows].astype(np.float32) * arrays["scales"][rows][:, None]
+
+    def _reset(self) -> None:
+        for name in list(ARRAYS) + [CENTROIDS_FILE, META_FILE]:
+            if os.path.exists(self._path(name)):
+                os.unlink(self._path(name))
+
+    # Files
+
+    def _path(self, name: str) -> str:
+        return os.path.join(settings.vector_index_path, name)
+
+    def _open_arrays(self, meta: Dict[str, Any], mode: str) -> Dict[str, np.ndarray]:
+        arrays = {}
+        for name, dtype in ARRAYS.items():
+            if name == "created" and not meta.get("created_times"):
+                # Written by a version without the column until ensure_created_times runs
+                continue
+            shape = (meta["capacity"], meta["dim"]) if name == "vectors" else (meta["capacity"],)
+            arrays[name] = np.memmap(self._path(name), dtype=dtype, mode=mode, shape=shape)
+        return arrays
+
+    def _load_centroids(self) -> Optional[np.ndarray]:
+        try:
+            return np.load(self._path(CENTROIDS_FILE))
+        except FileNotFoundError:
+            return None
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(META_FILE)) as meta_file:
+                return json.load(meta_file)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        """Publish a new index version; readers switch over when meta.json changes"""
+        with open(self._path(META_FILE) + ".tmp", "w") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(self._path(META_FILE) + ".tmp", self._path(META_FILE))
+
+
+# Global vector index service instance
+vector_index_service = VectorIndexService()
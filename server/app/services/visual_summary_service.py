@@ -1,16 +1,22 @@
+import io
+import os
 import logging
+import tempfile
 import httpx
 from typing import Dict, Any, Optional
 from openai import OpenAI
+from PIL import Image
 
 from app.core.config import settings
 from app.services.storage_service import storage_service
+from app.services.flowchart_service import flowchart_service
+from app.services.pubsub_service import pubsub_service
 
 logger = logging.getLogger(__name__)
 
 
 class VisualSummaryService:
-    """Service for generating visual summaries using DALL·E 3"""
+    """Service for generating visual summaries, rendered locally or with DALL·E 3"""
     
     def __init__(self):
         logger.info("🎨 Initializing VisualSummaryService")
@@ -21,10 +27,24 @@ class VisualSummaryService:
         else:
             self.openai_client = None
             logger.warning("⚠️  OpenAI API key not configured - visual summaries will not be available")
+        
+        self._http_client: Optional[httpx.Client] = None
+    
+    @property
+    def http_client(self) -> httpx.Client:
+        """Shared keep-alive connection pool for image downloads"""
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                timeout=30,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+            )
+        return self._http_client
     
-    async def generate_visual_summary(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[str]:
+    async def generate_visual_summary(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[Dict[str, Any]]:
         """
-        Generate a visual summary using DALL·E 3 based on meeting content
+        Generate a visual summary based on meeting content
+        
+        Uses the local flowchart renderer unless `visual_summary_style` is "dalle".
         
         Args:
             recording_id: ID of the recording
@@ -34,8 +54,69 @@ class VisualSummaryService:
             filename: Original filename for context
             
         Returns:
-            URL of the uploaded visual summary image, or None if failed
+            Dict with `visual_summary_url` and `visual_summary_variants`
+            (WebP derivatives by size name, raster images only), or None if failed
+        """
+        if settings.visual_summary_style == "dalle":
+            return await self._generate_dalle_summary(recording_id, summary, action_items, decisions, filename)
+        return self._render_flowchart_summary(recording_id, action_items, decisions, filename)
+    
+    def claim_generation(self, recording_id: int) -> bool:
+        """
+        Claim the right to queue generation for a recording
+        
+        Concurrent first requests coalesce on a Redis key, so only the caller
+        that gets True should enqueue a job. Without Redis every caller gets True.
         """
+        conn = pubsub_service.connection
+        if conn is None:
+            return True
+        try:
+            return bool(conn.set(
+                self._pending_key(recording_id), 1, nx=True, ex=settings.visual_summary_lock_ttl
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️  Could not claim visual summary generation for {recording_id}: {e}")
+            return True
+    
+    def release_generation(self, recording_id: int, succeeded: bool) -> None:
+        """Release the generation claim; failures keep it briefly to avoid retry storms"""
+        conn = pubsub_service.connection
+        if conn is None:
+            return
+        try:
+            if succeeded:
+                conn.delete(self._pending_key(recording_id))
+            else:
+                conn.expire(self._pending_key(recording_id), settings.visual_summary_retry_after)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not release visual summary claim for {recording_id}: {e}")
+    
+    def _pending_key(self, recording_id: int) -> str:
+        return f"ordo:visual_summary:pending:{recording_id}"
+    
+    def _render_flowchart_summary(self, recording_id: int, action_items: list, decisions: list, filename: str) -> Optional[Dict[str, Any]]:
+        """Render the decision/action-item flowchart locally and upload it as SVG"""
+        logger.info(f"🎨 Rendering flowchart visual summary for recording {recording_id}")
+        
+        try:
+            svg = flowchart_service.render_svg(decisions, action_items, title=filename)
+            file_details = storage_service.upload_file(
+                file_content=svg.encode("utf-8"),
+                filename=f"visual_summary_{recording_id}.svg",
+                content_type="image/svg+xml"
+            )
+            
+            logger.info(f"✅ Flowchart visual summary uploaded to storage: {file_details['public_url']}")
+            # SVG is a few KB and scales to any card size, so no raster derivatives
+            return {"visual_summary_url": file_details['public_url'], "visual_summary_variants": None}
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to render flowchart visual summary: {e}")
+            return None
+    
+    async def _generate_dalle_summary(self, recording_id: int, summary: str, action_items: list, decisions: list, filename: str) -> Optional[Dict[str, Any]]:
+        """Generate a visual summary image with DALL·E 3"""
         if not self.openai_client:
             logger.error("❌ OpenAI client not available for visual summary")
             return None
@@ -59,22 +140,25 @@ class VisualSummaryService:
             image_url = response.data[0].url
             logger.info(f"✅ DALL·E 3 image generated: {image_url}")
             
-            # Download the image
-            image_content = self._download_image(image_url)
-            if not image_content:
+            # Stream the image to disk instead of holding it in memory
+            image_path = self._download_image(image_url)
+            if not image_path:
                 logger.error("❌ Failed to download generated image")
                 return None
             
-            # Upload to Supabase storage
-            visual_filename = f"visual_summary_{recording_id}.png"
-            file_details = storage_service.upload_file(
-                file_content=image_content,
-                filename=visual_filename,
-                content_type="image/png"
-            )
+            try:
+                # Upload the original to Supabase storage, streaming from disk
+                file_details = storage_service.upload_file_from_path(
+                    file_path=image_path,
+                    filename=f"visual_summary_{recording_id}.png",
+                    content_type="image/png"
+                )
+                variants = self._upload_derivatives(recording_id, image_path)
+            finally:
+                os.unlink(image_path)
             
             logger.info(f"✅ Visual summary uploaded to storage: {file_details['public_url']}")
-            return file_details['public_url']
+            return {"visual_summary_url": file_details['public_url'], "visual_summary_variants": variants}
             
         except Exception as e:
             logger.error(f"❌ Failed to generate visual summary: {e}")
@@ -188,15 +272,44 @@ class VisualSummaryService:
         
         return flow_analysis
     
-    def _download_image(self, image_url: str) -> Optional[bytes]:
-        """Download image from URL"""
+    def _download_image(self, image_url: str) -> Optional[str]:
+        """Stream an image from URL into a temporary file and return its path"""
+        temp_path = None
         try:
-            with httpx.Client(timeout=30) as client:
-                response = client.get(image_url)
-                response.raise_for_status()
-                return response.content
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
+                temp_path = temp_file.name
+                with self.http_client.stream("GET", image_url) as response:
+                    response.raise_for_status()
+                    for chunk in response.iter_bytes(chunk_size=64 * 1024):
+                        temp_file.write(chunk)
+            return temp_path
         except Exception as e:
             logger.error(f"❌ Failed to download image: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return None
+    
+    def _upload_derivatives(self, recording_id: int, image_path: str) -> Optional[Dict[str, str]]:
+        """Create and upload compressed WebP derivatives of an image, keyed by size name"""
+        try:
+            variants = {}
+            with Image.open(image_path) as image:
+                image = image.convert("RGB")
+                for name, size in settings.visual_summary_variant_sizes.items():
+                    variant = image.copy()
+                    variant.thumbnail((size, size), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    variant.save(buffer, format="WEBP", quality=80, method=4)
+                    file_details = storage_service.upload_file(
+                        file_content=buffer.getvalue(),
+                        filename=f"visual_summary_{recording_id}_{name}.webp",
+                        content_type="image/webp"
+                    )
+                    variants[name] = file_details['public_url']
+                    logger.debug(f"🖼️  Uploaded {name} derivative ({buffer.tell()} bytes)")
+            return variants
+        except Exception as e:
+            logger.error(f"❌ Failed to create visual summary derivatives: {e}")
             return None
 
 
@@ -6,6 +6,13 @@ from app.services.recording_service import recording_service
 from app.services.transcription_service import transcription_service
 from app.services.analysis_service import analysis_service
 from app.services.visual_summary_service import visual_summary_service
+from app.services.search_service import search_service
+from app.services.vector_index_service import vector_index_service
+from app.services.bm25_index_service import bm25_index_service
+from app.services.autocomplete_service import autocomplete_service
+from app.services.search_cache_service import search_cache_service
+from app.services.task_service import task_service
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +61,8 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                     transcript=transcription_result["transcript"],
                     transcript_with_speakers=transcription_result["transcript_with_speakers"],
                     duration=transcription_result["duration"],
-                    status="analyzing"  # Set to analyzing status
+                    status="analyzing",  # Set to analyzing status
+                    segments=transcription_result.get("segments")
                 )
                 logger.info(f"✅ Transcription completed for recording {recording_id}")
                 
@@ -80,65 +88,22 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
                     )
                     logger.warning(f"⚠️  Analysis failed for recording {recording_id}: {analysis_result['error']}")
                 else:
-                    # Update with successful analysis and start visual generation
+                    # Analysis is the last stage; visual summaries are generated
+                    # on first request through GET /recordings/{id}/visual-summary
                     recording_service.update_analysis(
                         recording_id=recording_id,
                         summary=analysis_result["summary"],
                         action_items=analysis_result["action_items"],
                         decisions=analysis_result["decisions"],
-                        status="generating_visuals"  # Set status to generating visuals
+                        status="completed"
                     )
                     logger.info(f"✅ Analysis completed for recording {recording_id}")
-                    
-                    # Generate visual summary using DALL·E 3
-                    logger.info(f"🎨 Starting visual summary generation for recording {recording_id}")
-                    try:
-                        # Get recording object to access filename
-                        current_recording = recording_service.get_recording(recording_id)
-                        filename = current_recording.original_filename if current_recording else f"recording_{recording_id}"
-                        
-                        visual_summary_url = loop.run_until_complete(
-                            visual_summary_service.generate_visual_summary(
-                                recording_id=recording_id,
-                                summary=analysis_result["summary"],
-                                action_items=analysis_result["action_items"],
-                                decisions=analysis_result["decisions"],
-                                filename=filename
-                            )
-                        )
-                        
-                        if visual_summary_url:
-                            # Update recording with visual summary URL and mark as completed
-                            recording_service.update_recording(
-                                recording_id=recording_id,
-                                visual_summary_url=visual_summary_url
-                            )
-                            # Update status to completed
-                            recording_service.update_analysis(
-                                recording_id=recording_id,
-                                status="completed"
-                            )
-                            logger.info(f"✅ Visual summary generated and saved for recording {recording_id}")
-                        else:
-                            # Failed to generate visual summary, but mark as completed since analysis succeeded
-                            recording_service.update_analysis(
-                                recording_id=recording_id,
-                                status="completed",
-                                error="Visual summary generation failed"
-                            )
-                            logger.warning(f"⚠️  Failed to generate visual summary for recording {recording_id}")
-                            
-                    except Exception as visual_error:
-                        logger.error(f"❌ Error generating visual summary for recording {recording_id}: {visual_error}")
-                        # Mark as completed with error since analysis succeeded
-                        recording_service.update_analysis(
-                            recording_id=recording_id,
-                            status="completed",
-                            error=f"Visual summary generation failed: {str(visual_error)}"
-                        )
+                
+                # Index transcript chunks for search; failures leave the other retrievers working
+                _index_recording_for_search(recording_id)
                 
                 # Processing completed
-                logger.info(f"✅ Processing completed for recording {recording_id} (transcription + analysis + visual)")
+                logger.info(f"✅ Processing completed for recording {recording_id} (transcription + analysis)")
                 
         finally:
             loop.close()
@@ -150,4 +115,116 @@ def process_transcription_task(recording_id: int, media_url: str, file_content:
             transcript="",
             status="failed",
             error=str(e)
-        ) 
\ No newline at end of file
+        )
+
+
+def process_visual_summary_task(recording_id: int, **kwargs):
+    """
+    Background task to generate the visual summary of an analyzed recording
+    Queued on the first request for the visual summary, not by the processing pipeline
+    """
+    logger.info(f"🎨 Starting visual summary generation for recording {recording_id}")
+    
+    recording = recording_service.get_recording(recording_id)
+    if not recording:
+        logger.warning(f"⚠️  Recording {recording_id} no longer exists, skipping visual summary")
+        visual_summary_service.release_generation(recording_id, succeeded=True)
+        return
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    visual_summary = None
+    
+    try:
+        visual_summary = loop.run_until_complete(
+            visual_summary_service.generate_visual_summary(
+                recording_id=recording_id,
+                summary=recording.summary,
+                action_items=recording.action_items or [],
+                decisions=recording.decisions or [],
+                filename=recording.original_filename or f"recording_{recording_id}"
+            )
+        )
+        
+        if visual_summary:
+            recording_service.update_recording(
+                recording_id=recording_id,
+                visual_summary_url=visual_summary["visual_summary_url"],
+                visual_summary_variants=visual_summary["visual_summary_variants"]
+            )
+            logger.info(f"✅ Visual summary generated and saved for recording {recording_id}")
+        else:
+            logger.warning(f"⚠️  Failed to generate visual summary for recording {recording_id}")
+            
+    except Exception as visual_error:
+        # The recording itself is fine; releasing the claim below lets a later request retry
+        logger.error(f"❌ Error generating visual summary for recording {recording_id}: {visual_error}")
+    finally:
+        loop.close()
+        visual_summary_service.release_generation(recording_id, succeeded=bool(visual_summary))
+
+
+def _index_recording_for_search(recording_id: int):
+    """Add a completed recording to the vector index, the BM25 index when selected, and autocomplete"""
+    autocomplete_service.notify_recording_changed(recording_id)
+    
+    try:
+        vector_index_service.index_recording(recording_id)
+    except Exception as e:
+        logger.error(f"❌ Failed to index embeddings for recording {recording_id}: {e}")
+    
+    if settings.full_text_backend == "bm25":
+        try:
+            bm25_index_service.index_recording(recording_id)
+            if bm25_index_service.needs_merge():
+                task_service.enqueue_task(merge_bm25_segments_task)
+        except Exception as e:
+            logger.error(f"❌ Failed to add recording {recording_id} to the BM25 index: {e}")
+    
+    # The recording is now searchable, so cached search responses are stale
+    search_cache_service.invalidate()
+
+
+def merge_bm25_segments_task(**kwargs):
+    """Background task to merge small BM25 index segments"""
+    bm25_index_service.merge_segments()
+
+
+def reconcile_recording_counts_task(**kwargs):
+    """
+    Background task to correct the listing counters against the tables
+    Queued when a worker starts
+    """
+    recording_service.reconcile_counts()
+
+
+def backfill_search_indexes_task(**kwargs):
+    """
+    Background task to index recordings missing from the search indexes
+    Queued when a worker starts, so recordings stored before an index existed are picked up
+    without holding up API startup
+    """
+    search_service.backfill()
+    
+    recording_ids = recording_service.get_completed_recording_ids()
+    
+    vector_index_service.ensure_created_times()
+    missing = vector_index_service.get_missing_recordings(recording_ids)
+    logger.info(f"🧭 Indexing embeddings for {len(missing)} of {len(recording_ids)} completed recordings")
+    for recording_id in missing:
+        try:
+            vector_index_service.index_recording(recording_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to index embeddings for recording {recording_id}: {e}")
+            break
+    
+    if settings.full_text_backend == "bm25":
+        indexed = bm25_index_service.get_indexed_recordings()
+        missing = [recording_id for recording_id in recording_ids if recording_id not in indexed]
+        logger.info(f"📇 Adding {len(missing)} of {len(recording_ids)} completed recordings to the BM25 index")
+        for recording_id in missing:
+            bm25_index_service.index_recording(recording_id)
+        if bm25_index_service.needs_merge():
+            bm25_index_service.merge_segments()
+    
+    search_cache_service.invalidate()
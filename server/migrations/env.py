@@ -16,7 +16,14 @@ from app.core.config import settings
 
 # Import all models so Alembic can detect them
 from app.models.recording import Recording
-# TextChunk removed - embeddings functionality removed
+from app.models.recording_label import RecordingLabel
+from app.models.recording_count import RecordingCount
+from app.models.labeling_rule import LabelingRule
+from app.models.label_classifier import LabelVerdict, LabelClassifier
+from app.models.transcript_chunk import TranscriptChunk
+from app.models.speaker_turn import SpeakerTurn
+from app.models.meeting_item import ActionItem, Decision
+# Chunk embeddings are kept in the on-disk vector index, not in the database
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,53 @@
+"""create_label_verdicts_and_classifiers
+
+Revision ID: 3e7b1c9a4f20
+Revises: d48136932e87
+Create Date: 2026-10-19 09:00:12.481925
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e7b1c9a4f20'
+down_revision = 'd48136932e87'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('label_verdicts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('rule_id', sa.Integer(), nullable=False),
+    sa.Column('applied', sa.Boolean(), nullable=False),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('source', sa.String(length=10), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['rule_id'], ['labeling_rules.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_label_verdicts_id'), 'label_verdicts', ['id'], unique=False)
+    op.create_index(op.f('ix_label_verdicts_recording_id'), 'label_verdicts', ['recording_id'], unique=False)
+    op.create_index(op.f('ix_label_verdicts_rule_id'), 'label_verdicts', ['rule_id'], unique=False)
+    op.create_table('label_classifiers',
+    sa.Column('rule_id', sa.Integer(), nullable=False),
+    sa.Column('rule_fingerprint', sa.String(length=16), nullable=False),
+    sa.Column('weights', sa.LargeBinary(), nullable=False),
+    sa.Column('bias', sa.Float(), nullable=False),
+    sa.Column('n_samples', sa.Integer(), nullable=False),
+    sa.Column('n_positive', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['rule_id'], ['labeling_rules.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('rule_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('label_classifiers')
+    op.drop_index(op.f('ix_label_verdicts_rule_id'), table_name='label_verdicts')
+    op.drop_index(op.f('ix_label_verdicts_recording_id'), table_name='label_verdicts')
+    op.drop_index(op.f('ix_label_verdicts_id'), table_name='label_verdicts')
+    op.drop_table('label_verdicts')
@@ -0,0 +1,57 @@
+"""create_recording_labels_table
+
+Revision ID: a51d0c7e92b4
+Revises: 3e7b1c9a4f20
+Create Date: 2026-10-19 09:30:41.207316
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a51d0c7e92b4'
+down_revision = '3e7b1c9a4f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    recording_labels = op.create_table('recording_labels',
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('label_name', sa.String(length=100), nullable=False),
+    sa.Column('label_color', sa.String(length=7), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recording_id', 'label_name')
+    )
+    op.create_index('ix_recording_labels_label_name_recording_id', 'recording_labels', ['label_name', 'recording_id'], unique=False)
+
+    # Backfill from the existing labels JSON column
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, labels FROM recordings WHERE labels IS NOT NULL"))
+    backfill = []
+    for recording_id, labels in rows:
+        if isinstance(labels, str):
+            labels = json.loads(labels)
+        seen = set()
+        for label in labels or []:
+            label_name = label.get("label_name")
+            if not label_name or label_name in seen:
+                continue
+            seen.add(label_name)
+            backfill.append({
+                "recording_id": recording_id,
+                "label_name": label_name,
+                "label_color": label.get("label_color"),
+                "confidence": label.get("confidence")
+            })
+    if backfill:
+        op.bulk_insert(recording_labels, backfill)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recording_labels_label_name_recording_id', table_name='recording_labels')
+    op.drop_table('recording_labels')
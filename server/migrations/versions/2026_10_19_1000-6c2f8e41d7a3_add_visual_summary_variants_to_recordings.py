@@ -0,0 +1,24 @@
+"""add_visual_summary_variants_to_recordings
+
+Revision ID: 6c2f8e41d7a3
+Revises: a51d0c7e92b4
+Create Date: 2026-10-19 10:00:12.530941
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c2f8e41d7a3'
+down_revision = 'a51d0c7e92b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('recordings', sa.Column('visual_summary_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('recordings', 'visual_summary_variants')
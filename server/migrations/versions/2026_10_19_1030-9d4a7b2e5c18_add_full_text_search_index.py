@@ -0,0 +1,45 @@
+"""add_full_text_search_index
+
+Revision ID: 9d4a7b2e5c18
+Revises: 6c2f8e41d7a3
+Create Date: 2026-10-19 10:30:05.871264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a7b2e5c18'
+down_revision = '6c2f8e41d7a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE recordings ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute("""
+            UPDATE recordings SET search_vector =
+                setweight(to_tsvector('english', coalesce(original_filename, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(transcript_with_speakers, transcript, '')), 'C')
+        """)
+        op.execute("CREATE INDEX IF NOT EXISTS ix_recordings_search_vector ON recordings USING GIN (search_vector)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS recordings_fts USING fts5("
+            "filename, summary, transcript, tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO recordings_fts (rowid, filename, summary, transcript) "
+            "SELECT id, original_filename, summary, coalesce(transcript_with_speakers, transcript) FROM recordings"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_recordings_search_vector")
+        op.execute("ALTER TABLE recordings DROP COLUMN IF EXISTS search_vector")
+    else:
+        op.execute("DROP TABLE IF EXISTS recordings_fts")
@@ -0,0 +1,62 @@
+"""create_transcript_chunks_table
+
+Revision ID: 2b8e5f90c4d6
+Revises: 9d4a7b2e5c18
+Create Date: 2026-10-19 11:00:47.102938
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b8e5f90c4d6'
+down_revision = '9d4a7b2e5c18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('transcript_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('start_time', sa.Float(), nullable=True),
+    sa.Column('end_time', sa.Float(), nullable=True),
+    sa.Column('char_start', sa.Integer(), nullable=False),
+    sa.Column('char_end', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transcript_chunks_recording_id_chunk_index', 'transcript_chunks', ['recording_id', 'chunk_index'], unique=True)
+
+    # Full-text index over chunks; existing transcripts are chunked on the next API startup
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE transcript_chunks ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED"
+        )
+        op.execute("CREATE INDEX ix_transcript_chunks_search_vector ON transcript_chunks USING GIN (search_vector)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE transcript_chunks_fts USING fts5("
+            "text, content = 'transcript_chunks', content_rowid = 'id', tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER transcript_chunks_ai AFTER INSERT ON transcript_chunks BEGIN "
+            "INSERT INTO transcript_chunks_fts (rowid, text) VALUES (new.id, new.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER transcript_chunks_ad AFTER DELETE ON transcript_chunks BEGIN "
+            "INSERT INTO transcript_chunks_fts (transcript_chunks_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS transcript_chunks_ad")
+        op.execute("DROP TRIGGER IF EXISTS transcript_chunks_ai")
+        op.execute("DROP TABLE IF EXISTS transcript_chunks_fts")
+    op.drop_index('ix_transcript_chunks_recording_id_chunk_index', table_name='transcript_chunks')
+    op.drop_table('transcript_chunks')
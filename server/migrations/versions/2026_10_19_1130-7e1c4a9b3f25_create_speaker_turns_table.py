@@ -0,0 +1,64 @@
+"""create_speaker_turns_table
+
+Revision ID: 7e1c4a9b3f25
+Revises: 2b8e5f90c4d6
+Create Date: 2026-10-19 11:30:12.548311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1c4a9b3f25'
+down_revision = '2b8e5f90c4d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('speaker_turns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('turn_index', sa.Integer(), nullable=False),
+    sa.Column('speaker', sa.String(), nullable=False),
+    sa.Column('start_time', sa.Float(), nullable=True),
+    sa.Column('end_time', sa.Float(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_speaker_turns_recording_id_turn_index', 'speaker_turns', ['recording_id', 'turn_index'], unique=True)
+    op.create_index('ix_speaker_turns_speaker_recording_id', 'speaker_turns', ['speaker', 'recording_id'], unique=False)
+
+    # Full-text index over turns; existing diarized transcripts are split on the next API startup
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE speaker_turns ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('english', text)) STORED"
+        )
+        op.execute("CREATE INDEX ix_speaker_turns_search_vector ON speaker_turns USING GIN (search_vector)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE speaker_turns_fts USING fts5("
+            "speaker, text, content = 'speaker_turns', content_rowid = 'id', tokenize = 'porter unicode61')"
+        )
+        op.execute(
+            "CREATE TRIGGER speaker_turns_ai AFTER INSERT ON speaker_turns BEGIN "
+            "INSERT INTO speaker_turns_fts (rowid, speaker, text) VALUES (new.id, new.speaker, new.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER speaker_turns_ad AFTER DELETE ON speaker_turns BEGIN "
+            "INSERT INTO speaker_turns_fts (speaker_turns_fts, rowid, speaker, text) "
+            "VALUES ('delete', old.id, old.speaker, old.text); END"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS speaker_turns_ad")
+        op.execute("DROP TRIGGER IF EXISTS speaker_turns_ai")
+        op.execute("DROP TABLE IF EXISTS speaker_turns_fts")
+    op.drop_index('ix_speaker_turns_speaker_recording_id', table_name='speaker_turns')
+    op.drop_index('ix_speaker_turns_recording_id_turn_index', table_name='speaker_turns')
+    op.drop_table('speaker_turns')
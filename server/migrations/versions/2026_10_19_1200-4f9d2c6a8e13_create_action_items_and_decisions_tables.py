@@ -0,0 +1,61 @@
+"""create_action_items_and_decisions_tables
+
+Revision ID: 4f9d2c6a8e13
+Revises: 7e1c4a9b3f25
+Create Date: 2026-10-19 12:00:33.716204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9d2c6a8e13'
+down_revision = '7e1c4a9b3f25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('action_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('assignee', sa.String(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('priority', sa.String(length=10), nullable=True),
+    sa.Column('status', sa.String(length=10), nullable=False, server_default='open'),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_action_items_recording_id_position', 'action_items', ['recording_id', 'position'], unique=True)
+    op.create_index('ix_action_items_assignee_status_due_date', 'action_items', [sa.text('lower(assignee)'), 'status', 'due_date', 'id'], unique=False)
+    op.create_index('ix_action_items_status_priority_due_date', 'action_items', ['status', 'priority', 'due_date', 'id'], unique=False)
+    op.create_index('ix_action_items_due_date', 'action_items', ['due_date', 'id'], unique=False)
+
+    op.create_table('decisions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recording_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('owner', sa.String(), nullable=True),
+    sa.Column('context', sa.Text(), nullable=True),
+    sa.Column('impact', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['recording_id'], ['recordings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_decisions_recording_id_position', 'decisions', ['recording_id', 'position'], unique=True)
+    op.create_index('ix_decisions_owner', 'decisions', [sa.text('lower(owner)'), 'id'], unique=False)
+    # Existing analysis JSON is normalized into these tables on the next API startup
+
+
+def downgrade() -> None:
+    op.drop_index('ix_decisions_owner', table_name='decisions')
+    op.drop_index('ix_decisions_recording_id_position', table_name='decisions')
+    op.drop_table('decisions')
+    op.drop_index('ix_action_items_due_date', table_name='action_items')
+    op.drop_index('ix_action_items_status_priority_due_date', table_name='action_items')
+    op.drop_index('ix_action_items_assignee_status_due_date', table_name='action_items')
+    op.drop_index('ix_action_items_recording_id_position', table_name='action_items')
+    op.drop_table('action_items')
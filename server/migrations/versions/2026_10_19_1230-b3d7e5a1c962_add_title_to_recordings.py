@@ -0,0 +1,31 @@
+"""add_title_to_recordings
+
+Revision ID: b3d7e5a1c962
+Revises: 4f9d2c6a8e13
+Create Date: 2026-10-19 12:30:08.251947
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d7e5a1c962'
+down_revision = '4f9d2c6a8e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('recordings', sa.Column('title', sa.String(), nullable=True))
+    # Titles are derived from existing summaries on the next API startup. The
+    # pg_trgm extension and its GIN indexes are created there too, since the
+    # extension may need privileges the migration role lacks; without it the
+    # API falls back to an in-process trigram index.
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_recordings_title_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_recordings_original_filename_trgm")
+    op.drop_column('recordings', 'title')
@@ -0,0 +1,28 @@
+"""add_transcript_preview_to_recordings
+
+Revision ID: c8e2f4a7d915
+Revises: b3d7e5a1c962
+Create Date: 2026-10-19 13:00:41.608213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e2f4a7d915'
+down_revision = 'b3d7e5a1c962'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('recordings', sa.Column('transcript_preview', sa.String(), nullable=True))
+    # Same length as TRANSCRIPT_PREVIEW_CHARS in the recording service
+    op.execute(
+        "UPDATE recordings SET transcript_preview = substr(transcript, 1, 200) WHERE transcript IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('recordings', 'transcript_preview')
@@ -0,0 +1,31 @@
+"""add_recording_counts_and_list_index
+
+Revision ID: 5a7c9e1b3d48
+Revises: c8e2f4a7d915
+Create Date: 2026-10-19 13:30:17.904562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c9e1b3d48'
+down_revision = 'c8e2f4a7d915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('recording_counts',
+    sa.Column('scope', sa.String(length=120), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+    # The counts are seeded from the tables on the next API startup
+    op.create_index('ix_recordings_created_at_id', 'recordings', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recordings_created_at_id', table_name='recordings')
+    op.drop_table('recording_counts')
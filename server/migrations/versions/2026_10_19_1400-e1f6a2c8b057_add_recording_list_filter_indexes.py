@@ -0,0 +1,32 @@
+"""add_recording_list_filter_indexes
+
+Revision ID: e1f6a2c8b057
+Revises: 5a7c9e1b3d48
+Create Date: 2026-10-19 14:00:52.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f6a2c8b057'
+down_revision = '5a7c9e1b3d48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_recordings_processing_status_created_at_id', 'recordings',
+        ['processing_status', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_recordings_content_type_created_at_id', 'recordings',
+        ['content_type', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recordings_content_type_created_at_id', table_name='recordings')
+    op.drop_index('ix_recordings_processing_status_created_at_id', table_name='recordings')
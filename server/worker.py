@@ -4,10 +4,11 @@ RQ Worker script for processing background tasks
 """
 import logging
 import sys
-from rq import Worker, Connection
+from rq import Worker, Connection, Queue
 import redis
 
 from app.core.config import settings
+from app.tasks.processing_tasks import backfill_search_indexes_task, reconcile_recording_counts_task
 
 # Setup logging
 logging.basicConfig(
@@ -36,6 +37,11 @@ def run_worker():
         redis_conn.ping()
         logger.info("✅ Redis connection successful")
         
+        # Index recordings missing from the search indexes and fix counter drift before new work
+        queue = Queue(connection=redis_conn)
+        queue.enqueue(reconcile_recording_counts_task)
+        queue.enqueue(backfill_search_indexes_task, job_timeout='2h')
+        
         # Create and run worker
         with Connection(redis_conn):
             worker = Worker(['default'])